@@ -0,0 +1,200 @@
+import os
+import threading
+
+# Constants
+LOCAL_MODEL_NAME = "facebook/blenderbot-400M-distill"  # Smaller free model
+HF_CHAT_MODEL = "HuggingFaceH4/zephyr-7b-beta"
+LOCAL_REPLY_TOKENS = 32  # new tokens per local reply; prompts are fitted to what is left of its window
+TORCH_NUM_THREADS = 4  # Limit CPU threads for better performance
+WARMUP_PROMPT = "Hello"
+STREAM_TOKEN_TIMEOUT = 60  # seconds to wait for the next streamed token
+
+# Local inference backends: fp32 PyTorch, int8 dynamically-quantized PyTorch,
+# or an ONNX Runtime export (requires `optimum[onnxruntime]`)
+BACKEND_PYTORCH = "pytorch"
+BACKEND_INT8 = "int8"
+BACKEND_ONNX = "onnx"
+LOCAL_MODEL_BACKENDS = (BACKEND_PYTORCH, BACKEND_INT8, BACKEND_ONNX)
+LOCAL_MODEL_BACKEND = os.getenv("TESSERACT_LOCAL_BACKEND", BACKEND_PYTORCH)
+
+# Local model readiness states
+MODEL_NOT_STARTED = "not_started"
+MODEL_LOADING = "loading"
+MODEL_WARMING = "warming"
+MODEL_READY = "ready"
+MODEL_FAILED = "failed"
+
+# torch/transformers are only imported inside these functions so importing this
+# module stays cheap; the heavy work happens on first use or on the warm-up thread.
+_local_model = None
+_local_model_lock = threading.Lock()
+
+
+def build_local_model(backend=LOCAL_MODEL_BACKEND):
+    """Import torch/transformers and build a text-generation pipeline for the given backend"""
+    if backend not in LOCAL_MODEL_BACKENDS:
+        raise ValueError(f"Unknown local model backend '{backend}', expected one of {LOCAL_MODEL_BACKENDS}")
+
+    import torch
+    from transformers import AutoTokenizer, pipeline
+
+    torch.set_num_threads(TORCH_NUM_THREADS)
+    pipeline_kwargs = {"truncation": True, "max_new_tokens": LOCAL_REPLY_TOKENS}
+
+    if backend == BACKEND_PYTORCH:
+        return pipeline("text-generation", model=LOCAL_MODEL_NAME, device="cpu", **pipeline_kwargs)
+
+    tokenizer = AutoTokenizer.from_pretrained(LOCAL_MODEL_NAME)
+    if backend == BACKEND_INT8:
+        from transformers import AutoModelForCausalLM
+
+        model = AutoModelForCausalLM.from_pretrained(LOCAL_MODEL_NAME)
+        model.eval()
+        # Linear layers dominate the compute; int8 weights with dynamic
+        # activation scaling keep accuracy close to fp32 on CPU
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        try:
+            from optimum.onnxruntime import ORTModelForCausalLM
+        except ImportError as e:
+            raise ImportError(
+                "The ONNX backend needs optimum with onnxruntime: pip install optimum[onnxruntime]"
+            ) from e
+        model = ORTModelForCausalLM.from_pretrained(LOCAL_MODEL_NAME, export=True)
+
+    return pipeline("text-generation", model=model, tokenizer=tokenizer, device="cpu", **pipeline_kwargs)
+
+
+def load_local_model():
+    """Build the configured local model once per process, on first use"""
+    global _local_model
+    with _local_model_lock:
+        if _local_model is None:
+            _local_model = build_local_model()
+    return _local_model
+
+
+def create_hf_client(token):
+    """Create a Hugging Face Inference client, importing huggingface_hub lazily"""
+    from huggingface_hub import InferenceClient
+    return InferenceClient(token=token)
+
+
+def stream_hf_chat(client, messages, model=HF_CHAT_MODEL, max_tokens=500):
+    """Yield response text from the HF chat-completion endpoint as tokens arrive"""
+    for chunk in client.chat_completion(messages=messages, model=model,
+                                        max_tokens=max_tokens, stream=True):
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
+
+def hf_chat(client, messages, model=HF_CHAT_MODEL, max_tokens=500):
+    """Complete response text from the HF chat-completion endpoint"""
+    response = client.chat_completion(messages=messages, model=model, max_tokens=max_tokens)
+    return response.choices[0].message.content or ""
+
+
+def stream_local_generation(model, prompt, timeout=STREAM_TOKEN_TIMEOUT, **generate_kwargs):
+    """
+    Yield text from a local transformers pipeline as it is generated.
+    Generation runs on a worker thread and stops early if the consumer
+    abandons the generator (e.g. the Streamlit script is rerun). An error
+    in generation is re-raised here, and TimeoutError is raised if no text
+    arrives for `timeout` seconds, so the consumer never blocks forever.
+    """
+    import queue
+
+    from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+    stop_event = threading.Event()
+
+    class _StopWhenAbandoned(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            return stop_event.is_set()
+
+    streamer = TextIteratorStreamer(model.tokenizer, skip_prompt=True, skip_special_tokens=True,
+                                    timeout=timeout)
+    errors = []
+
+    def generate():
+        try:
+            model(prompt, **generate_kwargs, streamer=streamer,
+                  stopping_criteria=StoppingCriteriaList([_StopWhenAbandoned()]))
+        except Exception as e:
+            errors.append(e)
+            # The streamer only ends itself when generation finishes normally
+            streamer.end()
+
+    worker = threading.Thread(target=generate, daemon=True)
+    worker.start()
+    try:
+        for text in streamer:
+            if text:
+                yield text
+    except queue.Empty:
+        raise TimeoutError(f"No response from the local model within {timeout} seconds")
+    finally:
+        stop_event.set()
+    if errors:
+        raise errors[0]
+
+
+class LocalModelNotReady(RuntimeError):
+    """Raised when the local model is still loading or failed to load"""
+
+
+class LocalModelLoader:
+    """Loads and warms the local model on a background thread, tracking its readiness"""
+
+    def __init__(self, warmup_prompt=WARMUP_PROMPT):
+        self.warmup_prompt = warmup_prompt
+        self.state = MODEL_NOT_STARTED
+        self.error = None
+        self.model = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def start(self):
+        """Start loading in the background; safe to call on every script run"""
+        with self._lock:
+            if self._thread is None:
+                self.state = MODEL_LOADING
+                self._thread = threading.Thread(
+                    target=self._load, name="local-model-warmup", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def _load(self):
+        try:
+            model = load_local_model()
+            self.state = MODEL_WARMING
+            # One tiny generation so the first real request doesn't pay for kernel setup
+            model(self.warmup_prompt, max_new_tokens=1)
+            self.model = model
+            self.state = MODEL_READY
+        except Exception as e:
+            self.error = str(e)
+            self.state = MODEL_FAILED
+        finally:
+            self._done.set()
+
+    def is_ready(self):
+        return self.state == MODEL_READY
+
+    def is_loading(self):
+        return self.state in (MODEL_LOADING, MODEL_WARMING)
+
+    def get(self, timeout=None):
+        """Return the model, waiting up to `timeout` seconds; None if not ready"""
+        self.start()
+        self._done.wait(timeout)
+        return self.model if self.is_ready() else None
+
+
+# Shared by every session in the process
+local_model_loader = LocalModelLoader()
@@ -8,39 +8,41 @@ st.set_page_config(
 )
 
 import requests
-import pandas as pd
 import os
-import time
 import traceback
-import folium
-from streamlit_folium import folium_static
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
 import json
+import math
+import copy
+import uuid
 from pathlib import Path
 import base64
 import tempfile
 from datetime import datetime
 import pytz
 import re
-from PyPDF2 import PdfReader, PdfWriter
-import torch
-from transformers import pipeline
-from huggingface_hub import InferenceClient
-from io import BytesIO
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from transformers import pipeline
-from huggingface_hub import InferenceClient
+import html
+from ai_models import (local_model_loader, create_hf_client, stream_hf_chat, hf_chat,
+                       HF_CHAT_MODEL, LOCAL_MODEL_NAME,
+                       LOCAL_REPLY_TOKENS, MODEL_FAILED, LocalModelNotReady)
+from prompt_builder import (fit_sections, local_prompt, chat_messages, history_text,
+                            CHAT_REPLY_TOKENS, PromptTooLong)
+from response_cache import ResponseCache, hashed_ngram_embedding
+from inference_server import InferenceServer
 from saved_jobs import SavedJobsManager
-from resume_builder import ProfessionalResumeBuilder
+from job_identity import make_job_id
+from resume_builder import ProfessionalResumeBuilder, render_resume_pdf
+from pdf_text import extract_pdf_text, PDFLimitError
+from resume_parser import parse_resume_text
+from job_search import JobSearchClient, JobSearchError
+from geocoding import Geocoder, lazy_nominatim
+from gazetteer import get_gazetteer
+from job_map import filter_by_radius, build_job_map
+from match_scoring import MatchScorer, TOP_MATCHES_FOR_ANALYSIS
+from ats_analyzer import ATSAnalyzer, common_gaps, gap_summary
+from cover_letters import (cover_letter_prompt, generate_and_save_cover_letters,
+                           BATCH_MAX_JOBS, COVER_LETTER_MAX_TOKENS)
+from task_queue import TaskQueue, TASK_FAILED, ACTIVE_STATES
 from logo import show_animated_logo
-import streamlit as st
-import requests
-import pandas as pd
-import os
-import time
-import traceback
 
 # +++ ADD DEBUG CODE HERE +++
 print("\n=== DEBUGGING SECRETS ===")
@@ -96,32 +98,68 @@ except Exception as e:
 show_animated_logo()
 
 # --- AI Model Initialization ---
+# The local model loads and warms up on a background thread so the first page
+# render never waits for torch/transformers; the HF Inference path is usable
+# immediately.
+local_model_loader.start()
+
 @st.cache_resource
-def load_ai_model():
-    try:
-        return pipeline(
-            "text-generation",
-            model="facebook/blenderbot-400M-distill",  # Smaller free model
-            device="cpu",
-            truncation=True,
-            max_length=500
-        )
-    except Exception as e:
-        st.error(f"⚠️ Failed to load AI model: {str(e)}")
-        return None
+def get_hf_client():
+    return create_hf_client(HF_TOKEN) if HF_TOKEN else None
+
+# One generation worker per process, shared by every browser session
+@st.cache_resource
+def get_inference_server():
+    return InferenceServer(model_provider=local_model_loader.get)
+
+inference_server = get_inference_server()
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache(embed_fn=hashed_ngram_embedding)
+
+response_cache = get_response_cache()
+
+# Resume-to-job match scores; the embedding model loads on a background thread
+# and no score is shown until it is ready, or at all if only the hashed
+# fallback is available (it ranks too coarsely to show as a percentage)
+@st.cache_resource
+def get_match_scorer():
+    return MatchScorer().start()
+
+match_scorer = get_match_scorer()
 
-local_ai = load_ai_model()
-hf_client = InferenceClient(token=HF_TOKEN) if HF_TOKEN else None
+def match_scores_available():
+    return match_scorer.is_ready() and not match_scorer.uses_fallback()
 
+# Keyword coverage against the skill taxonomy; job keywords are cached across sessions
+@st.cache_resource
+def get_ats_analyzer():
+    return ATSAnalyzer()
+
+ats_analyzer = get_ats_analyzer()
 
-# --- PyTorch CPU Optimization ---
-import torch
-torch.set_num_threads(4)  # Limit CPU threads for better performance
+# Long AI, PDF and geocoding work runs on a shared background queue; sessions
+# poll the task records instead of blocking, so reruns can't abort the work
+@st.cache_resource
+def get_task_queue():
+    return TaskQueue()
+
+task_queue = get_task_queue()
 
 # --- Constants and Configuration ---
-CACHE_FILE = "geocode_cache.json"
 SAVED_JOBS_FILE = "saved_jobs.json"
 USER_PROFILES_FILE = "user_profiles.json"
+SAVED_JOBS_PAGE_SIZE = 20
+TASK_POLL_SECONDS = 1.5
+RESUME_BUILDER_WIDGET_PREFIXES = ("exp_title_", "exp_company_", "exp_desc_", "exp_years_",
+                                  "edu_degree_", "edu_institution_", "edu_year_")
+SAVED_JOBS_SORTS = {
+    "Newest first": ("saved_at", True),
+    "Oldest first": ("saved_at", False),
+    "Title (A-Z)": ("title", False),
+    "Company (A-Z)": ("company", False),
+}
 COUNTRIES = {
     "Australia": "au",
     "United States": "us",
@@ -136,16 +174,6 @@ COUNTRIES = {
 }
 
 # --- File Management Functions ---
-def load_cache():
-    if Path(CACHE_FILE).exists():
-        with open(CACHE_FILE, "r") as f:
-            return json.load(f)
-    return {}
-
-def save_cache(cache):
-    with open(CACHE_FILE, "w") as f:
-        json.dump(cache, f)
-
 def load_saved_jobs():
     if Path(SAVED_JOBS_FILE).exists():
         with open(SAVED_JOBS_FILE, "r") as f:
@@ -167,235 +195,247 @@ def save_user_profiles(profiles):
         json.dump(profiles, f)
 
 # Initialize data stores
-geocode_cache = load_cache()
-# Initialize SavedJobsManager
-jobs_manager = SavedJobsManager()
 user_profiles = load_user_profiles()
 # Initialize resume builder
 resume_builder = ProfessionalResumeBuilder()
 
+# --- Job Search Setup ---
+@st.cache_resource
+def get_job_search_client():
+    return JobSearchClient(api_key=SERPAPI_KEY)
+
+job_search_client = get_job_search_client()
+
 # --- Geocoding Setup ---
-geolocator = Nominatim(user_agent="job_finder_pro")
-geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
+@st.cache_resource
+def get_cached_geocoder():
+    # The rate-limited Nominatim client is only built once a lookup misses the cache
+    return Geocoder(lazy_nominatim(user_agent="job_finder_pro"), gazetteer=get_gazetteer())
 
 def get_coordinates(location_name):
     """Get latitude and longitude for a location name with caching"""
-    if location_name in geocode_cache:
-        return tuple(geocode_cache[location_name])
-    
-    try:
-        location = geocode(location_name)
-        if location:
-            coords = (location.latitude, location.longitude)
-            geocode_cache[location_name] = coords
-            save_cache(geocode_cache)
-            return coords
-        return (0, 0)
-    except Exception as e:
-        st.warning(f"Geocoding error for {location_name}: {str(e)}")
-        return (0, 0)
+    return get_coordinates_many([location_name]).get(location_name, (0, 0))
 
-# --- PDF Functions ---
-def create_pdf_resume(user_data):
-    """Create PDF resume using PyPDF2 and ReportLab"""
-    packet = BytesIO()
-    can = canvas.Canvas(packet, pagesize=letter)
-    
-    # Set font and starting position
-    can.setFont("Helvetica-Bold", 16)
-    y_position = 750
-    
-    # Personal Information
-    can.drawString(72, y_position, user_data['name'])
-    y_position -= 20
-    
-    can.setFont("Helvetica", 12)
-    can.drawString(72, y_position, user_data['email'])
-    y_position -= 15
-    can.drawString(72, y_position, user_data['phone'])
-    y_position -= 30
-    
-    # Summary
-    can.setFont("Helvetica-Bold", 14)
-    can.drawString(72, y_position, "Professional Summary")
-    y_position -= 20
-    can.setFont("Helvetica", 12)
-    
-    # Handle multi-line summary
-    summary_lines = []
-    words = user_data['summary'].split()
-    line = ""
-    for word in words:
-        if len(line) + len(word) < 80:
-            line += word + " "
-        else:
-            summary_lines.append(line)
-            line = word + " "
-    if line:
-        summary_lines.append(line)
-    
-    for line in summary_lines:
-        can.drawString(72, y_position, line)
-        y_position -= 15
-    y_position -= 15
-    
-    # Experience
-    can.setFont("Helvetica-Bold", 14)
-    can.drawString(72, y_position, "Work Experience")
-    y_position -= 20
-    
-    for exp in user_data['experience']:
-        can.setFont("Helvetica-Bold", 12)
-        can.drawString(72, y_position, f"{exp['title']} at {exp['company']}")
-        y_position -= 15
-        
-        can.setFont("Helvetica-Oblique", 10)
-        can.drawString(72, y_position, f"{exp['start']} - {exp['end']}")
-        y_position -= 15
-        
-        can.setFont("Helvetica", 12)
-        desc_lines = []
-        words = exp['description'].split()
-        line = ""
-        for word in words:
-            if len(line) + len(word) < 80:
-                line += word + " "
-            else:
-                desc_lines.append(line)
-                line = word + " "
-        if line:
-            desc_lines.append(line)
-        
-        for line in desc_lines:
-            can.drawString(72, y_position, line)
-            y_position -= 15
-        y_position -= 10
-    
-    # Education
-    can.setFont("Helvetica-Bold", 14)
-    can.drawString(72, y_position, "Education")
-    y_position -= 20
-    
-    can.setFont("Helvetica", 12)
-    for edu in user_data['education']:
-        can.drawString(72, y_position, f"{edu['degree']}, {edu['institution']} ({edu['year']})")
-        y_position -= 15
-    
-    # Skills
-    can.setFont("Helvetica-Bold", 14)
-    can.drawString(72, y_position, "Skills")
-    y_position -= 20
-    
-    can.setFont("Helvetica", 12)
-    skills = ', '.join(user_data['skills'])
-    skill_lines = []
-    words = skills.split()
-    line = ""
-    for word in words:
-        if len(line) + len(word) < 80:
-            line += word + " "
-        else:
-            skill_lines.append(line)
-            line = word + " "
-    if line:
-        skill_lines.append(line)
-    
-    for line in skill_lines:
-        can.drawString(72, y_position, line)
-        y_position -= 15
-    
-    # Save the PDF
-    can.save()
-    
-    # Move to beginning of BytesIO buffer
-    packet.seek(0)
-    new_pdf = PdfReader(packet)
-    
-    # Create output PDF
-    output = BytesIO()
-    writer = PdfWriter()
-    writer.add_page(new_pdf.pages[0])
-    writer.write(output)
-    
-    return output.getvalue()
+def get_coordinates_many(location_names):
+    """Geocode a batch of location names, querying each distinct place at most once"""
+    def warn(name, error):
+        st.warning(f"Geocoding error for {name}: {str(error)}")
 
+    results = get_cached_geocoder().get_coordinates_many(location_names, on_error=warn)
+    return {name: coords or (0, 0) for name, coords in results.items()}
+
+# --- PDF Functions ---
 def extract_text_from_pdf(uploaded_file):
-    """Extract text from uploaded PDF"""
-    reader = PdfReader(uploaded_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text
+    """Extract text from uploaded PDF; cached by content, so reruns don't re-extract"""
+    return extract_pdf_text(uploaded_file)
+
+def import_resume_pdf(uploaded_file, fill_builder=True):
+    """Use an uploaded resume as resume_text and, optionally, parse it into the resume builder"""
+    text = extract_text_from_pdf(uploaded_file)
+    parsed = parse_resume_text(text)
+    st.session_state.resume_text = text
+    if fill_builder:
+        st.session_state.resume_data = parsed
+        # Keyed builder widgets keep their previous values unless their state is cleared
+        for key in [k for k in st.session_state if k.startswith(RESUME_BUILDER_WIDGET_PREFIXES)]:
+            del st.session_state[key]
+    return parsed
 
 # --- AI Assistant Functions ---
-def generate_ai_response(prompt, context=""):
-    """Generate response using BlenderBot model with resume-focused tuning"""
-    try:
-        # Enhanced prompt template for career advice
-        full_prompt = f"""<<SYS>>You are TESSERACT, an expert career coach specializing in resumes and job hunting. Provide:
-        - Concise, actionable advice
-        - Industry-specific best practices
-        - Professional tone
-        - Focus on resumes, cover letters, and interviews
-        <</SYS>>
-        
-        [CONTEXT]
-        {context}
-        
-        [QUESTION]
-        {prompt}
-        
-        [ANSWER]"""
-        
-        # Generate response using the local BlenderBot model
-        if "chatbot" in st.session_state and "conversation" in st.session_state:
-            st.session_state.conversation.add_user_input(full_prompt)
-            st.session_state.chatbot(st.session_state.conversation)
-            response = st.session_state.conversation.generated_responses[-1]
-            
-            # Clean the output
-            return response.split("[ANSWER]")[-1].strip()
-        else:
-            return "⚠️ AI assistant is not properly initialized. Please refresh the page."
-    
-    except Exception as e:
-        return f"⚠️ I'm having trouble generating a response. Error: {str(e)}"
+def generate_local_response(prompt, context="", semantic_cache=False):
+    """Generate with the local model; raises if it isn't ready or generation fails"""
+    cached = response_cache.get("local", LOCAL_MODEL_NAME, prompt, context, semantic=semantic_cache)
+    if cached is not None:
+        return cached
+    if local_model_loader.is_loading():
+        raise LocalModelNotReady("The local AI model is still warming up. Please try again in a moment.")
+    if not local_model_loader.is_ready():
+        raise LocalModelNotReady("AI assistant is not properly initialized. Please refresh the page.")
+
+    # Career-advice template; the system prefix is the same for every prompt
+    full_prompt = local_prompt(prompt, context)
+
+    # Generate response using the shared local BlenderBot inference server
+    response = inference_server.generate(full_prompt, max_new_tokens=LOCAL_REPLY_TOKENS, do_sample=True)
+
+    # Clean the output
+    response = response.split("[ANSWER]")[-1].strip()
+    if not response:
+        raise RuntimeError("The local AI model returned an empty response")
+    response_cache.set("local", LOCAL_MODEL_NAME, prompt, response, context)
+    return response
+
+def document_backend():
+    """
+    (model name, complete(prompt, max_tokens)) for match analyses and cover
+    letters: the HF chat model when a token is configured, since the local
+    model's window barely fits a resume, else the local model. Resolved on
+    the script thread; complete() is safe to call from task workers and
+    raises on failure, so an error message never becomes the document.
+    """
+    if HF_TOKEN:
+        client = get_hf_client()
+
+        def complete(prompt, max_tokens=CHAT_REPLY_TOKENS):
+            cached = response_cache.get("hf", HF_CHAT_MODEL, prompt, semantic=False)
+            if cached is not None:
+                return cached
+            text = hf_chat(client, chat_messages(prompt), model=HF_CHAT_MODEL, max_tokens=max_tokens)
+            if not text.strip():
+                raise RuntimeError("The online assistant returned an empty response")
+            response_cache.set("hf", HF_CHAT_MODEL, prompt, text)
+            return text
 
-def analyze_resume_for_job(resume_text, job_description):
-    prompt = f"""
+        return HF_CHAT_MODEL, complete
+    # Concurrent requests are micro-batched by the shared inference server
+    return LOCAL_MODEL_NAME, lambda prompt, max_tokens=None: generate_local_response(prompt)
+
+def document_backend_ready():
+    return bool(HF_TOKEN) or local_model_loader.is_ready()
+
+def analyze_resume_for_job(model_name, complete, resume_text, job_description, match_score=None, ats_report=None):
+    # The score comes from the embedding scorer; the LLM only explains it
+    score_line = f"The resume's similarity match score for this job is {match_score:.0f}%." if match_score is not None else ""
+    # The ATS keyword gaps stand in for the full description when the job names known skills
+    if ats_report and ats_report["coverage"] is not None:
+        job_heading, job_text = "Job keyword check", gap_summary(ats_report)
+        keywords = ats_report["matched"] + ats_report["missing"]
+    else:
+        job_heading, job_text, keywords = "Job Description", job_description, ()
+
+    def render(resume, job):
+        if model_name == LOCAL_MODEL_NAME:
+            # Terse, so the local model's 128-token window has room for the resume and job
+            return f"Resume:\n{resume}\n{job_heading}:\n{job}\nGive 3 strengths and 3 resume improvements for this job."
+        return f"""
     Analyze how well this resume matches the job description and suggest improvements.
+    {score_line}
     
     Resume:
-    {resume_text}
+    {resume}
     
-    Job Description:
-    {job_description}
+    {job_heading}:
+    {job}
     
     Provide:
-    1. Match score (0-100%)
-    2. 3 key strengths
-    3. 3 areas for improvement
-    4. Suggested resume tweaks
+    1. 3 key strengths
+    2. 3 areas for improvement
+    3. Suggested resume tweaks
     """
-    return generate_ai_response(prompt)
 
-def generate_cover_letter(resume_text, job_description):
-    prompt = f"""
-    Write a professional cover letter based on this resume and job description.
-    
-    Resume:
-    {resume_text}
-    
-    Job Description:
-    {job_description}
-    
-    The cover letter should:
-    - Be 3-4 paragraphs
-    - Highlight relevant skills/experience
-    - Show enthusiasm for the role
-    - Be tailored to the job
-    """
-    return generate_ai_response(prompt)
+    # Resume lines naming the job's keywords are the last to be cut
+    fitted = fit_sections(model_name, render("", ""),
+                          {"resume": (resume_text, 1), "job": (job_text, 1)}, keywords=keywords)
+    # Exact matches only: a similar-looking prompt may be a different resume or job
+    return complete(render(fitted["resume"], fitted["job"]), CHAT_REPLY_TOKENS)
+
+def generate_cover_letter(model_name, complete, resume_text, job_description):
+    """Raises on failure, so a task never stores an error message as the letter"""
+    prompt = cover_letter_prompt(resume_text, job_description, model_name)
+    return complete(prompt, COVER_LETTER_MAX_TOKENS)
+
+# --- Background Task Functions ---
+def start_task(fn, *args, kind, label, meta=None, **kwargs):
+    """Queue work on the background task queue and watch it from this session"""
+    owner = st.session_state.current_user or st.session_state.session_id
+    task_id = task_queue.submit(fn, *args, kind=kind, owner=owner, label=label, meta=meta, **kwargs)
+    st.session_state.watched_tasks[task_id] = kind
+    return task_id
+
+def generate_and_save_cover_letter(manager, job_id, model_name, complete, resume_text, job_description):
+    """Task body for a saved job's cover letter; the result is stored even if the session is gone"""
+    cover_letter = generate_cover_letter(model_name, complete, resume_text, job_description)
+    manager.save_cover_letter(job_id, cover_letter)
+    return cover_letter
+
+def locate_jobs(geocoder, center_name, job_locations, radius_km):
+    """Task body: geocode the search centre and results, then apply the radius filter"""
+    errors = []
+    # A whole state or country has no meaningful centre to measure a radius from
+    if geocoder.is_area(center_name):
+        return {"center": None, "errors": errors}
+    center = geocoder.get_coordinates(center_name)
+    if not center:
+        return {"center": None, "errors": errors}
+    # Jobs listed only by state or country ("Australia") can't be ruled in or
+    # out, so like ungeocodable ones they are kept and left off the map
+    areas = {name for name in set(job_locations) if geocoder.is_area(name)}
+    located = geocoder.get_coordinates_many(
+        [name for name in job_locations if name not in areas],
+        on_error=lambda name, error: errors.append(f"{name}: {error}")
+    )
+    coords = [located.get(name) for name in job_locations]
+    keep, distances = filter_by_radius(center, coords, radius_km)
+    return {
+        "center": list(center),
+        "coords": [list(point) if point else None for point in coords],
+        "keep": keep.tolist(),
+        "distances": [None if math.isnan(d) else round(float(d), 1) for d in distances],
+        "errors": errors
+    }
+
+def apply_located_jobs(located):
+    """Keep search results inside the radius and set up the map from a finished locate_jobs task"""
+    if located["center"] is None:
+        # Unknown or region-wide search centre: show everything, without a map
+        return
+    results = st.session_state.job_results
+    for job, distance in zip(results, located["distances"]):
+        job["distance_km"] = distance
+    coords = [tuple(point) if point else None for point in located["coords"]]
+    st.session_state.job_results = [job for job, kept in zip(results, located["keep"]) if kept]
+    st.session_state.job_map_data = {
+        "center": tuple(located["center"]),
+        "coords": [point for point, kept in zip(coords, located["keep"]) if kept],
+        "radius_km": st.session_state.job_search_radius
+    }
+    for error in located["errors"]:
+        st.warning(f"Geocoding error for {error}")
+
+def collect_finished_tasks():
+    """Apply the results of this session's finished tasks, once each"""
+    for task_id, kind in list(st.session_state.watched_tasks.items()):
+        task = task_queue.get(task_id)
+        if task is not None and task["state"] in ACTIVE_STATES:
+            continue
+        del st.session_state.watched_tasks[task_id]
+        if task is None:
+            continue
+        if task["state"] == TASK_FAILED:
+            st.error(f"{task['label']} failed: {task['error']}")
+            if kind == "locate_jobs" and st.session_state.locating_task == task_id:
+                st.session_state.locating_task = None
+            continue
+        
+        result = task["result"]
+        if kind == "cover_letter":
+            st.session_state.generated_cover_letter = result
+        elif kind == "match_analysis":
+            st.session_state.match_analyses[task["meta"]["job_key"]] = result
+        elif kind == "resume_pdf":
+            st.session_state.resume_pdf = {"file_name": task["meta"]["file_name"], "data": result}
+        elif kind == "batch_cover_letters":
+            # Keep only the jobs that failed selected, so they can be retried
+            st.session_state.batch_cover_letter_ids = set(result["errors"])
+            for job_id, error in result["errors"].items():
+                st.error(f"Cover letter for {job_id} failed: {error}")
+        elif kind == "locate_jobs":
+            if st.session_state.locating_task != task_id:
+                continue  # superseded by a newer search
+            st.session_state.locating_task = None
+            apply_located_jobs(result)
+            st.toast(f"✅ Found {len(st.session_state.job_results)} matching jobs!")
+            continue
+        st.toast(f"✅ {task['label']} is ready")
+
+@st.fragment(run_every=TASK_POLL_SECONDS)
+def task_status_panel():
+    """Progress of this session's running tasks; reruns the app once any of them finishes"""
+    tasks = [task_queue.get(task_id) for task_id in st.session_state.watched_tasks]
+    if any(task is None or task["state"] not in ACTIVE_STATES for task in tasks):
+        st.rerun()
+    for task in tasks:
+        st.progress(task["progress"] or 0.0, text=f"⏳ {task['label']}...")
 
 # --- Notification Functions ---
 def check_for_new_jobs(user_profile):
@@ -555,6 +595,12 @@ if 'active_tab' not in st.session_state:
     st.session_state.active_tab = "💬 AI Assistant"
 if 'selected_job' not in st.session_state:
     st.session_state.selected_job = None
+if 'job_results' not in st.session_state:
+    st.session_state.job_results = []
+if 'job_map_data' not in st.session_state:
+    st.session_state.job_map_data = None
+if 'match_analyses' not in st.session_state:
+    st.session_state.match_analyses = {}
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
 if 'notifications' not in st.session_state:
@@ -575,8 +621,27 @@ if 'resume_text' not in st.session_state:
     st.session_state.resume_text = ""
 if 'resume_file' not in st.session_state:
     st.session_state.resume_file = None
+if 'imported_resume_id' not in st.session_state:
+    st.session_state.imported_resume_id = None
 if 'generated_cover_letter' not in st.session_state:
     st.session_state.generated_cover_letter = ""
+if 'saved_jobs_page' not in st.session_state:
+    st.session_state.saved_jobs_page = 1
+if 'batch_cover_letter_ids' not in st.session_state:
+    st.session_state.batch_cover_letter_ids = set()
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'watched_tasks' not in st.session_state:
+    st.session_state.watched_tasks = {}
+if 'locating_task' not in st.session_state:
+    st.session_state.locating_task = None
+if 'job_search_radius' not in st.session_state:
+    st.session_state.job_search_radius = 0
+if 'resume_pdf' not in st.session_state:
+    st.session_state.resume_pdf = None
+
+# Initialize SavedJobsManager for this user's partition (shared across sessions in the process)
+jobs_manager = SavedJobsManager.for_user(st.session_state.current_user)
 
 # --- Header Section ---
 st.markdown("""
@@ -586,6 +651,11 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
+# --- Background Tasks ---
+collect_finished_tasks()
+# Filled at the end of the script so tasks started during this run are shown too
+task_panel = st.container()
+
 # --- Main App Tabs ---
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "🔍 Job Search", 
@@ -646,52 +716,184 @@ with tab1:
     # --- Job Results Display ---
     if search_clicked:
         with st.spinner('Searching for the best jobs...'):
-            # Simulate job search results
-            time.sleep(2)
-            st.session_state.selected_job = {
-                "title": "Senior Software Engineer",
-                "company_name": "Tech Corp Inc.",
-                "location": "Sydney, NSW",
-                "via": "LinkedIn",
-                "description": "We're looking for a skilled software engineer with 5+ years experience in Python and web development. Responsibilities include developing new features, maintaining existing codebase, and collaborating with cross-functional teams.",
-                "posted": "2 days ago"
-            }
-            st.success("Found 15 matching jobs!")
+            try:
+                st.session_state.job_results = job_search_client.search(
+                    job_title,
+                    COUNTRIES[selected_country],
+                    location=location,
+                    radius_km=radius_km,
+                    country_name=selected_country
+                )
+                st.session_state.selected_job = None
+                st.session_state.job_map_data = None
+                st.session_state.match_analyses = {}
+                st.session_state.locating_task = None
+
+                if not st.session_state.job_results:
+                    st.info("No jobs found. Try a broader title or a larger radius.")
+                # Without a location there is no centre for the radius: keep every result, with no map
+                elif location.strip():
+                    # Geocode every result in one background batch and keep those inside the radius
+                    job_locations = [
+                        f"{job.get('location', '')}, {selected_country}" if job.get('location') else ""
+                        for job in st.session_state.job_results
+                    ]
+                    st.session_state.job_search_radius = radius_km
+                    st.session_state.locating_task = start_task(
+                        locate_jobs,
+                        get_cached_geocoder(),
+                        f"{location}, {selected_country}",
+                        job_locations,
+                        radius_km,
+                        kind="locate_jobs",
+                        label=f"Locating {len(job_locations)} jobs"
+                    )
+            except (JobSearchError, requests.RequestException) as e:
+                st.error(f"Job search failed: {str(e)}")
+
+    if st.session_state.locating_task:
+        st.info(f"📍 Found {len(st.session_state.job_results)} jobs, checking which are within your search radius...")
+    elif st.session_state.job_results and not st.session_state.selected_job:
+        map_data = st.session_state.job_map_data
+        if map_data and any(map_data["coords"]):
+            from streamlit_folium import folium_static
+
+            folium_static(build_job_map(
+                map_data["center"],
+                st.session_state.job_results,
+                map_data["coords"],
+                map_data["radius_km"]
+            ), height=400)
+
+        # Rank results against the resume in one vectorized pass; indices stay
+        # aligned with job_results (and the map) so widget keys are stable
+        results = st.session_state.job_results
+        resume_skills = st.session_state.resume_data["skills"]
+        if st.session_state.resume_text or resume_skills:
+            ats_reports = ats_analyzer.analyze_many(st.session_state.resume_text, resume_skills, results)
+        else:
+            ats_reports = [None] * len(results)
+        if st.session_state.resume_text and match_scores_available():
+            ranking = match_scorer.rank_jobs(st.session_state.resume_text, results)
+            if st.button(f"🧠 Analyze Top {TOP_MATCHES_FOR_ANALYSIS} Matches", key="analyze_top_matches"):
+                backend = document_backend()
+                for i, score in ranking[:TOP_MATCHES_FOR_ANALYSIS]:
+                    start_task(
+                        analyze_resume_for_job,
+                        *backend,
+                        st.session_state.resume_text,
+                        results[i].get('description', ''),
+                        score,
+                        ats_report=ats_reports[i],
+                        kind="match_analysis",
+                        label=f"Match analysis: {results[i].get('title', 'job')}",
+                        meta={"job_key": make_job_id(results[i])}
+                    )
+        else:
+            ranking = [(i, None) for i in range(len(results))]
+            if not st.session_state.resume_text:
+                st.caption("Upload or create a resume to rank these jobs by how well they match it.")
+            elif not match_scorer.is_ready() and match_scorer.error is None:
+                st.caption("⏳ Resume match scores will appear once the matching model has loaded.")
+
+        for i, match_score in ranking:
+            result = results[i]
+            ats_report = ats_reports[i]
+            ats_line = ""
+            if ats_report and ats_report["coverage"] is not None:
+                ats_line = f"{ats_report['coverage']:.0f}%"
+                if ats_report["missing"]:
+                    ats_line += " • missing " + ", ".join(ats_report["missing"][:5])
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.markdown(f"""
+                    <div class="job-card">
+                        <div class="job-title">{html.escape(result.get('title') or 'N/A')}</div>
+                        <div class="company-name">{html.escape(result.get('company_name') or 'N/A')}</div>
+                        <div class="location">{html.escape(result.get('location') or 'N/A')}</div>
+                        <div class="via">via {html.escape(result.get('via') or 'Unknown')}</div>
+                        {f'<p><strong>🎯 Resume match: {match_score:.0f}%</strong></p>' if match_score is not None else ''}
+                        {f'<p><small>🧾 ATS keywords: {ats_line}</small></p>' if ats_line else ''}
+                        <p><small>Posted: {html.escape(result.get('posted') or 'Date not available')}{f" • {result['distance_km']} km away" if result.get('distance_km') is not None else ""}</small></p>
+                    </div>
+                """, unsafe_allow_html=True)
+                analysis = st.session_state.match_analyses.get(make_job_id(result))
+                if analysis:
+                    with st.expander("🧠 Match analysis"):
+                        st.write(analysis)
+            with col2:
+                if st.button("View Details", key=f"view_job_{i}"):
+                    st.session_state.selected_job = result
+                    st.rerun()
 
     # --- Job Details Section with Save Option ---
     if st.session_state.selected_job:
         job = st.session_state.selected_job
-        job_id = f"{job.get('title', '')}_{job.get('company_name', '')}".replace(" ", "_")
+        job_id = jobs_manager.find_saved_job(job) or make_job_id(job)
         
         col1, col2 = st.columns([3, 1])
         with col1:
             st.markdown(f"""
                 <div class="job-card">
-                    <div class="job-title">{job.get('title', 'N/A')}</div>
-                    <div class="company-name">{job.get('company_name', 'N/A')}</div>
-                    <div class="location">{job.get('location', 'N/A')}</div>
-                    <div class="via">via {job.get('via', 'Unknown')}</div>
+                    <div class="job-title">{html.escape(job.get('title') or 'N/A')}</div>
+                    <div class="company-name">{html.escape(job.get('company_name') or 'N/A')}</div>
+                    <div class="location">{html.escape(job.get('location') or 'N/A')}</div>
+                    <div class="via">via {html.escape(job.get('via') or 'Unknown')}</div>
                     <p><strong>Description:</strong></p>
-                    <p>{job.get('description', 'No description available')}</p>
-                    <p><small>Posted: {job.get('posted', 'Date not available')}</small></p>
+                    <p>{html.escape(job.get('description') or 'No description available')}</p>
+                    <p><small>Posted: {html.escape(job.get('posted') or 'Date not available')}</small></p>
                 </div>
             """, unsafe_allow_html=True)
+            analysis = st.session_state.match_analyses.get(make_job_id(job))
+            if analysis:
+                st.markdown("#### 🧠 Match Analysis")
+                st.write(analysis)
         
         with col2:
+            if st.session_state.job_results and st.button("⬅️ Back to Results"):
+                st.session_state.selected_job = None
+                st.rerun()
+
             if st.button("💾 Save Job"):
                 job_id=jobs_manager.save_job(job)
                 st.success("Job Saved")
+
+            if st.session_state.resume_text:
+                match_score = None
+                if match_scores_available():
+                    match_score = float(match_scorer.score_jobs(st.session_state.resume_text, [job])[0])
+                    st.metric("🎯 Resume match", f"{match_score:.0f}%")
+                ats_report = ats_analyzer.analyze_many(
+                    st.session_state.resume_text, st.session_state.resume_data["skills"], [job]
+                )[0]
+                if ats_report["coverage"] is not None:
+                    st.metric("🧾 ATS keywords", f"{ats_report['coverage']:.0f}%")
+                    if ats_report["missing"]:
+                        st.caption("Missing: " + ", ".join(ats_report["missing"]))
+                if st.button("🔍 Analyze Match"):
+                    start_task(
+                        analyze_resume_for_job,
+                        *document_backend(),
+                        st.session_state.resume_text,
+                        job.get('description', ''),
+                        match_score,
+                        ats_report=ats_report,
+                        kind="match_analysis",
+                        label=f"Match analysis: {job.get('title', 'job')}",
+                        meta={"job_key": make_job_id(job)}
+                    )
     
             
             if st.button("📄 Generate Cover Letter"):
                 if 'resume_text' in st.session_state and st.session_state.resume_text:
-                    with st.spinner('Generating cover letter...'):
-                        cover_letter = generate_cover_letter(
-                            st.session_state.resume_text,
-                            job.get('description', '')
-                        )
-                        st.session_state.generated_cover_letter = cover_letter
-                        st.rerun()  # Use this instead
+                    start_task(
+                        generate_cover_letter,
+                        *document_backend(),
+                        st.session_state.resume_text,
+                        job.get('description', ''),
+                        kind="cover_letter",
+                        label=f"Cover letter: {job.get('title', 'job')}"
+                    )
                 else:
                     st.warning("Please upload or create a resume first")
 
@@ -705,6 +907,12 @@ with tab1:
 
 with tab2:
     st.markdown("### 🤖AI Assistant - TESSERACT")
+
+    # Local model readiness
+    if local_model_loader.is_loading():
+        st.caption(f"⏳ Local AI model is {local_model_loader.state}... Online assistant is available meanwhile.")
+    elif local_model_loader.state == MODEL_FAILED:
+        st.caption(f"⚠️ Local AI model unavailable: {local_model_loader.error}")
     
     # Initialize the chatbot in session state if not exists
     if "chat_history" not in st.session_state:
@@ -719,63 +927,122 @@ with tab2:
             st.write(msg["content"])
 
     # Quick action buttons
+    quick_prompt = None
+    ats_check = False
     with st.expander("💡 Quick Career Questions"):
         cols = st.columns(2)
         with cols[0]:
             if st.button("Best resume format"):
-                st.session_state.chat_history.append({"role": "user", "content": "What's the best resume format for my industry?"})
+                quick_prompt = "What's the best resume format for my industry?"
         with cols[1]:
             if st.button("ATS optimization"):
-                st.session_state.chat_history.append({"role": "user", "content": "How can I optimize my resume for ATS systems?"})
+                ats_check = True
         
         cols = st.columns(2)
         with cols[0]:
             if st.button("Cover letter tips"):
-                st.session_state.chat_history.append({"role": "user", "content": "What makes a strong cover letter?"})
+                quick_prompt = "What makes a strong cover letter?"
         with cols[1]:
             if st.button("Interview prep"):
-                st.session_state.chat_history.append({"role": "user", "content": "What are the top interview preparation tips?"})
+                quick_prompt = "What are the top interview preparation tips?"
+
+    # The ATS check is answered from the keyword analyzer against the current
+    # search results (or saved jobs); the LLM only gets the question without them
+    if ats_check:
+        ats_jobs = st.session_state.job_results or [
+            saved["job"] for saved in jobs_manager.get_all_jobs().values()
+        ]
+        resume_skills = st.session_state.resume_data["skills"]
+        if ats_jobs and (st.session_state.resume_text or resume_skills):
+            reports = [r for r in ats_analyzer.analyze_many(st.session_state.resume_text, resume_skills, ats_jobs)
+                       if r["coverage"] is not None]
+            if reports:
+                source = "search results" if st.session_state.job_results else "saved jobs"
+                average = sum(r["coverage"] for r in reports) / len(reports)
+                lines = [f"**ATS keyword check** against {len(reports)} {source}: your resume covers "
+                         f"{average:.0f}% of their keywords on average."]
+                gaps = common_gaps(reports)
+                if gaps:
+                    lines.append("Keywords they ask for that your resume doesn't show:")
+                    lines.extend(f"- {skill} ({count} of {len(reports)} jobs)" for skill, count in gaps)
+                    lines.append("Add the ones you genuinely have, using the same wording, to your "
+                                 "skills section and the experience where you used them.")
+                else:
+                    lines.append("Your resume already shows every skill keyword these jobs mention.")
+                st.session_state.chat_history.append({"role": "user", "content": "ATS optimization"})
+                st.session_state.chat_history.append({"role": "assistant", "content": "\n".join(lines)})
+                st.rerun()
+        quick_prompt = "How can I optimize my resume for ATS systems?"
 
     # Main chat input
-    if prompt := st.chat_input("Ask your career question..."):
+    if prompt := st.chat_input("Ask your career question...") or quick_prompt:
         st.session_state.active_tab = "💬 AI Assistant"
+        if HF_TOKEN:
+            cache_backend, cache_model = "hf", HF_CHAT_MODEL
+        else:
+            cache_backend, cache_model = "local", LOCAL_MODEL_NAME
+        # Resume and earlier turns share what the model's context leaves after the question
+        context_note = ""
+        try:
+            fitted = fit_sections(cache_model, prompt, {
+                "resume": (st.session_state.resume_text, 3),
+                "history": (st.session_state.chat_history, 2),
+            })
+        except PromptTooLong:
+            # Only the local model's small window runs out: answer the question alone, and say so
+            fitted = {"resume": "", "history": []}
+            context_note = "\n\n_This question is too long for the local model to also read your resume and earlier messages, so they were left out._"
+        # What the model is sent besides the question scopes the cache entry
+        cache_context = "\n".join([fitted["resume"]] + [m["content"] for m in fitted["history"]])
         st.session_state.chat_history.append({"role": "user", "content": prompt})
         
-        with st.spinner("Researching..."):
-            # Add resume context if available
-            context = ""
-            if 'resume_text' in st.session_state and st.session_state.resume_text:
-                context = f"Resume Context:\n{st.session_state.resume_text[:500]}..."
-            
-            # Generate response using either local model or Hugging Face Inference API
-            if HF_TOKEN:  # If you have a Hugging Face token
+        with st.chat_message("user"):
+            st.write(prompt)
+
+        # Only the canned quick questions may reuse an answer to similar wording
+        cached_response = response_cache.get(cache_backend, cache_model, prompt, cache_context,
+                                             semantic=prompt == quick_prompt)
+
+        # Stream the response token by token from either the Hugging Face
+        # Inference API or the local model
+        with st.chat_message("assistant"):
+            if cached_response is not None:
+                ai_response = cached_response
+                st.write(ai_response)
+            elif HF_TOKEN:  # If you have a Hugging Face token
                 try:
-                    response = hf_client.chat_completion(
-                        messages=[{"role": m["role"], "content": m["content"]} 
-                                 for m in st.session_state.chat_history[-6:]],
-                        model="HuggingFaceH4/zephyr-7b-beta",
-                        max_tokens=500
-                    )
-                    ai_response = response.choices[0].message.content
+                    ai_response = st.write_stream(stream_hf_chat(
+                        get_hf_client(),
+                        messages=chat_messages(prompt, fitted["resume"], fitted["history"]),
+                        model=HF_CHAT_MODEL,
+                        max_tokens=CHAT_REPLY_TOKENS
+                    ))
+                    response_cache.set(cache_backend, cache_model, prompt, ai_response, cache_context)
                 except Exception as e:
                     st.error(f"API Error: {str(e)}")
                     ai_response = "I'm having trouble connecting to the AI service. Please try again later."
-            elif local_ai:  # Fallback to local model
-                full_prompt = f"""<<SYS>>You are TESSERACT, an expert career coach. Provide concise, actionable advice.<</SYS>>
-                
-                [CONTEXT]
-                {context}
-                
-                [QUESTION]
-                {prompt}"""
-                
-                response = local_ai(full_prompt, max_length=500, do_sample=True)
-                ai_response = response[0]['generated_text'].split('[QUESTION]')[-1].strip()
+            elif local_model_loader.is_ready():  # Fallback to local model
+                context = "\n\n".join(part for part in [
+                    f"Resume:\n{fitted['resume']}" if fitted["resume"] else "",
+                    f"Conversation so far:\n{history_text(fitted['history'])}" if fitted["history"] else "",
+                ] if part)
+                try:
+                    # Through the shared server, so concurrent streams are bounded and time out
+                    ai_response = st.write_stream(inference_server.stream(
+                        local_prompt(prompt, context), max_new_tokens=LOCAL_REPLY_TOKENS, do_sample=True
+                    ))
+                    response_cache.set(cache_backend, cache_model, prompt, ai_response, cache_context)
+                except Exception as e:
+                    st.error(f"Local model error: {str(e)}")
+                    ai_response = "I'm having trouble generating a response. Please try again."
+            elif local_model_loader.is_loading():
+                ai_response = "⏳ The local AI model is still warming up. Please try again in a moment."
+                st.write(ai_response)
             else:
                 ai_response = "AI assistant is not available. Please check your configuration."
-            
-            st.session_state.chat_history.append({"role": "assistant", "content": ai_response})
-        
+                st.write(ai_response)
+
+        st.session_state.chat_history.append({"role": "assistant", "content": ai_response + context_note})
         st.rerun()
 
     # Clear chat button
@@ -798,6 +1065,26 @@ with tab3:
         index=0
     )
     
+    # Import an existing resume into the form
+    imported_file = st.file_uploader(
+        "📄 Import an existing resume (PDF)",
+        type=["pdf"],
+        key="resume_import",
+        help="Fills in the form below from your current resume"
+    )
+    if imported_file is not None and imported_file.file_id != st.session_state.imported_resume_id:
+        st.session_state.imported_resume_id = imported_file.file_id
+        try:
+            parsed = import_resume_pdf(imported_file)
+            st.success(
+                f"Imported {len(parsed['experience'])} positions, {len(parsed['education'])} "
+                f"education entries and {len(parsed['skills'])} skills. Review them below."
+            )
+        except PDFLimitError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Couldn't read that PDF: {str(e)}")
+    
     # Resume form
     with st.form("resume_form"):
         st.session_state.resume_data["name"] = st.text_input(
@@ -932,14 +1219,23 @@ with tab3:
             # Generate PDF
             try:
                 template_key = templates[selected_template]
-                pdf_bytes = resume_builder.create_resume_pdf(
-                    st.session_state.resume_data,
-                    template=template_key
-                )
                 
-                # Show download button
                 file_name = f"{st.session_state.resume_data['name'].replace(' ', '_')}_Resume.pdf"
-                resume_builder.create_download_button(pdf_bytes, file_name)
+                cached_pdf = resume_builder.cached_resume_pdf(st.session_state.resume_data, template_key)
+                if cached_pdf is not None:
+                    st.session_state.resume_pdf = {"file_name": file_name, "data": cached_pdf}
+                else:
+                    # Rendered in a worker process; the download appears when it's done
+                    st.session_state.resume_pdf = None
+                    start_task(
+                        render_resume_pdf,
+                        copy.deepcopy(st.session_state.resume_data),
+                        template_key,
+                        kind="resume_pdf",
+                        label="Resume PDF",
+                        meta={"file_name": file_name},
+                        cpu_bound=True
+                    )
                 
                 # Store text version for AI analysis
                 resume_text = f"""
@@ -964,6 +1260,14 @@ with tab3:
                 
             except Exception as e:
                 st.error(f"Failed to generate PDF: {str(e)}")
+    
+    if st.session_state.resume_pdf:
+        st.download_button(
+            label="📥 Download Resume PDF",
+            data=st.session_state.resume_pdf["data"],
+            file_name=st.session_state.resume_pdf["file_name"],
+            mime="application/pdf"
+        )
 
 with tab4:
     # --- Notifications Center ---
@@ -995,22 +1299,123 @@ with tab5:
     # --- Saved Jobs ---
     st.markdown("### 💾 Saved Jobs")
     
-    saved_jobs = jobs_manager.get_all_jobs()
+    def reset_saved_jobs_page():
+        st.session_state.saved_jobs_page = 1
+    
+    def clear_batch_selection():
+        for job_id in st.session_state.batch_cover_letter_ids:
+            st.session_state.pop(f"batch_select_{job_id}", None)
+        st.session_state.batch_cover_letter_ids = set()
     
-    if not saved_jobs:
+    def toggle_batch_selection(job_id):
+        # Kept outside widget state so selections survive paging and filtering
+        if st.session_state[f"batch_select_{job_id}"]:
+            st.session_state.batch_cover_letter_ids.add(job_id)
+        else:
+            st.session_state.batch_cover_letter_ids.discard(job_id)
+    
+    if not jobs_manager.count():
         st.info("You haven't saved any jobs yet.")
     else:
-        for job_id, saved_job in saved_jobs.items():
+        # Filtering, sorting and paging are served from the manager's indexes,
+        # so only the visible page's widgets are built on each rerun
+        statuses, companies = jobs_manager.filter_options()
+        search_text = st.text_input("🔍 Search saved jobs",
+                                    placeholder="Title, company, location, description or notes",
+                                    key="saved_jobs_search", on_change=reset_saved_jobs_page)
+        filter_col1, filter_col2, filter_col3 = st.columns(3)
+        with filter_col1:
+            status_filter = st.selectbox("Status", ["All"] + statuses,
+                                         key="saved_jobs_status", on_change=reset_saved_jobs_page)
+        with filter_col2:
+            company_filter = st.selectbox("Company", ["All"] + companies,
+                                          key="saved_jobs_company", on_change=reset_saved_jobs_page)
+        with filter_col3:
+            # Search results are ranked by relevance
+            sort_choice = st.selectbox("Sort by", list(SAVED_JOBS_SORTS),
+                                       key="saved_jobs_sort", on_change=reset_saved_jobs_page,
+                                       disabled=bool(search_text.strip()))
+        
+        sort_by, descending = SAVED_JOBS_SORTS[sort_choice]
+        query = dict(
+            status=None if status_filter == "All" else status_filter,
+            company=None if company_filter == "All" else company_filter,
+            sort_by=sort_by,
+            descending=descending,
+            page_size=SAVED_JOBS_PAGE_SIZE,
+            text=search_text
+        )
+        page_jobs, total = jobs_manager.query_jobs(page=st.session_state.saved_jobs_page, **query)
+        total_pages = max(1, math.ceil(total / SAVED_JOBS_PAGE_SIZE))
+        if st.session_state.saved_jobs_page > total_pages:
+            # The last job on the final page was removed or no longer matches
+            st.session_state.saved_jobs_page = total_pages
+            page_jobs, total = jobs_manager.query_jobs(page=total_pages, **query)
+        
+        page_col1, page_col2, page_col3 = st.columns([1, 2, 1])
+        with page_col1:
+            if st.button("⬅️ Previous", key="saved_jobs_prev",
+                         disabled=st.session_state.saved_jobs_page <= 1):
+                st.session_state.saved_jobs_page -= 1
+                st.rerun()
+        with page_col2:
+            st.caption(f"Page {st.session_state.saved_jobs_page} of {total_pages} • {total} saved jobs")
+        with page_col3:
+            if st.button("Next ➡️", key="saved_jobs_next",
+                         disabled=st.session_state.saved_jobs_page >= total_pages):
+                st.session_state.saved_jobs_page += 1
+                st.rerun()
+        
+        # Batch cover letters for the jobs ticked below, across pages
+        batch_ids = [job_id for job_id in st.session_state.batch_cover_letter_ids if jobs_manager.get_job(job_id)]
+        if batch_ids:
+            st.markdown(f"**✏️ {len(batch_ids)} job(s) selected for batch cover letters**")
+            if len(batch_ids) > BATCH_MAX_JOBS:
+                st.warning(f"Select at most {BATCH_MAX_JOBS} jobs per batch.")
+            batch_col1, batch_col2 = st.columns(2)
+            with batch_col1:
+                generate_batch = st.button(f"✏️ Generate {len(batch_ids)} Cover Letters",
+                                           key="batch_cover_letters",
+                                           disabled=len(batch_ids) > BATCH_MAX_JOBS)
+            with batch_col2:
+                if st.button("Clear Selection", key="batch_clear"):
+                    clear_batch_selection()
+                    st.rerun()
+            
+            if generate_batch:
+                if not st.session_state.resume_text:
+                    st.warning("Please upload or create a resume first")
+                elif not document_backend_ready():
+                    st.warning("⏳ The AI model is still warming up. Please try again in a moment.")
+                else:
+                    model_name, complete = document_backend()
+                    start_task(
+                        generate_and_save_cover_letters,
+                        jobs_manager,
+                        {job_id: jobs_manager.get_job(job_id)["job"] for job_id in batch_ids},
+                        st.session_state.resume_text,
+                        lambda prompt: complete(prompt, COVER_LETTER_MAX_TOKENS),
+                        model_name=model_name,
+                        kind="batch_cover_letters",
+                        label=f"{len(batch_ids)} cover letters",
+                        with_progress=True
+                    )
+                    clear_batch_selection()
+        
+        if not page_jobs:
+            st.info("No saved jobs match these filters.")
+        
+        for job_id, saved_job in page_jobs:
             job = saved_job['job']
             
             # Create expandable section for each job
             with st.expander(f"{job.get('title', 'N/A')} at {job.get('company_name', 'N/A')} - {saved_job['application_status']}"):
                 st.markdown(f"""
                     <div class="job-card">
-                        <div class="job-title">{job.get('title', 'N/A')}</div>
-                        <div class="company-name">{job.get('company_name', 'N/A')}</div>
-                        <div class="location">{job.get('location', 'N/A')}</div>
-                        <div class="via">via {job.get('via', 'Unknown')}</div>
+                        <div class="job-title">{html.escape(job.get('title') or 'N/A')}</div>
+                        <div class="company-name">{html.escape(job.get('company_name') or 'N/A')}</div>
+                        <div class="location">{html.escape(job.get('location') or 'N/A')}</div>
+                        <div class="via">via {html.escape(job.get('via') or 'Unknown')}</div>
                         <p><strong>Status:</strong> {saved_job['application_status']}</p>
                         <p><small>Saved on: {saved_job['saved_at']}</small></p>
                     </div>
@@ -1028,6 +1433,24 @@ with tab5:
                 if notes != saved_job.get('notes', ''):
                     jobs_manager.update_job_notes(job_id, notes)
                 
+                # Cover letter saved with this job (single or batch generation)
+                if saved_job.get('cover_letter'):
+                    st.markdown("**Cover Letter:**")
+                    st.text_area("Saved Cover Letter", saved_job['cover_letter'], height=200,
+                                 key=f"saved_cover_{job_id}", disabled=True)
+                    st.download_button(
+                        label="📥 Download Cover Letter",
+                        data=saved_job['cover_letter'],
+                        file_name=f"cover_letter_{job_id}.txt",
+                        mime="text/plain",
+                        key=f"download_cover_{job_id}"
+                    )
+                
+                st.checkbox("Include in batch cover letters",
+                            value=job_id in st.session_state.batch_cover_letter_ids,
+                            key=f"batch_select_{job_id}",
+                            on_change=toggle_batch_selection, args=(job_id,))
+                
                 # Action buttons
                 col1, col2, col3 = st.columns(3)
                 
@@ -1041,13 +1464,16 @@ with tab5:
                 with col2:
                     if st.button(f"✏️ Generate Cover Letter", key=f"cover_{job_id}"):
                         if 'resume_text' in st.session_state and st.session_state.resume_text:
-                            with st.spinner('Generating cover letter...'):
-                                cover_letter = generate_cover_letter(
-                                    st.session_state.resume_text,
-                                    job.get('description', '')
-                                )
-                                st.session_state.generated_cover_letter = cover_letter
-                                st.rerun()
+                            start_task(
+                                generate_and_save_cover_letter,
+                                jobs_manager,
+                                job_id,
+                                *document_backend(),
+                                st.session_state.resume_text,
+                                job.get('description', ''),
+                                kind="cover_letter",
+                                label=f"Cover letter: {job.get('title', 'job')}"
+                            )
                         else:
                             st.warning("Please upload or create a resume first")
                 
@@ -1069,8 +1495,12 @@ with tab5:
                         email = st.text_input("Email", st.session_state.resume_data.get("email", ""))
                         phone = st.text_input("Phone", st.session_state.resume_data.get("phone", ""))
                         
-                        # Use generated cover letter or create new one
-                        if 'generated_cover_letter' in st.session_state:
+                        # Use this job's saved cover letter, the last generated one, or a new one
+                        if saved_job.get('cover_letter'):
+                            cover_letter = st.text_area("Cover Letter",
+                                                      saved_job['cover_letter'],
+                                                      height=300)
+                        elif 'generated_cover_letter' in st.session_state:
                             cover_letter = st.text_area("Cover Letter", 
                                                       st.session_state.generated_cover_letter,
                                                       height=300)
@@ -1090,6 +1520,15 @@ with tab5:
                             if not all([name, email, cover_letter]):
                                 st.error("Please fill in all required fields")
                             else:
+                                if resume_file is not None:
+                                    # The uploaded resume becomes the AI context; it only fills the
+                                    # resume builder if that hasn't been started
+                                    builder_empty = not (st.session_state.resume_data["name"]
+                                                         or st.session_state.resume_data["experience"])
+                                    try:
+                                        import_resume_pdf(resume_file, fill_builder=builder_empty)
+                                    except Exception as e:
+                                        st.warning(f"Couldn't read the uploaded resume: {str(e)}")
                                 # In a real app, you would submit to the job board/company here
                                 success, message = jobs_manager.apply_to_job(job_id, cover_letter)
                                 if success:
@@ -1099,6 +1538,10 @@ with tab5:
                                 else:
                                     st.error(message)
 
+with task_panel:
+    if st.session_state.watched_tasks:
+        task_status_panel()
+
 # --- Footer Section ---
 st.markdown("""
     <div class="footer">
@@ -0,0 +1,95 @@
+import threading
+from collections import Counter, OrderedDict
+
+from response_cache import hash_text
+from skill_taxonomy import get_skill_matcher
+
+# Constants
+JOB_KEYWORD_CACHE_SIZE = 4096  # jobs
+MAX_MENTION_WEIGHT = 3  # repeating a keyword raises its weight, up to this
+TITLE_WEIGHT = 2  # extra weight for keywords named in the job title
+PROMPT_KEYWORDS = 12  # keywords of each kind passed on to the LLM
+
+
+class ATSAnalyzer:
+    """
+    Deterministic ATS keyword check. Each job's taxonomy keywords are weighted
+    by how often the description repeats them (and whether the title names
+    them); coverage is the weighted share the resume already shows. Job
+    keywords are cached by content hash, so rescoring the same results on a
+    rerun or against an edited resume only rescans the resume.
+    """
+
+    def __init__(self, matcher=None, cache_size=JOB_KEYWORD_CACHE_SIZE):
+        self.matcher = matcher or get_skill_matcher()
+        self.cache_size = cache_size
+        self._job_keywords = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resume_keywords(self, resume_text="", skills=()):
+        """Canonical skills the resume shows, from its skills list and its text"""
+        found = set()
+        for skill in skills:
+            canonical = self.matcher.canonical(skill)
+            # A skills list entry is a skill by position, so "Go" or "R" counts here
+            found.update([canonical] if canonical else self.matcher.find(skill, include_ambiguous=True))
+        found.update(self.matcher.find(resume_text or ""))
+        return found
+
+    def job_keywords(self, job):
+        """{canonical skill: weight} for a job, heaviest first"""
+        title, description = job.get("title") or "", job.get("description") or ""
+        key = hash_text(f"{title}\n{description}")
+        with self._lock:
+            weights = self._job_keywords.get(key)
+            if weights is not None:
+                self._job_keywords.move_to_end(key)
+                return weights
+
+        mentions = Counter(self.matcher.matches(description))
+        in_title = set(self.matcher.find(title))
+        weights = {skill: min(count, MAX_MENTION_WEIGHT) for skill, count in mentions.items()}
+        for skill in in_title:
+            weights[skill] = weights.get(skill, 0) + TITLE_WEIGHT
+        # Stable sort keeps first-mention order among equal weights
+        weights = dict(sorted(weights.items(), key=lambda item: -item[1]))
+
+        with self._lock:
+            self._job_keywords[key] = weights
+            while len(self._job_keywords) > self.cache_size:
+                self._job_keywords.popitem(last=False)
+        return weights
+
+    def analyze(self, resume_keywords, job):
+        """
+        Coverage report for one job: {"coverage": weighted % or None when the
+        job names no known skills, "matched": [...], "missing": [...]}, each
+        list heaviest keyword first.
+        """
+        weights = self.job_keywords(job)
+        matched = [skill for skill in weights if skill in resume_keywords]
+        missing = [skill for skill in weights if skill not in resume_keywords]
+        total = sum(weights.values())
+        coverage = 100 * sum(weights[skill] for skill in matched) / total if total else None
+        return {"coverage": coverage, "matched": matched, "missing": missing}
+
+    def analyze_many(self, resume_text, skills, jobs):
+        """Reports for each job, in order; the resume is scanned once"""
+        resume_keywords = self.resume_keywords(resume_text, skills)
+        return [self.analyze(resume_keywords, job) for job in jobs]
+
+
+def common_gaps(reports, limit=10):
+    """[(keyword, jobs missing it)] across reports, most common first"""
+    counts = Counter(skill for report in reports for skill in report["missing"])
+    return counts.most_common(limit)
+
+
+def gap_summary(report, limit=PROMPT_KEYWORDS):
+    """Short plain-text form of a report for an LLM prompt"""
+    lines = [f"ATS keyword coverage: {report['coverage']:.0f}%"]
+    if report["missing"]:
+        lines.append("Job keywords missing from the resume: " + ", ".join(report["missing"][:limit]))
+    if report["matched"]:
+        lines.append("Job keywords the resume already covers: " + ", ".join(report["matched"][:limit]))
+    return "\n".join(lines)
@@ -0,0 +1,89 @@
+"""
+ATS keyword gap analyzer benchmark.
+
+Generates job descriptions that mention taxonomy skills among filler text
+and times keyword coverage for every job against one resume: a per-alias
+regex scan (the straightforward approach), the Aho-Corasick analyzer with
+a cold job-keyword cache, and again warm (a Streamlit rerun). Also reports
+how much shorter the match analysis prompt's job section gets when only the
+keyword gaps are sent.
+
+Usage: python bench_ats.py [jobs]
+"""
+import random
+import re
+import sys
+import time
+
+from ats_analyzer import ATSAnalyzer, gap_summary
+from bench_resume_parser import make_resume
+from skill_taxonomy import AMBIGUOUS_TERMS, SKILL_TAXONOMY, get_skill_matcher
+
+DEFAULT_JOBS = 500
+FILLER = ("We are a fast-growing team building products our customers love. You will work closely "
+          "with design and engineering, own features end to end and help shape how we build. "
+          "We offer flexible hours, a learning budget and a friendly, inclusive culture. ").split()
+
+
+def make_job(rng, skills):
+    words = rng.choices(FILLER, k=rng.randint(150, 600))
+    for skill in rng.sample(skills, rng.randint(4, 14)):
+        for _ in range(rng.randint(1, 3)):
+            words.insert(rng.randrange(len(words)), f"{skill},")
+    return {"title": f"{rng.choice(skills)} Engineer", "description": " ".join(words)}
+
+
+def regex_coverage(resume_keywords, job, patterns):
+    """Baseline: search the description once per canonical skill's alias pattern"""
+    found = [skill for skill, pattern in patterns if pattern.search(job["description"])]
+    if not found:
+        return None
+    return 100 * sum(skill in resume_keywords for skill in found) / len(found)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_JOBS
+    rng = random.Random(11)
+    skills = [skill for group in SKILL_TAXONOMY.values() for skill in group]
+    jobs = [make_job(rng, skills) for _ in range(size)]
+    resume = make_resume(rng)
+    resume_text = " ".join(exp["description"] for exp in resume["experience"])
+
+    start = time.perf_counter()
+    get_skill_matcher()
+    build = time.perf_counter() - start
+
+    patterns = []
+    for group in SKILL_TAXONOMY.values():
+        for skill, aliases in group.items():
+            phrases = [p for p in [skill, *aliases] if p.lower() not in AMBIGUOUS_TERMS]
+            if phrases:
+                alternation = "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+                patterns.append((skill, re.compile(rf"(?<![\w.+#])(?:{alternation})(?![\w+#])", re.I)))
+
+    analyzer = ATSAnalyzer()
+    resume_keywords = analyzer.resume_keywords(resume_text, resume["skills"])
+    start = time.perf_counter()
+    for job in jobs:
+        regex_coverage(resume_keywords, job, patterns)
+    regex = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reports = analyzer.analyze_many(resume_text, resume["skills"], jobs)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    analyzer.analyze_many(resume_text, resume["skills"], jobs)
+    warm = time.perf_counter() - start
+
+    full = sum(len(job["description"]) for job in jobs)
+    gaps = sum(len(gap_summary(report)) for report in reports if report["coverage"] is not None)
+    print(f"automaton build: {build * 1000:.1f} ms ({len(patterns)} skills)")
+    print(f"{'jobs':>6}{'regex ms':>10}{'cold ms':>9}{'warm ms':>9}{'avg coverage':>14}{'job prompt chars':>18}")
+    scored = [r["coverage"] for r in reports if r["coverage"] is not None]
+    average = sum(scored) / len(scored)
+    print(f"{size:>6}{regex * 1000:>10.1f}{cold * 1000:>9.1f}{warm * 1000:>9.1f}{average:>13.0f}%"
+          f"{f'{full // size} -> {gaps // size}':>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Plain resume PDF benchmark.
+
+Times resume_builder.create_pdf_resume against the previous app.py
+implementation (kept below), which drew to a canvas, re-parsed the output
+with PyPDF2 and copied only its first page into a new PDF. Reports time,
+page count and how many description lines are drawn on a page, for a
+short resume and for one long enough to need several pages.
+
+Usage: python bench_create_pdf_resume.py [repeats]
+"""
+import sys
+import time
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from bench_resume_pdf import sample_resume
+from resume_builder import create_pdf_resume
+
+DEFAULT_REPEATS = 20
+
+
+def old_create_pdf_resume(user_data):
+    """The previous implementation, for comparison"""
+    from PyPDF2 import PdfWriter
+
+    packet = BytesIO()
+    can = canvas.Canvas(packet, pagesize=letter)
+    
+    # Set font and starting position
+    can.setFont("Helvetica-Bold", 16)
+    y_position = 750
+    
+    # Personal Information
+    can.drawString(72, y_position, user_data['name'])
+    y_position -= 20
+    
+    can.setFont("Helvetica", 12)
+    can.drawString(72, y_position, user_data['email'])
+    y_position -= 15
+    can.drawString(72, y_position, user_data['phone'])
+    y_position -= 30
+    
+    # Summary
+    can.setFont("Helvetica-Bold", 14)
+    can.drawString(72, y_position, "Professional Summary")
+    y_position -= 20
+    can.setFont("Helvetica", 12)
+    
+    # Handle multi-line summary
+    summary_lines = []
+    words = user_data['summary'].split()
+    line = ""
+    for word in words:
+        if len(line) + len(word) < 80:
+            line += word + " "
+        else:
+            summary_lines.append(line)
+            line = word + " "
+    if line:
+        summary_lines.append(line)
+    
+    for line in summary_lines:
+        can.drawString(72, y_position, line)
+        y_position -= 15
+    y_position -= 15
+    
+    # Experience
+    can.setFont("Helvetica-Bold", 14)
+    can.drawString(72, y_position, "Work Experience")
+    y_position -= 20
+    
+    for exp in user_data['experience']:
+        can.setFont("Helvetica-Bold", 12)
+        can.drawString(72, y_position, f"{exp['title']} at {exp['company']}")
+        y_position -= 15
+        
+        can.setFont("Helvetica-Oblique", 10)
+        can.drawString(72, y_position, f"{exp['start']} - {exp['end']}")
+        y_position -= 15
+        
+        can.setFont("Helvetica", 12)
+        desc_lines = []
+        words = exp['description'].split()
+        line = ""
+        for word in words:
+            if len(line) + len(word) < 80:
+                line += word + " "
+            else:
+                desc_lines.append(line)
+                line = word + " "
+        if line:
+            desc_lines.append(line)
+        
+        for line in desc_lines:
+            can.drawString(72, y_position, line)
+            y_position -= 15
+        y_position -= 10
+    
+    # Education
+    can.setFont("Helvetica-Bold", 14)
+    can.drawString(72, y_position, "Education")
+    y_position -= 20
+    
+    can.setFont("Helvetica", 12)
+    for edu in user_data['education']:
+        can.drawString(72, y_position, f"{edu['degree']}, {edu['institution']} ({edu['year']})")
+        y_position -= 15
+    
+    # Skills
+    can.setFont("Helvetica-Bold", 14)
+    can.drawString(72, y_position, "Skills")
+    y_position -= 20
+    
+    can.setFont("Helvetica", 12)
+    skills = ', '.join(user_data['skills'])
+    skill_lines = []
+    words = skills.split()
+    line = ""
+    for word in words:
+        if len(line) + len(word) < 80:
+            line += word + " "
+        else:
+            skill_lines.append(line)
+            line = word + " "
+    if line:
+        skill_lines.append(line)
+    
+    for line in skill_lines:
+        can.drawString(72, y_position, line)
+        y_position -= 15
+    
+    # Save the PDF
+    can.save()
+    
+    # Move to beginning of BytesIO buffer
+    packet.seek(0)
+    new_pdf = PdfReader(packet)
+    
+    # Create output PDF
+    output = BytesIO()
+    writer = PdfWriter()
+    writer.add_page(new_pdf.pages[0])
+    writer.write(output)
+    
+    return output.getvalue()
+
+
+def long_resume():
+    resume = sample_resume()
+    resume["experience"] = [
+        {**exp, "description": "\n".join(f"Shipped release {copy}.{j} of the payments platform for enterprise customers"
+                                         for j in range(5))}
+        for copy, exp in enumerate(resume["experience"] * 5)
+    ]
+    return resume
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats, result
+
+
+def visible_lines(pdf_bytes, resume):
+    """Pages, and how many description lines are drawn inside a page's visible area"""
+    reader = PdfReader(BytesIO(pdf_bytes))
+    visible = []
+    for page in reader.pages:
+        height = float(page.mediabox.height)
+
+        def collect(text, cm, tm, font, size):
+            if 0 <= tm[5] <= height:
+                visible.append(text)
+
+        page.extract_text(visitor_text=collect)
+    text = " ".join(" ".join(visible).split())
+    wanted = [line for exp in resume["experience"] for line in exp["description"].splitlines()]
+    return len(reader.pages), sum(line in text for line in wanted), len(wanted)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPEATS
+    print(f"{'resume':<8}{'version':<9}{'ms':>8}{'pages':>7}{'description lines':>20}")
+    for label, resume in [("short", sample_resume()), ("long", long_resume())]:
+        for version, fn in [("old", old_create_pdf_resume), ("new", create_pdf_resume)]:
+            elapsed, pdf_bytes = timed(lambda: fn(resume), repeats)
+            pages, found, wanted = visible_lines(pdf_bytes, resume)
+            print(f"{label:<8}{version:<9}{elapsed * 1000:>8.2f}{pages:>7}{f'{found}/{wanted}':>20}")
+
+
+if __name__ == "__main__":
+    main()
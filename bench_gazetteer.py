@@ -0,0 +1,76 @@
+"""
+Offline gazetteer benchmark and regression check.
+
+Times exact, qualified, region and misspelled lookups against the bundled
+gazetteer, then checks that regions and countries resolve as areas (not to
+a city that shares a prefix with them) and that "City REGION" names still
+split into a city and its region.
+
+Usage: python bench_gazetteer.py [repeats]
+"""
+import sys
+import time
+
+from gazetteer import get_gazetteer
+
+DEFAULT_REPEATS = 2000
+QUERIES = {
+    "exact": ["sydney", "london", "toronto", "mumbai", "berlin"],
+    "qualified": ["sydney nsw", "springfield, il", "victoria, bc", "perth, wa, australia"],
+    "region": ["texas", "new south wales", "ontario", "western australia"],
+    "fuzzy": ["melbourn", "brisban", "manchestr"],
+}
+# name -> "city", "region" or "country", with an optional (lat, lon) box for the centre
+EXPECTED = {
+    "texas": ("region", None),
+    "texas, united states": ("region", None),
+    "michigan": ("region", None),
+    "colorado": ("region", None),
+    "kansas": ("region", None),
+    "oklahoma": ("region", None),
+    "india": ("country", (5, 37, 68, 98)),
+    "new south wales": ("region", (-38, -28, 140, 154)),
+    "new south wales, australia": ("region", (-38, -28, 140, 154)),
+    "western australia": ("region", (-36, -13, 112, 130)),
+    "south australia, australia": ("region", (-38, -25, 129, 141)),
+    "victoria, australia": ("region", (-39, -34, 140, 150)),
+    "australia": ("country", None),
+    "sydney nsw": ("city", (-34.1, -33.6, 150.9, 151.4)),
+    "perth wa": ("city", (-32.2, -31.7, 115.6, 116.1)),
+    "victoria, bc": ("city", (48.3, 48.6, -123.5, -123.2)),
+    "new york": ("city", (40.5, 41.0, -74.3, -73.7)),
+}
+
+
+def check(gazetteer):
+    failures = []
+    for name, (kind, box) in EXPECTED.items():
+        coords, found = gazetteer._resolve(name)
+        if found != kind:
+            failures.append(f"{name!r}: expected {kind}, got {found} at {coords}")
+        elif box and not (box[0] <= coords[0] <= box[1] and box[2] <= coords[1] <= box[3]):
+            failures.append(f"{name!r}: centre {coords} is outside {box}")
+    return failures
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPEATS
+    start = time.perf_counter()
+    gazetteer = get_gazetteer()
+    print(f"load: {(time.perf_counter() - start) * 1000:.0f} ms ({len(gazetteer)} places)")
+    print(f"{'kind':<12}{'us/lookup':>10}")
+    for kind, names in QUERIES.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for name in names:
+                gazetteer.lookup(name)
+        elapsed = time.perf_counter() - start
+        print(f"{kind:<12}{elapsed / (repeats * len(names)) * 1e6:>10.1f}")
+
+    failures = check(gazetteer)
+    assert not failures, "Gazetteer regressions:\n" + "\n".join(failures)
+    print(f"✅ All {len(EXPECTED)} place checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Local inference backend benchmark.
+
+Runs the same career-coach prompts through each local model backend
+(fp32 PyTorch, int8 dynamic quantization, ONNX Runtime) in its own process and
+reports load time, mean latency, generated tokens/sec and peak RSS.
+
+Usage: python bench_local_model.py [backend ...]
+"""
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from ai_models import LOCAL_MODEL_BACKENDS, build_local_model
+
+PROMPTS = [
+    "What's the best resume format for my industry?",
+    "How can I optimize my resume for ATS systems?",
+    "What makes a strong cover letter?",
+    "What are the top interview preparation tips?",
+]
+MAX_NEW_TOKENS = 64
+RUNS_PER_PROMPT = 3
+
+
+def run_backend(backend):
+    """Benchmark one backend in the current process and return its metrics"""
+    start = time.perf_counter()
+    model = build_local_model(backend)
+    load_seconds = time.perf_counter() - start
+
+    # Warm-up so one-off kernel setup isn't counted
+    model(PROMPTS[0], max_new_tokens=4)
+
+    latencies = []
+    generated_tokens = 0
+    for prompt in PROMPTS:
+        prompt_tokens = len(model.tokenizer(prompt)["input_ids"])
+        for _ in range(RUNS_PER_PROMPT):
+            start = time.perf_counter()
+            output = model(prompt, max_new_tokens=MAX_NEW_TOKENS, do_sample=False)
+            latencies.append(time.perf_counter() - start)
+            total_tokens = len(model.tokenizer(output[0]["generated_text"])["input_ids"])
+            generated_tokens += max(total_tokens - prompt_tokens, 0)
+
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "backend": backend,
+        "load_s": load_seconds,
+        "mean_latency_s": sum(latencies) / len(latencies),
+        "tokens_per_s": generated_tokens / sum(latencies),
+        "peak_rss_mb": peak_rss_mb,
+    }
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        print(json.dumps(run_backend(sys.argv[2])))
+        return
+
+    backends = sys.argv[1:] or list(LOCAL_MODEL_BACKENDS)
+    print(f"{'backend':<10}{'load s':>10}{'latency s':>12}{'tok/s':>10}{'RSS MB':>10}")
+    for backend in backends:
+        # Separate processes so each backend's RSS is measured in isolation
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", backend],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+            print(f"{backend:<10} failed: {error}")
+            continue
+        metrics = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{backend:<10}{metrics['load_s']:>10.2f}{metrics['mean_latency_s']:>12.3f}"
+              f"{metrics['tokens_per_s']:>10.1f}{metrics['peak_rss_mb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
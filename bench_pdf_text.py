@@ -0,0 +1,80 @@
+"""
+Resume PDF text extraction benchmark.
+
+Generates 1-page and 50-page text PDFs with reportlab and times the old
+serial `text += page.extract_text()` loop against the new pipeline: serial,
+page-parallel across EXTRACT_WORKERS processes (forced on, whatever the
+page count or CPU count), time to the first streamed page, and a repeat
+of the same upload served from the text cache (a Streamlit rerun).
+
+Usage: python bench_pdf_text.py [repeats]
+"""
+import sys
+import time
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from pdf_text import EXTRACT_WORKERS, TextCache, extract_pdf_text, iter_pdf_pages
+
+DEFAULT_REPEATS = 5
+PAGE_COUNTS = [1, 50]
+LINES_PER_PAGE = 50
+
+
+def make_pdf(pages):
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(pages):
+        for line in range(LINES_PER_PAGE):
+            pdf.drawString(40, 750 - line * 14,
+                           f"Page {page} line {line}: delivered Python services on AWS for payments platform")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def old_extract(data):
+    reader = PdfReader(BytesIO(data))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() + "\n"
+    return text
+
+
+def time_to_first_page(data):
+    start = time.perf_counter()
+    pages = iter_pdf_pages(data, parallel_min_pages=2, workers=EXTRACT_WORKERS)
+    next(pages)
+    elapsed = time.perf_counter() - start
+    list(pages)
+    return elapsed
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPEATS
+    print(f"{'pages':>6}{'old ms':>10}{'serial ms':>11}{'parallel ms':>13}{'first page ms':>15}{'cached ms':>11}")
+    for pages in PAGE_COUNTS:
+        data = make_pdf(pages)
+        old = timed(lambda: old_extract(data), repeats)
+        serial = timed(lambda: list(iter_pdf_pages(data, workers=0)), repeats)
+        parallel = timed(lambda: list(iter_pdf_pages(data, parallel_min_pages=2, workers=EXTRACT_WORKERS)), repeats)
+        first_page = sum(time_to_first_page(data) for _ in range(repeats)) / repeats
+        cache = TextCache()
+        extract_pdf_text(data, cache=cache)
+        cached = timed(lambda: extract_pdf_text(data, cache=cache), repeats)
+        print(f"{pages:>6}{old * 1000:>10.1f}{serial * 1000:>11.1f}{parallel * 1000:>13.1f}"
+              f"{first_page * 1000:>15.1f}{cached * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Token-budgeted prompt builder benchmark.
+
+Builds chat, match analysis and cover letter prompts from a long resume, a
+long job description and a 30-turn chat history, the old way (full text
+pasted in) and through fit_sections, for each model, as the backend
+receives them: local prompt text for the local model, chat messages for
+the HF model. Reports prompt tokens against the model's prompt budget
+(context minus the reply allowance), the resume and job tokens that made
+it in, and the time to fit a prompt cold and again on a rerun. Counts are
+estimated when transformers isn't installed.
+
+Usage: python bench_prompt_builder.py [resume_repeats]
+"""
+import random
+import sys
+import time
+
+from ai_models import HF_CHAT_MODEL, LOCAL_MODEL_NAME, LOCAL_REPLY_TOKENS
+from bench_resume_parser import make_resume
+from cover_letters import COVER_LETTER_MAX_TOKENS, cover_letter_prompt
+from prompt_builder import (CHAT_REPLY_TOKENS, chat_messages, compress_text, context_tokens, count_tokens,
+                            fit_sections, get_tokenizer, history_text, local_prompt, message_tokens)
+
+DEFAULT_RESUME_REPEATS = 6
+HISTORY_TURNS = 30
+
+
+def make_inputs(repeats):
+    rng = random.Random(5)
+    resume = make_resume(rng)
+    lines = [resume["name"], resume["summary"]]
+    for _ in range(repeats):
+        for exp in make_resume(rng)["experience"]:
+            lines += [f"{exp['title']} at {exp['company']} ({exp['start']} - {exp['end']})", exp["description"]]
+    lines.append("Skills: " + ", ".join(resume["skills"]))
+    job = " ".join(["We are hiring a senior engineer to join our platform team.",
+                    "You will design, build and run services on AWS with Python, Docker and Kubernetes.",
+                    "Experience with Terraform, CI/CD and PostgreSQL is a plus."] +
+                   ["We offer flexible hours, a learning budget and a friendly, inclusive culture."] * 40)
+    history = [{"role": "user" if i % 2 == 0 else "assistant",
+                "content": f"Turn {i}: " + " ".join(rng.choices(job.split(), k=rng.randint(20, 120)))}
+               for i in range(HISTORY_TURNS)]
+    return "\n".join(lines), job, history
+
+
+def sent_prompt(model, question, resume="", history=()):
+    """What the app sends the model: local prompt text, or HF chat messages"""
+    if model == LOCAL_MODEL_NAME:
+        context = "\n\n".join(part for part in [
+            f"Resume:\n{resume}" if resume else "",
+            f"Conversation so far:\n{history_text(history)}" if history else "",
+        ] if part)
+        return local_prompt(question, context)
+    return chat_messages(question, resume, history)
+
+
+def prompt_tokens(model, prompt):
+    return message_tokens(prompt, model) if isinstance(prompt, list) else count_tokens(prompt, model)
+
+
+def chat_prompts(model, resume, history, question):
+    fitted = fit_sections(model, question, {"resume": (resume, 3), "history": (history, 2)})
+    content = count_tokens(fitted["resume"], model) + message_tokens(fitted["history"], model)
+    return (sent_prompt(model, question, resume, history),
+            sent_prompt(model, question, fitted["resume"], fitted["history"]), content)
+
+
+def cover_letter_prompts(model, resume, job):
+    new = cover_letter_prompt(resume, job, model, COVER_LETTER_MAX_TOKENS)
+    content = count_tokens(new, model) - count_tokens(cover_letter_prompt("", "", model), model)
+    return sent_prompt(model, cover_letter_prompt(resume, job)), sent_prompt(model, new), content
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RESUME_REPEATS
+    resume, job, history = make_inputs(repeats)
+    question = "How should I prepare for a system design interview?"
+    get_tokenizer(LOCAL_MODEL_NAME)
+    get_tokenizer(HF_CHAT_MODEL)
+    time.sleep(0.5)  # let tokenizers that are available finish loading
+    print(f"{'model':<34}{'prompt':<14}{'budget':>7}{'old':>7}{'new':>7}{'content':>9}"
+          f"{'cold ms':>9}{'warm ms':>9}")
+    for model in (LOCAL_MODEL_NAME, HF_CHAT_MODEL):
+        rows = [
+            ("chat", CHAT_REPLY_TOKENS, lambda: chat_prompts(model, resume, history, question)),
+            ("cover letter", COVER_LETTER_MAX_TOKENS, lambda: cover_letter_prompts(model, resume, job)),
+        ]
+        for name, max_tokens, build in rows:
+            reply = LOCAL_REPLY_TOKENS if model == LOCAL_MODEL_NAME else max_tokens
+            budget = context_tokens(model) - reply
+            compress_text.cache_clear()
+            start = time.perf_counter()
+            old, new, content = build()
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            build()
+            warm = time.perf_counter() - start
+            print(f"{model:<34}{name:<14}{budget:>7}{prompt_tokens(model, old):>7}{prompt_tokens(model, new):>7}"
+                  f"{content:>9}{cold * 1000:>9.2f}{warm * 1000:>9.2f}")
+            assert prompt_tokens(model, new) <= budget, f"{model} {name} prompt is over its budget"
+
+
+if __name__ == "__main__":
+    main()
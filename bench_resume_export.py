@@ -0,0 +1,45 @@
+"""
+Bulk resume export throughput benchmark.
+
+Streams synthetic resume_data records through export_resumes_zip with an
+increasing number of worker processes and reports resumes per second and
+the peak resident memory of the exporting process.
+
+Usage: python bench_resume_export.py [resumes]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+
+from bench_resume_pdf import sample_resume
+from resume_export import export_resumes_zip
+
+DEFAULT_RESUMES = 400
+TEMPLATES = ["modern", "classic", "executive"]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RESUMES
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, cpus // 2 or 1, cpus})
+    print(f"{size} resumes x {len(TEMPLATES)} templates, {cpus} CPUs")
+    print(f"{'workers':>8}{'seconds':>10}{'resumes/s':>11}{'PDFs/s':>9}{'peak RSS MB':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in worker_counts:
+            zip_path = os.path.join(tmp, f"export_{workers}.zip")
+            records = (sample_resume(i) for i in range(size))
+            start = time.perf_counter()
+            summary = export_resumes_zip(records, zip_path, templates=TEMPLATES, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            with zipfile.ZipFile(zip_path) as archive:
+                assert len(archive.namelist()) == size * len(TEMPLATES) == summary["written"]
+            peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"{workers:>8}{elapsed:>10.2f}{size / elapsed:>11.1f}"
+                  f"{summary['written'] / elapsed:>9.1f}{peak_mb:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Resume PDF rendering benchmark.
+
+Times ProfessionalResumeBuilder construction and create_resume_pdf for each
+template, first uncached and then for an unchanged resume that is served
+from the PDF cache, as when "Save & Generate Resume" is pressed again or
+the user switches back to a previous template.
+
+Usage: python bench_resume_pdf.py [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from resume_builder import ProfessionalResumeBuilder, ResumePDFCache
+
+DEFAULT_REPEATS = 20
+TEMPLATES = ["modern", "classic", "executive"]
+
+
+def sample_resume(variant=0):
+    return {
+        "name": f"Alex Example {variant}",
+        "email": "alex@example.com",
+        "phone": "+61 400 000 000",
+        "summary": "Backend engineer with eight years of experience building data platforms. " * 3,
+        "experience": [
+            {
+                "title": f"Senior Engineer {i}",
+                "company": f"Company {i}",
+                "start": f"{2015 + i}",
+                "end": f"{2016 + i}",
+                "description": "\n".join(f"Delivered project {j} on time and under budget" for j in range(5)),
+            }
+            for i in range(4)
+        ],
+        "education": [{"degree": "BSc Computer Science", "institution": "University of Sydney", "year": "2014"}],
+        "skills": ["Python", "SQL", "Kubernetes", "AWS", "Terraform", "React", "Go", "Kafka"],
+    }
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPEATS
+    with tempfile.TemporaryDirectory() as tmp:
+        builder = ProfessionalResumeBuilder(pdf_cache=ResumePDFCache(os.path.join(tmp, "pdfs.db")))
+        print(f"builder construction: {timed(ProfessionalResumeBuilder, repeats) * 1000:.3f} ms")
+
+        print(f"{'template':<12}{'uncached ms':>13}{'cached ms':>11}")
+        for template in TEMPLATES:
+            variants = iter(range(repeats))
+            uncached = timed(lambda: builder.create_resume_pdf(sample_resume(next(variants)), template), repeats)
+            resume = sample_resume()
+            builder.create_resume_pdf(resume, template)
+            cached = timed(lambda: builder.create_resume_pdf(resume, template), repeats)
+            print(f"{template:<12}{uncached * 1000:>13.2f}{cached * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
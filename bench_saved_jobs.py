@@ -0,0 +1,77 @@
+"""
+Saved-jobs mutation benchmark.
+
+Measures the latency of a note update (what tab5 does on every edit) as the
+collection grows, comparing the old full JSON rewrite with the change-log
+storage used by SavedJobsManager.
+
+Usage: python bench_saved_jobs.py
+"""
+import json
+import os
+import tempfile
+import time
+
+from saved_jobs import SavedJobsManager
+
+COLLECTION_SIZES = [100, 1000, 5000, 20000]
+REWRITE_MUTATIONS = 20
+# Several times COMPACT_AFTER_ENTRIES so amortized compaction is included
+LOG_MUTATIONS = 2000
+
+
+def make_job(i):
+    return {
+        "title": f"Software Engineer {i}",
+        "company_name": f"Company {i % 500}",
+        "location": "Sydney, NSW",
+        "via": "LinkedIn",
+        "description": "We're looking for a skilled software engineer with 5+ years experience in Python. " * 5,
+        "posted": "2 days ago",
+    }
+
+
+def seed(jobs_file, size):
+    saved = {
+        f"job_{i}": {"job": make_job(i), "saved_at": "2025-05-22T02:28:04+00:00",
+                     "notes": "", "application_status": "Not Applied"}
+        for i in range(size)
+    }
+    with open(jobs_file, "w") as f:
+        json.dump(saved, f, indent=2)
+    return saved
+
+
+def bench_full_rewrite(jobs_file, saved):
+    """The previous behaviour: re-serialize every job on each mutation"""
+    start = time.perf_counter()
+    for i in range(REWRITE_MUTATIONS):
+        saved[f"job_{i % len(saved)}"]["notes"] = f"note {i}"
+        with open(jobs_file, "w") as f:
+            json.dump(saved, f, indent=2)
+    return (time.perf_counter() - start) / REWRITE_MUTATIONS
+
+
+def bench_change_log(jobs_file):
+    manager = SavedJobsManager(jobs_file)
+    start = time.perf_counter()
+    for i in range(LOG_MUTATIONS):
+        manager.update_job_notes(f"job_{i % len(manager.saved_jobs)}", f"note {i}")
+    return (time.perf_counter() - start) / LOG_MUTATIONS
+
+
+def main():
+    print(f"{'jobs':>8}{'full rewrite ms':>18}{'change log ms':>16}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs_file = os.path.join(tmp, "saved_jobs.json")
+        for size in COLLECTION_SIZES:
+            rewrite = bench_full_rewrite(jobs_file, seed(jobs_file, size))
+            seed(jobs_file, size)
+            if os.path.exists(jobs_file + ".log"):
+                os.remove(jobs_file + ".log")
+            change_log = bench_change_log(jobs_file)
+            print(f"{size:>8}{rewrite * 1000:>18.3f}{change_log * 1000:>16.3f}{rewrite / change_log:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Saved-jobs full-text search benchmark.
+
+Seeds a collection of synthetic postings with realistic description lengths
+and a Zipf-distributed vocabulary, then times BM25 queries through
+SavedJobsManager.query_jobs, alone and combined with a status filter.
+Filtered timings are for repeated queries under the same filter, as when
+typing in the search box; the first query after a mutation also rebuilds
+the filter's mask.
+
+Usage: python bench_saved_jobs_search.py [saved_jobs]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from saved_jobs import SavedJobsManager
+
+DEFAULT_JOBS = 50000
+DESCRIPTION_WORDS = 250
+VOCABULARY_SIZE = 20000
+QUERIES = [
+    "python",
+    "senior software engineer",
+    "data scientist machine learning",
+    "sydney",
+    "kubernetes aws terraform",
+    "remote react typescript frontend",
+    "word17 word4012",
+]
+REPEATS = 20
+TITLES = ["Software Engineer", "Data Scientist", "Frontend Developer", "DevOps Engineer",
+          "Product Manager", "Machine Learning Engineer", "Backend Developer", "QA Analyst"]
+SKILLS = ["python", "java", "react", "typescript", "kubernetes", "aws", "terraform", "sql",
+          "machine", "learning", "remote", "senior", "frontend", "backend", "c++", "go"]
+CITIES = ["Sydney, NSW", "Melbourne, VIC", "Brisbane, QLD", "Perth, WA", "Remote"]
+
+
+def seed(jobs_file, size):
+    rng = random.Random(42)
+    vocabulary = [f"word{i}" for i in range(VOCABULARY_SIZE)] + SKILLS * 50
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    saved = {}
+    for i in range(size):
+        words = rng.choices(vocabulary, weights=weights, k=DESCRIPTION_WORDS)
+        saved[f"job_{i:06d}"] = {
+            "job": {
+                "title": f"{rng.choice(['Senior ', 'Junior ', ''])}{rng.choice(TITLES)}",
+                "company_name": f"Company {i % 997}",
+                "location": rng.choice(CITIES),
+                "via": "LinkedIn",
+                "description": " ".join(words),
+            },
+            "saved_at": f"2025-05-{1 + i % 28:02d}T02:28:{i % 60:02d}+00:00",
+            "notes": "follow up with recruiter" if i % 10 == 0 else "",
+            "application_status": ["Not Applied", "Applied", "Interview"][i % 3],
+        }
+    with open(jobs_file, "w") as f:
+        json.dump(saved, f)
+
+
+def time_query(manager, **query):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        _, total = manager.query_jobs(**query)
+    return (time.perf_counter() - start) / REPEATS, total
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_JOBS
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs_file = os.path.join(tmp, "saved_jobs.json")
+        seed(jobs_file, size)
+        manager = SavedJobsManager(jobs_file)
+
+        start = time.perf_counter()
+        manager.search_jobs("warmup")
+        print(f"index build over {size} jobs: {time.perf_counter() - start:.2f} s")
+        # The first queries after a large build pay for a full garbage collection pass
+        for text in QUERIES:
+            manager.query_jobs(text=text, status="Applied")
+
+        print(f"{'query':<36}{'matches':>9}{'ms':>9}{'ms (Applied)':>14}")
+        for text in QUERIES:
+            elapsed, total = time_query(manager, text=text)
+            filtered, _ = time_query(manager, text=text, status="Applied")
+            print(f"{text:<36}{total:>9}{elapsed * 1000:>9.2f}{filtered * 1000:>14.2f}")
+
+        start = time.perf_counter()
+        for i in range(200):
+            manager.update_job_notes(f"job_{i:06d}", f"python referral {i}")
+        print(f"note update incl. reindex: {(time.perf_counter() - start) / 200 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Saved Jobs tab rerun benchmark.
+
+Seeds a large saved-jobs collection in a scratch directory, runs app.py
+headlessly with Streamlit's AppTest and times full-script reruns, which is
+what every widget interaction in any tab costs. Also reports how many saved
+job expanders were built, to confirm only one page is rendered.
+
+Usage: python bench_saved_jobs_tab.py [saved_jobs] [reruns]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from saved_jobs import SAVED_JOBS_FILE, SavedJobsManager
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+DEFAULT_JOBS = 10000
+DEFAULT_RERUNS = 10
+STATUSES = ["Not Applied", "Applied", "Interview"]
+
+
+def seed(jobs_file, size):
+    saved = {
+        f"job_{i:06d}": {
+            "job": {
+                "title": f"Software Engineer {i}",
+                "company_name": f"Company {i % 250}",
+                "location": "Sydney, NSW",
+                "via": "LinkedIn",
+                "description": "We're looking for a skilled software engineer with 5+ years experience in Python. " * 5,
+                "posted": "2 days ago",
+            },
+            "saved_at": f"2025-05-{1 + i % 28:02d}T02:28:{i % 60:02d}+00:00",
+            "notes": "",
+            "application_status": STATUSES[i % len(STATUSES)],
+        }
+        for i in range(size)
+    }
+    with open(jobs_file, "w") as f:
+        json.dump(saved, f)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_JOBS
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RERUNS
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        seed(SAVED_JOBS_FILE, size)
+
+        start = time.perf_counter()
+        manager = SavedJobsManager(SAVED_JOBS_FILE)
+        manager.query_jobs()
+        print(f"load + index {size} jobs: {(time.perf_counter() - start) * 1000:.1f} ms")
+        start = time.perf_counter()
+        for page in range(1, 101):
+            manager.query_jobs(status="Applied", company="Company 7", sort_by="title", page=page)
+        print(f"filtered page query: {(time.perf_counter() - start) * 10:.3f} ms")
+
+        app = AppTest.from_file(APP_FILE, default_timeout=300)
+        app.secrets["SERPAPI_KEY"] = "bench"
+        app.secrets["HF_TOKEN"] = "bench"
+        start = time.perf_counter()
+        app.run()
+        print(f"first run: {time.perf_counter() - start:.3f} s")
+        if app.exception:
+            raise SystemExit(app.exception[0].message)
+
+        timings = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            app.run()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        job_expanders = len(app.expander) - 1  # the AI tab's quick questions expander
+        print(f"rerun: median {timings[len(timings) // 2] * 1000:.1f} ms, "
+              f"max {timings[-1] * 1000:.1f} ms over {reruns} reruns")
+        print(f"saved job expanders rendered: {job_expanders} of {size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Startup import benchmark for JobFinder Pro+.
+
+Imports every module app.py imports at module level (read from its source,
+so the list can't drift) in a fresh interpreter under `-X importtime`, then
+fails if the render budget is exceeded or if any of the heavy AI/PDF/map
+modules were pulled in eagerly.
+
+Usage: python bench_startup.py [budget_seconds]
+"""
+import ast
+import json
+import subprocess
+import sys
+
+APP_FILE = "app.py"
+# Modules that must only be imported on demand
+HEAVY_MODULES = ["torch", "transformers", "huggingface_hub", "sentence_transformers", "PyPDF2",
+                 "folium", "geopy"]
+DEFAULT_BUDGET_SECONDS = 1.0
+
+
+def first_render_modules(path=APP_FILE):
+    """Top-level packages app.py imports at module level, in order"""
+    with open(path, "r") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(name.split(".")[0] for name in names)
+    return list(dict.fromkeys(modules))
+
+
+def measure_imports(modules):
+    """Return (total seconds, per-module cumulative seconds, heavy modules loaded)"""
+    code = (
+        "import sys, json\n"
+        + "".join(f"import {name}\n" for name in modules)
+        + f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True
+    )
+
+    per_module = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented; only top-level ones count towards the total
+        if not name.startswith("  "):
+            per_module[name.strip()] = int(cumulative) / 1e6
+    heavy_loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return sum(per_module.values()), per_module, heavy_loaded
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_SECONDS
+    total, per_module, heavy_loaded = measure_imports(first_render_modules())
+
+    for name, seconds in sorted(per_module.items(), key=lambda item: -item[1])[:10]:
+        print(f"{seconds * 1000:8.1f} ms  {name}")
+    print(f"Total first-render import time: {total:.3f}s (budget {budget:.3f}s)")
+
+    assert not heavy_loaded, f"Heavy modules imported eagerly: {', '.join(heavy_loaded)}"
+    assert total <= budget, f"Import time {total:.3f}s exceeds budget {budget:.3f}s"
+    print("✅ Startup import budget met")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ai_models import LOCAL_MODEL_NAME
+from prompt_builder import fit_sections
+
+# Constants
+BATCH_MAX_WORKERS = 4  # concurrent requests to the inference backend
+BATCH_MAX_JOBS = 20
+COVER_LETTER_MAX_TOKENS = 700
+
+
+def cover_letter_prompt(resume_text, job_description, model_name=None, max_tokens=COVER_LETTER_MAX_TOKENS):
+    """
+    The cover letter prompt; with a model name, the resume and job are fitted
+    to its context. The local model's window is tiny, so it gets terse instructions.
+    """
+    def render(resume, job):
+        if model_name == LOCAL_MODEL_NAME:
+            return f"Write a short cover letter for this job.\nResume:\n{resume}\nJob:\n{job}"
+        return f"""
+    Write a professional cover letter based on this resume and job description.
+
+    Resume:
+    {resume}
+
+    Job Description:
+    {job}
+
+    The cover letter should:
+    - Be 3-4 paragraphs
+    - Highlight relevant skills/experience
+    - Show enthusiasm for the role
+    - Be tailored to the job
+    """
+
+    if model_name is None:
+        return render(resume_text, job_description)
+    fitted = fit_sections(model_name, render("", ""),
+                          {"resume": (resume_text, 1), "job": (job_description, 1)}, max_tokens)
+    return render(fitted["resume"], fitted["job"])
+
+
+def generate_cover_letters(jobs, resume_text, generate_fn, max_workers=BATCH_MAX_WORKERS,
+                           on_result=None, model_name=None):
+    """
+    Generate a cover letter for each of `jobs` ({job_id: job}) by calling
+    generate_fn(prompt) on a bounded thread pool. The work is I/O bound on
+    the inference API, so letters overlap instead of queueing behind each
+    other. on_result(job_id, letter, error) runs on the calling thread as
+    each one finishes, so it can safely update the UI and persist results.
+    Prompts are fitted to model_name's context when it is given.
+    Returns ({job_id: letter}, {job_id: error message}).
+    """
+    letters, errors = {}, {}
+    if not jobs:
+        return letters, errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        futures = {
+            executor.submit(generate_fn, cover_letter_prompt(resume_text, job.get("description", ""), model_name)): job_id
+            for job_id, job in jobs.items()
+        }
+        for future in as_completed(futures):
+            job_id = futures[future]
+            try:
+                letters[job_id] = future.result()
+                error = None
+            except Exception as e:
+                errors[job_id] = error = str(e)
+            if on_result:
+                on_result(job_id, letters.get(job_id), error)
+    return letters, errors
+
+
+def generate_and_save_cover_letters(jobs_manager, jobs, resume_text, generate_fn, progress=None,
+                                    model_name=None):
+    """
+    Background-task body for batch cover letters: generate them concurrently
+    and store each with its saved job as it finishes.
+    Returns {"saved": [job_id], "errors": {job_id: error message}}.
+    """
+    finished = []
+
+    def record(job_id, cover_letter, error):
+        if cover_letter:
+            jobs_manager.save_cover_letter(job_id, cover_letter)
+        finished.append(job_id)
+        if progress:
+            progress(len(finished) / len(jobs))
+
+    letters, errors = generate_cover_letters(jobs, resume_text, generate_fn, on_result=record,
+                                             model_name=model_name)
+    return {"saved": list(letters), "errors": errors}
@@ -0,0 +1,284 @@
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+# Constants
+GAZETTEER_FILE = "gazetteer.tsv"
+COUNTRY_CODES = ("AU", "US", "CA", "GB", "DE", "FR", "IN", "JP", "SG", "NZ")
+COUNTRY_NAMES = {
+    "AU": ["australia"],
+    "US": ["united states", "united states of america", "usa", "us"],
+    "CA": ["canada"],
+    "GB": ["united kingdom", "great britain", "uk"],
+    "DE": ["germany", "deutschland"],
+    "FR": ["france"],
+    "IN": ["india"],
+    "JP": ["japan"],
+    "SG": ["singapore"],
+    "NZ": ["new zealand"],
+}
+# (country, GeoNames admin1 code) -> names and abbreviations job boards use
+REGIONS = {
+    ("AU", "01"): ["australian capital territory", "act"],
+    ("AU", "02"): ["new south wales", "nsw"],
+    ("AU", "03"): ["northern territory", "nt"],
+    ("AU", "04"): ["queensland", "qld"],
+    ("AU", "05"): ["south australia", "sa"],
+    ("AU", "06"): ["tasmania", "tas"],
+    ("AU", "07"): ["victoria", "vic"],
+    ("AU", "08"): ["western australia", "wa"],
+    ("CA", "01"): ["alberta", "ab"],
+    ("CA", "02"): ["british columbia", "bc"],
+    ("CA", "03"): ["manitoba", "mb"],
+    ("CA", "04"): ["new brunswick", "nb"],
+    ("CA", "05"): ["newfoundland and labrador", "nl"],
+    ("CA", "07"): ["nova scotia", "ns"],
+    ("CA", "08"): ["ontario", "on"],
+    ("CA", "09"): ["prince edward island", "pe"],
+    ("CA", "10"): ["quebec", "qc"],
+    ("CA", "11"): ["saskatchewan", "sk"],
+    ("CA", "12"): ["yukon", "yt"],
+    ("CA", "13"): ["northwest territories", "nt"],
+    ("CA", "14"): ["nunavut", "nu"],
+    ("GB", "ENG"): ["england"],
+    ("GB", "NIR"): ["northern ireland"],
+    ("GB", "SCT"): ["scotland"],
+    ("GB", "WLS"): ["wales"],
+}
+US_STATES = {
+    "AK": "Alaska", "AL": "Alabama", "AR": "Arkansas", "AZ": "Arizona", "CA": "California",
+    "CO": "Colorado", "CT": "Connecticut", "DC": "District of Columbia", "DE": "Delaware",
+    "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "IA": "Iowa", "ID": "Idaho",
+    "IL": "Illinois", "IN": "Indiana", "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana",
+    "MA": "Massachusetts", "MD": "Maryland", "ME": "Maine", "MI": "Michigan", "MN": "Minnesota",
+    "MO": "Missouri", "MS": "Mississippi", "MT": "Montana", "NC": "North Carolina",
+    "ND": "North Dakota", "NE": "Nebraska", "NH": "New Hampshire", "NJ": "New Jersey",
+    "NM": "New Mexico", "NV": "Nevada", "NY": "New York", "OH": "Ohio", "OK": "Oklahoma",
+    "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
+    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VA": "Virginia",
+    "VT": "Vermont", "WA": "Washington", "WI": "Wisconsin", "WV": "West Virginia", "WY": "Wyoming",
+}
+for _code, _name in US_STATES.items():
+    REGIONS[("US", _code)] = [_name.lower(), _code.lower()]
+# Common names that differ from the GeoNames spelling
+ALIASES = {
+    "new york": "new york city",
+    "nyc": "new york city",
+    "washington dc": "washington",
+    "bangalore": "bengaluru",
+    "bombay": "mumbai",
+    "madras": "chennai",
+    "calcutta": "kolkata",
+    "gurgaon": "gurugram",
+    "cologne": "koln",
+    "frankfurt": "frankfurt am main",
+}
+# Job locations that aren't places
+NON_PLACES = {"remote", "anywhere", "work from home", "hybrid", "various locations", "multiple locations"}
+MIN_FUZZY_LENGTH = 4
+TRIGRAM_THRESHOLD = 0.7
+
+
+def normalize_place(name):
+    """Lowercase ASCII form with punctuation dropped and 'St.' spelled out"""
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    name = "".join(c if c.isalnum() else " " for c in name.replace(".", ""))
+    tokens = name.split()
+    if tokens and tokens[0] == "st":
+        tokens[0] = "saint"
+    return " ".join(tokens)
+
+
+def _trigrams(text):
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class Gazetteer:
+    """
+    Offline city table for instant geocoding.
+
+    Rows are stored column-wise in compact arrays; a dict maps exact names to
+    rows, a sorted name list answers prefix queries with bisect, and a trigram
+    index catches misspellings. Regions and countries resolve to the
+    population-weighted centre of their cities.
+    """
+
+    def __init__(self, path=GAZETTEER_FILE):
+        self.names = []
+        self.admin1 = []
+        self.country = array("B")
+        self.latitude = array("d")
+        self.longitude = array("d")
+        self.population = array("L")
+        self._load(path)
+        self._build_indexes()
+
+    def _load(self, path):
+        country_ids = {code: i for i, code in enumerate(COUNTRY_CODES)}
+        with open(path, "r", encoding="utf-8") as f:
+            header_seen = False
+            for line in f:
+                if line.startswith("#"):
+                    continue
+                if not header_seen:
+                    header_seen = True
+                    continue
+                name, country, admin1, lat, lon, population = line.rstrip("\n").split("\t")
+                self.names.append(name)
+                self.admin1.append(admin1)
+                self.country.append(country_ids[country])
+                self.latitude.append(float(lat))
+                self.longitude.append(float(lon))
+                self.population.append(int(population))
+
+    def _build_indexes(self):
+        by_name = defaultdict(list)
+        for row, name in enumerate(self.names):
+            by_name[normalize_place(name)].append(row)
+        # Largest place first, so ambiguous names default to the likeliest one
+        self.name_index = {
+            key: sorted(rows, key=lambda r: -self.population[r]) for key, rows in by_name.items()
+        }
+        self.sorted_names = sorted(self.name_index)
+
+        self.trigram_index = defaultdict(lambda: array("I"))
+        self.trigram_counts = array("H")
+        for position, key in enumerate(self.sorted_names):
+            trigrams = _trigrams(key)
+            self.trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                self.trigram_index[trigram].append(position)
+        self.trigram_index = dict(self.trigram_index)
+
+        self.country_index = {
+            name: code for code, names in COUNTRY_NAMES.items() for name in names
+        }
+        self.region_index = defaultdict(set)
+        for region, names in REGIONS.items():
+            for name in names:
+                self.region_index[name].add(region)
+
+        # Population-weighted centres for regions and countries
+        sums = defaultdict(lambda: [0.0, 0.0, 0])
+        for row in range(len(self.names)):
+            code = COUNTRY_CODES[self.country[row]]
+            weight = self.population[row]
+            for key in ((code, self.admin1[row]), code):
+                total = sums[key]
+                total[0] += self.latitude[row] * weight
+                total[1] += self.longitude[row] * weight
+                total[2] += weight
+        self.centres = {key: (lat / weight, lon / weight) for key, (lat, lon, weight) in sums.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def _row_coords(self, row):
+        return (self.latitude[row], self.longitude[row])
+
+    def _fuzzy_rows(self, key):
+        """Rows for the closest name by prefix, then by trigram similarity"""
+        if len(key) < MIN_FUZZY_LENGTH:
+            return []
+        position = bisect_left(self.sorted_names, key)
+        prefixed = []
+        while position < len(self.sorted_names) and self.sorted_names[position].startswith(key):
+            prefixed.extend(self.name_index[self.sorted_names[position]])
+            position += 1
+        if prefixed:
+            return sorted(prefixed, key=lambda r: -self.population[r])
+
+        query = _trigrams(key)
+        counts = defaultdict(int)
+        for trigram in query:
+            for candidate in self.trigram_index.get(trigram, ()):
+                counts[candidate] += 1
+        best_score, best_position = 0.0, None
+        for candidate, shared in counts.items():
+            # Dice coefficient over trigram sets
+            score = 2 * shared / (len(query) + self.trigram_counts[candidate])
+            if score > best_score:
+                best_score, best_position = score, candidate
+        if best_score >= TRIGRAM_THRESHOLD:
+            return self.name_index[self.sorted_names[best_position]]
+        return []
+
+    def _parse(self, location):
+        parts = [normalize_place(part) for part in location.split(",")]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None, []
+        head, qualifiers = parts[0], parts[1:]
+        # "Sydney NSW" style: a trailing region or country without a comma, unless
+        # the whole head is already a place ("New South Wales", "Western Australia")
+        known = head in self.name_index or head in self.region_index or head in self.country_index
+        if not known and " " in head:
+            city, last = head.rsplit(" ", 1)
+            if last in self.region_index or last in self.country_index:
+                head, qualifiers = city, [last] + qualifiers
+        return ALIASES.get(head, head), qualifiers
+
+    def _resolve(self, location):
+        """(lat, lon) and whether it is a city or a whole region/country, or (None, None)"""
+        head, qualifiers = self._parse(location or "")
+        if not head or head in NON_PLACES:
+            return None, None
+
+        countries = {self.country_index[q] for q in qualifiers if q in self.country_index}
+        regions = set()
+        for qualifier in qualifiers:
+            regions |= {r for r in self.region_index.get(qualifier, ()) if not countries or r[0] in countries}
+
+        # An exact city name wins, filtered by whichever qualifiers were recognised
+        coords = self._first_city(self.name_index.get(head, ()), regions, countries)
+        if coords:
+            return coords, "city"
+
+        # The place itself is a region or country, e.g. "Texas, United States".
+        # Checked before fuzzy matching, which would find "Texas City"
+        for region in sorted(self.region_index.get(head, ())):
+            if (not countries or region[0] in countries) and region in self.centres:
+                return self.centres[region], "region"
+        if head in self.country_index and self.country_index[head] in self.centres:
+            return self.centres[self.country_index[head]], "country"
+
+        coords = self._first_city(self._fuzzy_rows(head), regions, countries)
+        if coords:
+            return coords, "city"
+        return None, None
+
+    def _first_city(self, rows, regions, countries):
+        """Coordinates of the first row inside the qualifying regions and countries"""
+        for row in rows:
+            code = COUNTRY_CODES[self.country[row]]
+            if regions and (code, self.admin1[row]) not in regions:
+                continue
+            if countries and code not in countries:
+                continue
+            return self._row_coords(row)
+        return None
+
+    def lookup(self, location):
+        """Return (lat, lon) for a place name, or None if it isn't in the table"""
+        return self._resolve(location)[0]
+
+    def is_area(self, location):
+        """True if the name is a whole region or country rather than a city"""
+        return self._resolve(location)[1] in ("region", "country")
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer(path=GAZETTEER_FILE):
+    """Load the bundled gazetteer once per process"""
+    global _gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            _gazetteer = Gazetteer(path)
+    return _gazetteer
@@ -0,0 +1,176 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Constants
+GEOCODE_DB_FILE = "geocode_cache.db"
+LEGACY_CACHE_FILE = "geocode_cache.json"
+POSITIVE_TTL = 180 * 24 * 60 * 60  # seconds; places rarely move
+NEGATIVE_TTL = 7 * 24 * 60 * 60  # seconds; retry unknown names weekly
+SQLITE_MAX_VARIABLES = 900
+
+
+def normalize_location(name):
+    """Canonical cache key: lowercase, single spaces, tidy commas"""
+    name = " ".join((name or "").lower().split())
+    name = re.sub(r"\s*,\s*", ", ", name)
+    return name.strip(" ,.")
+
+
+def lazy_nominatim(user_agent, min_delay_seconds=1):
+    """
+    Rate-limited Nominatim lookup that imports geopy and builds the client on
+    its first call, so it costs nothing until a name misses every cache.
+    Safe to call from worker threads.
+    """
+    lock = threading.Lock()
+    client = None
+
+    def geocode(query):
+        nonlocal client
+        with lock:
+            if client is None:
+                from geopy.geocoders import Nominatim
+                from geopy.extra.rate_limiter import RateLimiter
+
+                client = RateLimiter(Nominatim(user_agent=user_agent).geocode,
+                                     min_delay_seconds=min_delay_seconds)
+        return client(query)
+
+    return geocode
+
+
+class GeocodeCache:
+    """SQLite store of geocoding results, including misses (negative caching)"""
+
+    def __init__(self, db_path=GEOCODE_DB_FILE, positive_ttl=POSITIVE_TTL,
+                 negative_ttl=NEGATIVE_TTL, legacy_file=LEGACY_CACHE_FILE):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocodes (
+                key TEXT PRIMARY KEY,
+                latitude REAL,
+                longitude REAL,
+                found INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        if legacy_file:
+            self._import_legacy(legacy_file)
+
+    def _import_legacy(self, legacy_file):
+        """One-time import of the old geocode_cache.json"""
+        if not Path(legacy_file).exists():
+            return
+        if self._conn.execute("SELECT 1 FROM geocodes LIMIT 1").fetchone():
+            return
+        try:
+            with open(legacy_file, "r") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.put_many({name: tuple(coords) for name, coords in legacy.items()})
+
+    def _is_fresh(self, found, updated_at, now):
+        ttl = self.positive_ttl if found else self.negative_ttl
+        return now - updated_at < ttl
+
+    def get_many(self, keys):
+        """
+        Look up normalized keys. Returns {key: (lat, lon) or None} for fresh
+        entries; keys that are absent or expired are left out.
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        results = {}
+        with self._lock:
+            for i in range(0, len(keys), SQLITE_MAX_VARIABLES):
+                chunk = keys[i:i + SQLITE_MAX_VARIABLES]
+                rows = self._conn.execute(
+                    f"SELECT key, latitude, longitude, found, updated_at FROM geocodes "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, lat, lon, found, updated_at in rows:
+                    if self._is_fresh(found, updated_at, now):
+                        results[key] = (lat, lon) if found else None
+        return results
+
+    def put_many(self, results):
+        """Store {name: (lat, lon) or None}; None records a failed lookup"""
+        now = time.time()
+        rows = [
+            (normalize_location(name), *(coords if coords else (None, None)), int(bool(coords)), now)
+            for name, coords in results.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO geocodes (key, latitude, longitude, found, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+
+class Geocoder:
+    """Cached geocoding with batched, de-duplicated lookups"""
+
+    def __init__(self, geocode_fn, cache=None, gazetteer=None):
+        # geocode_fn is a rate-limited callable such as geopy's RateLimiter(Nominatim.geocode)
+        self.geocode_fn = geocode_fn
+        self.cache = cache if cache is not None else GeocodeCache()
+        # Optional offline table consulted before the network
+        self.gazetteer = gazetteer
+
+    def get_coordinates(self, location_name, on_error=None):
+        """Return (lat, lon) for a location name, or None if it can't be found"""
+        return self.get_coordinates_many([location_name], on_error=on_error).get(location_name)
+
+    def is_area(self, location_name):
+        """
+        True if the name is a whole region or country (per the gazetteer),
+        whose centre is too coarse to measure distances from
+        """
+        return self.gazetteer is not None and self.gazetteer.is_area(normalize_location(location_name))
+
+    def get_coordinates_many(self, location_names, on_error=None):
+        """
+        Geocode many names at once. Names are de-duplicated by normalized key,
+        answered from the cache in a single query, then from the offline
+        gazetteer, and only the remaining distinct names go to the network.
+        Returns {name: (lat, lon) or None}.
+        """
+        keys = {name: normalize_location(name) for name in location_names if name}
+        cached = self.cache.get_many(keys.values())
+
+        resolved = dict(cached)
+        for key in dict.fromkeys(keys.values()):
+            if key in resolved:
+                continue
+            if self.gazetteer is not None:
+                coords = self.gazetteer.lookup(key)
+                if coords is not None:
+                    resolved[key] = coords
+                    continue
+            try:
+                location = self.geocode_fn(key)
+            except Exception as e:
+                # Transient failures (timeouts, rate limits) are not cached
+                if on_error:
+                    on_error(key, e)
+                resolved[key] = None
+                continue
+            coords = (location.latitude, location.longitude) if location else None
+            resolved[key] = coords
+            # Stored as we go so an interrupted batch keeps its progress
+            self.cache.put_many({key: coords})
+
+        return {name: resolved.get(key) for name, key in keys.items()}
@@ -0,0 +1,162 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from ai_models import stream_local_generation
+
+# Constants
+MAX_QUEUE_SIZE = 64
+MAX_BATCH_SIZE = 8
+MAX_BATCH_WAIT = 0.02  # seconds to wait for more prompts to join a batch
+DEFAULT_REQUEST_TIMEOUT = 60  # seconds
+MAX_CONCURRENT_STREAMS = 2  # streamed chat replies generating at once
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the server is saturated and cannot accept more requests"""
+
+
+class InferenceTimeout(Exception):
+    """Raised when a request is not answered within its timeout"""
+
+
+class _Request:
+    def __init__(self, prompt, generate_kwargs, deadline):
+        self.prompt = prompt
+        self.generate_kwargs = generate_kwargs
+        self.deadline = deadline
+        self.future = Future()
+
+    @property
+    def batch_key(self):
+        # Only requests with identical generation settings can share a forward pass
+        return json.dumps(self.generate_kwargs, sort_keys=True, default=str)
+
+
+class InferenceServer:
+    """
+    Process-wide text-generation service shared by all Streamlit sessions.
+
+    Requests go into a bounded queue; a single worker thread drains it,
+    micro-batching prompts that arrive within a few milliseconds of each other
+    into one pipeline call. Each request has its own timeout. Streamed
+    replies can't share a batch, so a semaphore bounds how many run at once.
+    """
+
+    def __init__(self, model_provider, max_queue_size=MAX_QUEUE_SIZE,
+                 max_batch_size=MAX_BATCH_SIZE, max_batch_wait=MAX_BATCH_WAIT,
+                 max_streams=MAX_CONCURRENT_STREAMS):
+        self.model_provider = model_provider
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._pending = []
+        self._stream_slots = threading.BoundedSemaphore(max_streams)
+        self._prepared_model = None
+        self._worker = threading.Thread(target=self._run, name="inference-server", daemon=True)
+        self._worker.start()
+
+    def generate(self, prompt, timeout=DEFAULT_REQUEST_TIMEOUT, **generate_kwargs):
+        """Generate text for a prompt, blocking until done or `timeout` seconds pass"""
+        request = _Request(prompt, generate_kwargs, time.monotonic() + timeout)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            raise InferenceQueueFull("The AI assistant is busy. Please try again in a moment.")
+        try:
+            return request.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # The worker skips cancelled requests it hasn't started yet
+            request.future.cancel()
+            raise InferenceTimeout(f"No response within {timeout} seconds")
+
+    def stream(self, prompt, timeout=DEFAULT_REQUEST_TIMEOUT, **generate_kwargs):
+        """
+        Yield generated text as it arrives. Waits up to `timeout` seconds for a
+        stream slot, and gives up if no text arrives for `timeout` seconds.
+        """
+        if not self._stream_slots.acquire(timeout=timeout):
+            raise InferenceQueueFull("The AI assistant is busy. Please try again in a moment.")
+        try:
+            model = self.model_provider()
+            if model is None:
+                raise RuntimeError("Local AI model is not available")
+            self._prepare(model)
+            yield from stream_local_generation(model, prompt, timeout=timeout, **generate_kwargs)
+        except TimeoutError as e:
+            raise InferenceTimeout(str(e))
+        finally:
+            self._stream_slots.release()
+
+    def queue_size(self):
+        return self._queue.qsize() + len(self._pending)
+
+    def _next_batch(self):
+        """Block for one request, then gather compatible ones until the batch is full or the wait expires"""
+        if not self._pending:
+            self._pending.append(self._queue.get())
+        deadline = time.monotonic() + self.max_batch_wait
+        while len(self._pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        # Drop requests whose callers have already given up
+        now = time.monotonic()
+        live = []
+        for request in self._pending:
+            if now > request.deadline:
+                request.future.cancel()
+            if not request.future.cancelled():
+                live.append(request)
+        if not live:
+            self._pending = []
+            return []
+
+        # Take the oldest request's settings; others wait for a later batch
+        key = live[0].batch_key
+        candidates = [r for r in live if r.batch_key == key][:self.max_batch_size]
+        self._pending = [r for r in live if r not in candidates]
+        return [r for r in candidates if r.future.set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                model = self.model_provider()
+                if model is None:
+                    raise RuntimeError("Local AI model is not available")
+                self._prepare(model)
+                outputs = self._generate_batch(model, batch)
+                for request, output in zip(batch, outputs):
+                    request.future.set_result(output)
+            except Exception as e:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _prepare(self, model):
+        """Configure a model's tokenizer for batching, once per model"""
+        if model is self._prepared_model:
+            return
+        tokenizer = model.tokenizer
+        # Decoder-only models continue from the last position, so padding must go on the left
+        tokenizer.padding_side = "left"
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        self._prepared_model = model
+
+    @staticmethod
+    def _generate_batch(model, batch):
+        prompts = [request.prompt for request in batch]
+        outputs = model(prompts, batch_size=len(prompts), **batch[0].generate_kwargs)
+        # A list input yields one list of candidates per prompt
+        return [output[0]["generated_text"] for output in outputs]
@@ -0,0 +1,161 @@
+import hashlib
+import re
+from collections import defaultdict
+
+import numpy as np
+
+# Constants
+COMPANY_SUFFIXES = {"inc", "incorporated", "ltd", "limited", "llc", "plc", "pty", "corp",
+                    "corporation", "co", "company", "gmbh", "ag", "sa", "pvt"}
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4  # near-duplicates must agree on at least one 16-bit band
+MAX_HAMMING_DISTANCE = 3
+MIN_DESCRIPTION_TOKENS = 20  # shorter descriptions are too generic to fingerprint
+ID_DESCRIPTION_CHARS = 200  # of the normalized description; boards often truncate the end
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+def _normalize(text):
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (text or "").lower()).split())
+
+
+def normalize_company(name):
+    tokens = _normalize(name).split()
+    while tokens and tokens[-1] in COMPANY_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def location_city(location):
+    """First part of a location with a trailing region code dropped: 'Sydney NSW' -> 'sydney'"""
+    first = (location or "").split(",")[0].split()
+    if len(first) > 1 and first[-1].isupper() and len(first[-1]) <= 3:
+        first = first[:-1]
+    return _normalize(" ".join(first))
+
+
+def canonical_key(job):
+    """
+    Normalized title, company, location and description opening; the posting
+    source is deliberately left out
+    """
+    return "|".join([
+        _normalize(job.get("title")),
+        normalize_company(job.get("company_name")),
+        _normalize(job.get("location")),
+        _normalize(job.get("description"))[:ID_DESCRIPTION_CHARS],
+    ])
+
+
+def make_job_id(job):
+    """
+    Stable content-hash ID, identical for the same posting seen via different
+    sources; different postings with the same title, company and city differ
+    by description
+    """
+    return "job_" + hashlib.sha1(canonical_key(job).encode("utf-8")).hexdigest()[:16]
+
+
+def simhash(text):
+    """64-bit SimHash of a description's word bigrams; None if it's too short to be distinctive"""
+    tokens = _normalize(text).split()
+    if len(tokens) < MIN_DESCRIPTION_TOKENS:
+        return None
+    shingles = {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+         for s in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+    bits = (hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    votes = 2 * bits.sum(axis=0, dtype=np.int64) - len(shingles)
+    return int(sum(1 << i for i in np.flatnonzero(votes > 0)))
+
+
+def _distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _bands(fingerprint):
+    width = SIMHASH_BITS // SIMHASH_BANDS
+    mask = (1 << width) - 1
+    return [(band, (fingerprint >> (band * width)) & mask) for band in range(SIMHASH_BANDS)]
+
+
+class JobIndex:
+    """
+    Identity index over jobs. Exact matches are a dict lookup on the content
+    ID; near-duplicates (same title, company and city with a SimHash-similar
+    description) are found through locality-sensitive banding, so building
+    the index over n jobs is near-linear.
+    """
+
+    def __init__(self):
+        self._ids = defaultdict(set)  # content ID -> job IDs
+        self._content_ids = {}
+        self._fingerprints = {}
+        self._buckets = defaultdict(set)
+
+    def __len__(self):
+        return len(self._content_ids)
+
+    @staticmethod
+    def _scope(job):
+        return (_normalize(job.get("title")), normalize_company(job.get("company_name")),
+                location_city(job.get("location")))
+
+    def find(self, job):
+        """ID of an indexed job that is the same posting as `job`, or None"""
+        fingerprint = simhash(job.get("description"))
+        for job_id in self._ids.get(make_job_id(job), ()):
+            known = self._fingerprints.get(job_id)
+            # Equal keys only share a description opening; the fingerprints must agree too
+            if fingerprint is None or known is None or _distance(fingerprint, known) <= MAX_HAMMING_DISTANCE:
+                return job_id
+        if fingerprint is None:
+            return None
+        scope = self._scope(job)
+        for band in _bands(fingerprint):
+            for job_id in self._buckets.get((scope, band), ()):
+                if _distance(fingerprint, self._fingerprints[job_id]) <= MAX_HAMMING_DISTANCE:
+                    return job_id
+        return None
+
+    def add(self, job_id, job):
+        content_id = self._content_ids[job_id] = make_job_id(job)
+        self._ids[content_id].add(job_id)
+        fingerprint = simhash(job.get("description"))
+        if fingerprint is not None:
+            self._fingerprints[job_id] = fingerprint
+            scope = self._scope(job)
+            for band in _bands(fingerprint):
+                self._buckets[(scope, band)].add(job_id)
+
+    def remove(self, job_id, job):
+        content_id = self._content_ids.pop(job_id, None)
+        if content_id is not None:
+            self._ids[content_id].discard(job_id)
+            if not self._ids[content_id]:
+                del self._ids[content_id]
+        fingerprint = self._fingerprints.pop(job_id, None)
+        if fingerprint is not None:
+            scope = self._scope(job)
+            for band in _bands(fingerprint):
+                self._buckets[(scope, band)].discard(job_id)
+
+
+def dedupe_jobs(jobs):
+    """Drop repeat postings, keeping the first and recording every source it was seen via"""
+    index = JobIndex()
+    unique = []
+    for job in jobs:
+        existing = index.find(job)
+        if existing is not None:
+            sources = unique[existing].setdefault("sources", [unique[existing].get("via", "")])
+            if job.get("via") and job["via"] not in sources:
+                sources.append(job["via"])
+            continue
+        index.add(len(unique), job)
+        # Copied so annotating results doesn't alter the caller's (possibly cached) dicts
+        unique.append(dict(job))
+    return unique
@@ -0,0 +1,67 @@
+import html
+
+import numpy as np
+
+# Constants
+EARTH_RADIUS_KM = 6371.0088
+EXACT_LOCATION_KM = 1.0  # "Exact location only" still allows for geocoding jitter
+MAP_TILES = "CartoDB dark_matter"
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distance in km from one point to arrays of points, in a single vectorized pass"""
+    lat1 = np.radians(lat)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(lons, dtype=np.float64) - lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def filter_by_radius(center, coords, radius_km):
+    """
+    Return (keep mask, distances) for a list of (lat, lon) or None against a
+    search centre. Jobs with unknown coordinates are kept, with NaN distance,
+    since they can't be ruled out.
+    """
+    known = np.array([c is not None for c in coords], dtype=bool)
+    points = np.array([c if c is not None else (np.nan, np.nan) for c in coords],
+                      dtype=np.float64).reshape(-1, 2)
+    distances = np.full(len(coords), np.nan)
+    if known.any():
+        distances[known] = haversine_km(center[0], center[1], points[known, 0], points[known, 1])
+    limit = radius_km if radius_km else EXACT_LOCATION_KM
+    keep = ~known | (distances <= limit)
+    return keep, distances
+
+
+def build_job_map(center, jobs, coords, radius_km=0):
+    """Folium map of jobs with clustered markers and the search radius drawn around the centre"""
+    import folium
+    from folium.plugins import MarkerCluster
+
+    job_map = folium.Map(location=center, zoom_start=11 if radius_km <= 10 else 9, tiles=MAP_TILES)
+    if radius_km:
+        folium.Circle(
+            location=center,
+            radius=radius_km * 1000,
+            color="#00FF7F",
+            fill=True,
+            fill_opacity=0.05
+        ).add_to(job_map)
+
+    cluster = MarkerCluster().add_to(job_map)
+    for job, point in zip(jobs, coords):
+        if point is None:
+            continue
+        popup = (
+            f"<b>{html.escape(job.get('title') or 'N/A')}</b><br>"
+            f"{html.escape(job.get('company_name') or 'N/A')}<br>"
+            f"{html.escape(job.get('location') or '')}"
+        )
+        folium.Marker(
+            location=point,
+            popup=folium.Popup(popup, max_width=250),
+            tooltip=html.escape(job.get("title") or "")
+        ).add_to(cluster)
+    return job_map
@@ -0,0 +1,182 @@
+import json
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from job_identity import dedupe_jobs
+
+# Constants
+SERPAPI_URL = "https://serpapi.com/search.json"
+SEARCH_CACHE_FILE = "job_search_cache.json"
+SEARCH_CACHE_TTL = 6 * 60 * 60  # seconds
+DEFAULT_PAGES = 3
+
+
+class JobSearchError(Exception):
+    """Raised when the job search backend returns an error"""
+
+
+class JobSearchClient:
+    def __init__(self, api_key, base_url=SERPAPI_URL, cache_file=SEARCH_CACHE_FILE,
+                 cache_ttl=SEARCH_CACHE_TTL, max_workers=DEFAULT_PAGES, timeout=15):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.cache_file = cache_file
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = self._create_session()
+        self._cache_lock = threading.Lock()
+        self.cache = self._load_cache()
+
+    def _create_session(self):
+        """Create a pooled HTTP session shared by all page fetches"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers,
+                              pool_maxsize=self.max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _load_cache(self):
+        """Load cached search responses from disk"""
+        if self.cache_file and Path(self.cache_file).exists():
+            try:
+                with open(self.cache_file, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    def _save_cache(self):
+        """Atomically write the response cache to disk"""
+        if not self.cache_file:
+            return
+        directory = os.path.dirname(os.path.abspath(self.cache_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.cache, f)
+        os.replace(tmp_path, self.cache_file)
+
+    @staticmethod
+    def normalize_query(job_title, country_code, location="", radius_km=0):
+        """Build the canonical form of a search so equivalent queries share a cache entry"""
+        return {
+            "q": " ".join(job_title.lower().split()),
+            "gl": (country_code or "").lower(),
+            "location": " ".join((location or "").lower().split()),
+            "lrad": int(radius_km or 0),
+        }
+
+    @staticmethod
+    def _cache_key(query, page):
+        payload = json.dumps({**query, "page": page}, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _get_cached(self, key):
+        entry = self.cache.get(key)
+        # Entries from before token paging have no next_page_token and are refetched
+        if entry and "next_page_token" in entry and time.time() - entry["fetched_at"] < self.cache_ttl:
+            return entry
+        return None
+
+    def _fetch_page(self, query, country_name, next_page_token=None):
+        """
+        Fetch one page of Google Jobs results. The engine no longer accepts a
+        `start` offset; later pages are requested with the previous page's
+        next_page_token. Returns (jobs, next_page_token or None).
+        """
+        params = {
+            "engine": "google_jobs",
+            "q": query["q"],
+            "gl": query["gl"],
+            "hl": "en",
+            "api_key": self.api_key,
+        }
+        if next_page_token:
+            params["next_page_token"] = next_page_token
+        if query["location"]:
+            params["location"] = f"{query['location']}, {country_name}" if country_name else query["location"]
+        if query["lrad"]:
+            params["lrad"] = query["lrad"]
+
+        response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        if "error" in data:
+            # SerpAPI reports an exhausted result set as an error on later pages
+            if next_page_token and "hasn't returned any results" in data["error"]:
+                return [], None
+            raise JobSearchError(data["error"])
+        jobs = [self._normalize_job(job) for job in data.get("jobs_results", [])]
+        return jobs, (data.get("serpapi_pagination") or {}).get("next_page_token")
+
+    @staticmethod
+    def _normalize_job(job):
+        """Convert a SerpAPI job result into the shape used across the app"""
+        extensions = job.get("detected_extensions", {})
+        apply_options = job.get("apply_options") or []
+        return {
+            "title": job.get("title", ""),
+            "company_name": job.get("company_name", ""),
+            "location": job.get("location", ""),
+            "via": job.get("via", "").replace("via ", "", 1),
+            "description": job.get("description", ""),
+            "posted": extensions.get("posted_at", "Date not available"),
+            "schedule_type": extensions.get("schedule_type", ""),
+            "apply_link": apply_options[0].get("link", "") if apply_options else "",
+            "serpapi_job_id": job.get("job_id", ""),
+        }
+
+    def search(self, job_title, country_code, location="", radius_km=0,
+               country_name="", pages=DEFAULT_PAGES):
+        """
+        Search Google Jobs, following next_page_token for up to `pages` pages.
+        Pages already in the on-disk cache cost no API calls.
+        """
+        query = self.normalize_query(job_title, country_code, location, radius_km)
+        jobs = []
+        fetched = {}
+        next_page_token = None
+        for page in range(pages):
+            key = self._cache_key(query, page)
+            entry = self._get_cached(key)
+            if entry is None:
+                # A later page can only be fetched with the token from the one before it
+                if page > 0 and not next_page_token:
+                    break
+                page_jobs, token = self._fetch_page(query, country_name, next_page_token)
+                entry = fetched[key] = {"jobs": page_jobs, "next_page_token": token}
+            jobs.extend(entry["jobs"])
+            next_page_token = entry["next_page_token"]
+            if not next_page_token:
+                break
+
+        if fetched:
+            now = time.time()
+            with self._cache_lock:
+                for key, entry in fetched.items():
+                    self.cache[key] = {"fetched_at": now, **entry}
+                self._prune_cache(now)
+                self._save_cache()
+        # The same posting often appears on several pages or via several boards
+        return dedupe_jobs(jobs)
+
+    def _prune_cache(self, now):
+        """Drop expired entries so the cache file does not grow forever"""
+        expired = [key for key, entry in self.cache.items()
+                   if now - entry["fetched_at"] >= self.cache_ttl]
+        for key in expired:
+            del self.cache[key]
+
+    def clear_cache(self):
+        """Remove all cached search responses"""
+        with self._cache_lock:
+            self.cache = {}
+            self._save_cache()
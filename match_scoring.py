@@ -0,0 +1,207 @@
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+from response_cache import hash_text, hashed_ngram_embedding
+
+# Constants
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+FALLBACK_MODEL_NAME = "hashed-trigram"  # used when sentence-transformers isn't installed
+EMBEDDINGS_FILE = "job_embeddings.npy"
+EMBEDDINGS_INDEX_SUFFIX = ".index.json"
+INITIAL_CAPACITY = 1024  # rows; the matrix doubles when full
+EMBED_BATCH_SIZE = 32
+MAX_EMBED_CHARS = 2000  # MiniLM truncates at 256 word pieces, so longer text adds nothing
+TOP_MATCHES_FOR_ANALYSIS = 3
+
+
+def load_embedding_model(model_name=EMBEDDING_MODEL_NAME):
+    """
+    Return (name, fn) where fn maps a list of texts to L2-normalized float32
+    rows. Falls back to model-free hashed trigram embeddings so scoring still
+    works, more coarsely, without sentence-transformers.
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return FALLBACK_MODEL_NAME, lambda texts: np.stack([hashed_ngram_embedding(t) for t in texts])
+
+    model = SentenceTransformer(model_name, device="cpu")
+
+    def embed(texts):
+        return model.encode(texts, batch_size=EMBED_BATCH_SIZE, normalize_embeddings=True,
+                            convert_to_numpy=True).astype(np.float32)
+
+    return model_name, embed
+
+
+class EmbeddingStore:
+    """
+    Embeddings persisted as rows of a memory-mapped .npy matrix, with a JSON
+    sidecar mapping content keys to rows. Only rows that are read are paged
+    in, so thousands of cached job embeddings cost little memory. The store
+    is reset when the embedding model changes. Intended for one writer
+    process; the app holds a single process-wide instance.
+    """
+
+    def __init__(self, path=EMBEDDINGS_FILE):
+        self.path = path
+        self.index_path = path + EMBEDDINGS_INDEX_SUFFIX
+        self._lock = threading.Lock()
+        self.model_name = None
+        self.rows = {}
+        self._matrix = None
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            self._matrix = np.load(self.path, mmap_mode="r+")
+            self.model_name = index["model"]
+            self.rows = index["rows"]
+        except (OSError, ValueError, KeyError):
+            self._matrix = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def use_model(self, model_name, dim):
+        """Discard stored embeddings that came from a different model"""
+        with self._lock:
+            if self.model_name == model_name and self._matrix is not None and self._matrix.shape[1] == dim:
+                return
+            self.model_name = model_name
+            self.rows = {}
+            self._matrix = None
+            self._resize(INITIAL_CAPACITY, dim)
+            self._save_index()
+
+    def _resize(self, capacity, dim):
+        """Copy existing rows into a larger matrix file and swap it in atomically"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npy")
+        os.close(fd)
+        matrix = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(capacity, dim))
+        if self._matrix is not None and self.rows:
+            used = len(self.rows)
+            matrix[:used] = self._matrix[:used]
+        matrix.flush()
+        del matrix
+        self._matrix = None
+        os.replace(tmp_path, self.path)
+        self._matrix = np.load(self.path, mmap_mode="r+")
+
+    def _save_index(self):
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"model": self.model_name, "rows": self.rows}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def add(self, keys, vectors):
+        """Append embeddings for new keys"""
+        with self._lock:
+            new = [(key, vector) for key, vector in zip(keys, vectors) if key not in self.rows]
+            if not new:
+                return
+            needed = len(self.rows) + len(new)
+            if needed > self._matrix.shape[0]:
+                self._resize(max(needed, 2 * self._matrix.shape[0]), self._matrix.shape[1])
+            start = len(self.rows)
+            self._matrix[start:start + len(new)] = np.stack([vector for _, vector in new])
+            self._matrix.flush()
+            for offset, (key, _) in enumerate(new):
+                self.rows[key] = start + offset
+            self._save_index()
+
+    def get(self, keys):
+        """Matrix of embeddings for `keys`, in order; all keys must be stored"""
+        with self._lock:
+            return np.asarray(self._matrix[[self.rows[key] for key in keys]])
+
+
+class MatchScorer:
+    """
+    Scores how well a resume matches jobs by cosine similarity of sentence
+    embeddings. Job embeddings are cached in an EmbeddingStore by content, so
+    scoring a page of already-seen results is one matrix-vector product. The
+    embedding model loads on a background thread once start() is called;
+    scoring before then waits for it.
+    """
+
+    def __init__(self, store=None, model_loader=load_embedding_model):
+        self.store = store if store is not None else EmbeddingStore()
+        self._model_loader = model_loader
+        self.model_name = None
+        self.error = None
+        self._embed_fn = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._resume_cache = (None, None)
+
+    def start(self):
+        """Start loading the embedding model in the background; safe to call on every script run"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="embedding-model-loader", daemon=True)
+                self._thread.start()
+        return self
+
+    def _load(self):
+        try:
+            model_name, embed_fn = self._model_loader()
+            probe = embed_fn(["probe"])
+            self.store.use_model(model_name, probe.shape[1])
+            self._embed_fn = embed_fn
+            self.model_name = model_name
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self._done.set()
+
+    def is_ready(self):
+        return self._embed_fn is not None
+
+    def uses_fallback(self):
+        """True when only the coarse hashed-trigram embeddings are available"""
+        return self.model_name == FALLBACK_MODEL_NAME
+
+    def _embed(self, texts):
+        self.start()
+        self._done.wait()
+        if self._embed_fn is None:
+            raise RuntimeError(f"Embedding model unavailable: {self.error}")
+        return self._embed_fn(texts)
+
+    @staticmethod
+    def job_text(job):
+        return f"{job.get('title', '')}. {job.get('company_name', '')}. {job.get('description', '')}"[:MAX_EMBED_CHARS]
+
+    def _resume_vector(self, resume_text):
+        key = hash_text(resume_text)
+        if self._resume_cache[0] != key:
+            self._resume_cache = (key, self._embed([resume_text[:MAX_EMBED_CHARS]])[0])
+        return self._resume_cache[1]
+
+    def score_jobs(self, resume_text, jobs):
+        """Match scores from 0 to 100 for each job, in order"""
+        if not jobs or not (resume_text or "").strip():
+            return np.zeros(len(jobs), dtype=np.float32)
+        resume_vector = self._resume_vector(resume_text)
+        texts = [self.job_text(job) for job in jobs]
+        keys = [hash_text(text) for text in texts]
+        missing = {key: text for key, text in zip(keys, texts) if key not in self.store.rows}
+        if missing:
+            self.store.add(list(missing), self._embed(list(missing.values())))
+        similarities = self.store.get(keys) @ resume_vector
+        return np.clip(similarities, 0.0, 1.0) * 100.0
+
+    def rank_jobs(self, resume_text, jobs, top_k=None):
+        """[(job index, score)] best match first"""
+        scores = self.score_jobs(resume_text, jobs)
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        return [(int(i), float(scores[i])) for i in order]
@@ -0,0 +1,139 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from task_queue import run_in_subprocess
+
+# Constants
+MAX_PDF_BYTES = 10 * 1024 * 1024
+MAX_PDF_PAGES = 100
+PARALLEL_MIN_PAGES = 40  # below this, worker start-up (~0.2 s) costs more than it saves
+EXTRACT_WORKERS = 4
+TEXT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+class PDFLimitError(Exception):
+    """Raised when a PDF is over the size or page limit"""
+
+
+def _pdf_bytes(source):
+    """Bytes of an uploaded file, file object or bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+def _open_reader(data, max_bytes, max_pages):
+    from PyPDF2 import PdfReader
+
+    if len(data) > max_bytes:
+        raise PDFLimitError(f"PDF is {len(data) / 1024 / 1024:.1f} MB; the limit is "
+                            f"{max_bytes / 1024 / 1024:.1f} MB")
+    reader = PdfReader(BytesIO(data))
+    if len(reader.pages) > max_pages:
+        raise PDFLimitError(f"PDF has {len(reader.pages)} pages; the limit is {max_pages}")
+    return reader
+
+
+def extract_page_range(data, start, stop):
+    """Text of pages [start, stop); runs in a worker process for large documents"""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def default_workers():
+    """Worker processes for page-parallel extraction, leaving a core for the caller"""
+    return min(EXTRACT_WORKERS, (os.cpu_count() or 1) - 1)
+
+
+def iter_pdf_pages(source, max_bytes=MAX_PDF_BYTES, max_pages=MAX_PDF_PAGES,
+                   parallel_min_pages=PARALLEL_MIN_PAGES, workers=None):
+    """
+    Yield the text of each page, in order. Documents of parallel_min_pages
+    or more are split into contiguous page ranges: the caller extracts the
+    first range itself, streaming it page by page, while worker processes
+    extract the rest concurrently. Raises PDFLimitError before extracting
+    anything if the file is over the size or page limit.
+    """
+    data = _pdf_bytes(source)
+    reader = _open_reader(data, max_bytes, max_pages)
+    page_count = len(reader.pages)
+    workers = default_workers() if workers is None else workers
+    if page_count < parallel_min_pages or workers < 1:
+        for page in reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    # Each worker is a fresh interpreter, so one range per worker keeps start-up costs to one each
+    bounds = [page_count * i // (workers + 1) for i in range(workers + 2)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-text") as executor:
+        futures = [executor.submit(run_in_subprocess, extract_page_range, (data, start, stop))
+                   for start, stop in zip(bounds[1:-1], bounds[2:])]
+        try:
+            for i in range(bounds[1]):
+                yield reader.pages[i].extract_text() or ""
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+class TextCache:
+    """In-memory LRU of extracted text keyed by a hash of the PDF bytes, bounded by total size"""
+
+    def __init__(self, max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def set(self, key, text):
+        size = len(text)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = text
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_text_cache = TextCache()
+
+
+def extract_pdf_text(source, max_bytes=MAX_PDF_BYTES, max_pages=MAX_PDF_PAGES, cache=_text_cache):
+    """
+    Full text of a PDF, each page followed by a newline. Results are cached by
+    content hash, so re-extracting the same upload on a rerun is a lookup.
+    """
+    data = _pdf_bytes(source)
+    key = hashlib.sha256(data).hexdigest()
+    text = cache.get(key) if cache is not None else None
+    if text is None:
+        text = "".join(f"{page}\n" for page in iter_pdf_pages(data, max_bytes=max_bytes, max_pages=max_pages))
+        if cache is not None:
+            cache.set(key, text)
+    return text
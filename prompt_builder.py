@@ -0,0 +1,231 @@
+import math
+import re
+import threading
+from functools import lru_cache
+
+from ai_models import HF_CHAT_MODEL, LOCAL_MODEL_NAME, LOCAL_REPLY_TOKENS
+from skill_taxonomy import get_skill_matcher
+
+# Constants
+# Identical text at the start of every HF prompt, so backends with prefix caching reuse its work
+TESSERACT_SYSTEM_PROMPT = """You are TESSERACT, an expert career coach specializing in resumes and job hunting. Provide:
+- Concise, actionable advice
+- Industry-specific best practices
+- Professional tone
+- Focus on resumes, cover letters, and interviews"""
+# The local model's whole window is 128 tokens, so its static prefix is one line
+LOCAL_SYSTEM_PROMPT = "You are TESSERACT, a concise career coach."
+# Context windows used until the model's tokenizer loads and reports its own:
+# BlenderBot has 128 positions; the HF model is kept within Mistral's
+# 4096-token attention window
+MODEL_CONTEXT_TOKENS = {LOCAL_MODEL_NAME: 128, HF_CHAT_MODEL: 4096}
+DEFAULT_CONTEXT_TOKENS = 2048
+MAX_REPORTED_CONTEXT = 1_000_000  # tokenizers with no known limit report a huge sentinel instead
+CHAT_REPLY_TOKENS = 500
+CHARS_PER_TOKEN = 4  # estimate used until the model's tokenizer is loaded
+MESSAGE_OVERHEAD_TOKENS = 4  # role markers a chat template adds per message
+SECTION_HEADING_TOKENS = 8  # allowance for the heading a caller puts before each section
+MIN_SUMMARY_TOKENS = 16
+MIN_SECTION_TOKENS = 16  # fewer than this left for a non-empty section is an error, not an empty section
+TOKEN_COUNT_CACHE_SIZE = 8192
+COMPRESSED_TEXT_CACHE_SIZE = 256
+TRUNCATION_MARK = " …"
+
+_UNIT_SPLIT_RE = re.compile(r"\n+|(?<=[.!?;])\s+(?=[A-Z•*-])")
+_SPACE_RE = re.compile(r"[ \t\f\v]+")
+
+
+class PromptTooLong(ValueError):
+    """Raised when the fixed prompt text leaves no room for the sections it introduces"""
+
+
+_tokenizers = {}  # model name -> tokenizer, or None if it couldn't be loaded
+_tokenizer_threads = {}
+_tokenizer_lock = threading.Lock()
+
+
+def _load_tokenizer(model_name):
+    try:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+    except Exception:
+        tokenizer = None
+    _tokenizers[model_name] = tokenizer
+
+
+def get_tokenizer(model_name):
+    """
+    The model's tokenizer, or None until it has loaded. The first call starts
+    loading it on a background thread, so building a prompt never waits for
+    transformers or a download; counts are estimated meanwhile.
+    """
+    with _tokenizer_lock:
+        if model_name not in _tokenizer_threads:
+            thread = threading.Thread(target=_load_tokenizer, args=(model_name,),
+                                      name=f"tokenizer-{model_name}", daemon=True)
+            _tokenizer_threads[model_name] = thread
+            thread.start()
+    return _tokenizers.get(model_name)
+
+
+@lru_cache(maxsize=TOKEN_COUNT_CACHE_SIZE)
+def _exact_token_count(text, model_name):
+    return len(_tokenizers[model_name].encode(text, add_special_tokens=False))
+
+
+def count_tokens(text, model_name):
+    """Tokens in text for the model; exact counts are cached, so reruns don't re-tokenize"""
+    if not text:
+        return 0
+    if get_tokenizer(model_name) is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return _exact_token_count(text, model_name)
+
+
+def context_tokens(model_name):
+    """The model's context window: its tokenizer's model_max_length once loaded, else the table's"""
+    limit = getattr(get_tokenizer(model_name), "model_max_length", None)
+    if isinstance(limit, int) and 0 < limit < MAX_REPORTED_CONTEXT:
+        return limit
+    return MODEL_CONTEXT_TOKENS.get(model_name, DEFAULT_CONTEXT_TOKENS)
+
+
+def truncate_to_tokens(text, budget, model_name):
+    """Cut text to at most `budget` tokens, marking the cut"""
+    if count_tokens(text, model_name) <= budget:
+        return text
+    keep = max(budget - 1, 0)  # room for the mark
+    tokenizer = get_tokenizer(model_name)
+    if tokenizer is not None:
+        text = tokenizer.decode(tokenizer.encode(text, add_special_tokens=False)[:keep])
+    else:
+        text = text[:keep * CHARS_PER_TOKEN]
+    return text.rstrip() + TRUNCATION_MARK if keep else ""
+
+
+@lru_cache(maxsize=COMPRESSED_TEXT_CACHE_SIZE)
+def compress_text(text, budget, model_name, keywords=frozenset()):
+    """
+    Fit text into `budget` tokens. Whitespace runs and repeated lines go
+    first; if that isn't enough, the lines and sentences mentioning the most
+    skills (those in `keywords` count double) are kept, in their original order.
+    """
+    if budget <= 0 or not text:
+        return ""
+    if count_tokens(text, model_name) <= budget:
+        return text
+    units = list(dict.fromkeys(
+        unit for unit in (_SPACE_RE.sub(" ", part).strip() for part in _UNIT_SPLIT_RE.split(text)) if unit
+    ))
+    compact = "\n".join(units)
+    if count_tokens(compact, model_name) <= budget:
+        return compact
+
+    matcher = get_skill_matcher()
+
+    def relevance(i):
+        skills = matcher.find(units[i])
+        return len(skills) + sum(skill in keywords for skill in skills), -i
+
+    kept, used = [], 0
+    for i in sorted(range(len(units)), key=relevance, reverse=True):
+        cost = count_tokens(units[i], model_name) + 1  # and its newline
+        if used + cost <= budget:
+            kept.append(i)
+            used += cost
+    if not kept:
+        return truncate_to_tokens(units[0], budget, model_name)
+    return "\n".join(units[i] for i in sorted(kept))
+
+
+def message_tokens(messages, model_name):
+    return sum(count_tokens(m["content"], model_name) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def compress_history(messages, budget, model_name):
+    """
+    The most recent chat messages that fit in `budget` tokens. Older user
+    questions are folded into one short summary message when there is room.
+    """
+    kept, used = [], 0
+    for message in reversed(messages):
+        cost = count_tokens(message["content"], model_name) + MESSAGE_OVERHEAD_TOKENS
+        if used + cost > budget:
+            break
+        kept.append(message)
+        used += cost
+    kept.reverse()
+    earlier = [m["content"].split("\n", 1)[0] for m in messages[:len(messages) - len(kept)] if m["role"] == "user"]
+    room = budget - used - MESSAGE_OVERHEAD_TOKENS
+    if earlier and room >= MIN_SUMMARY_TOKENS:
+        summary = truncate_to_tokens("Earlier in this conversation the user asked: " + "; ".join(earlier),
+                                     room, model_name)
+        kept.insert(0, {"role": "system", "content": summary})
+    return kept
+
+
+def allocate(available, needs, shares):
+    """
+    Split `available` tokens across sections in proportion to their shares.
+    A section that needs less than its share passes the rest to the others.
+    """
+    grants = {}
+    remaining = max(available, 0)
+    share_left = sum(shares[name] for name in needs)
+    for name in sorted(needs, key=lambda name: needs[name] / shares[name]):
+        grants[name] = min(needs[name], int(remaining * shares[name] / share_left))
+        remaining -= grants[name]
+        share_left -= shares[name]
+    return grants
+
+
+def prompt_overhead(model_name):
+    """Tokens the backend wraps around every prompt: the system prefix and its markers"""
+    if model_name == LOCAL_MODEL_NAME:
+        return count_tokens(local_prompt(""), model_name)
+    return count_tokens(TESSERACT_SYSTEM_PROMPT, model_name) + 2 * MESSAGE_OVERHEAD_TOKENS
+
+
+def fit_sections(model_name, fixed, sections, max_tokens=CHAT_REPLY_TOKENS, keywords=frozenset()):
+    """
+    Fit variable prompt sections into what the model's context leaves after
+    the system prefix, the fixed text (instructions, question) and the reply.
+    `sections` maps a name to (text or chat messages, share); returns
+    {name: fitted text or messages}. Raises PromptTooLong rather than
+    silently dropping sections the fixed text leaves no room for.
+    """
+    reply = LOCAL_REPLY_TOKENS if model_name == LOCAL_MODEL_NAME else max_tokens
+    available = (context_tokens(model_name) - reply - prompt_overhead(model_name)
+                 - count_tokens(fixed, model_name) - SECTION_HEADING_TOKENS * len(sections))
+    needs, shares = {}, {}
+    for name, (content, share) in sections.items():
+        is_history = isinstance(content, list)
+        needs[name] = message_tokens(content, model_name) if is_history else count_tokens(content, model_name)
+        shares[name] = share
+    required = sum(min(need, MIN_SECTION_TOKENS) for need in needs.values())
+    if required and available < required:
+        raise PromptTooLong(f"The request is too long for {model_name}: it leaves {max(available, 0)} "
+                            f"tokens for the {' and '.join(sections)}, not the {required} needed")
+    grants = allocate(available, needs, shares)
+    return {
+        name: compress_history(content, grants[name], model_name) if isinstance(content, list)
+        else compress_text(content, grants[name], model_name, frozenset(keywords))
+        for name, (content, _) in sections.items()
+    }
+
+
+def local_prompt(question, context=""):
+    """Prompt text for the local model, starting with its static system prefix"""
+    return f"{LOCAL_SYSTEM_PROMPT}\n{context}\n[QUESTION] {question}\n[ANSWER]"
+
+
+def chat_messages(question, resume="", history=()):
+    """Messages for the HF chat endpoint; the system message always starts with the static prefix"""
+    system = f"{TESSERACT_SYSTEM_PROMPT}\n\nThe user's resume:\n{resume}" if resume else TESSERACT_SYSTEM_PROMPT
+    return [{"role": "system", "content": system}, *history, {"role": "user", "content": question}]
+
+
+def history_text(messages):
+    """Chat messages as plain text for a single-prompt model"""
+    return "\n".join(f"{m['role']}: {m['content']}" for m in messages)
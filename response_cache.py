@@ -0,0 +1,160 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+
+# Constants
+RESPONSE_CACHE_FILE = "response_cache.db"
+MAX_CACHE_ENTRIES = 5000
+MAX_CACHE_BYTES = 50 * 1024 * 1024
+SIMILARITY_THRESHOLD = 0.97  # trigram vectors put one-word differences (junior/senior) near 0.93
+EMBEDDING_DIM = 512
+
+
+def normalize_prompt(prompt):
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    prompt = " ".join(prompt.lower().split())
+    return prompt.rstrip(" ?!.")
+
+
+def hash_text(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def hashed_ngram_embedding(text, dim=EMBEDDING_DIM):
+    """
+    Cheap model-free embedding: character trigrams hashed into a fixed-size,
+    L2-normalized vector. Good enough to match rephrasings that differ by a
+    few words or typos.
+    """
+    import numpy as np
+
+    text = f"  {normalize_prompt(text)}  "
+    vector = np.zeros(dim, dtype=np.float32)
+    for i in range(len(text) - 2):
+        vector[zlib.crc32(text[i:i + 3].encode("utf-8")) % dim] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class ResponseCache:
+    """
+    Persistent cache of LLM responses keyed on (backend, model, normalized
+    prompt, context hash), with LRU eviction bounded by entry count and total
+    size. When an embedding function is given, near-identical prompts with the
+    same backend/model/context can also be served from cache.
+    """
+
+    def __init__(self, db_path=RESPONSE_CACHE_FILE, max_entries=MAX_CACHE_ENTRIES,
+                 max_bytes=MAX_CACHE_BYTES, embed_fn=None,
+                 similarity_threshold=SIMILARITY_THRESHOLD):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                backend TEXT NOT NULL,
+                model TEXT NOT NULL,
+                context_hash TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                response TEXT NOT NULL,
+                embedding BLOB,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_scope ON responses (backend, model, context_hash)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(backend, model, prompt, context=""):
+        return hash_text("\x1f".join([backend, model, normalize_prompt(prompt), hash_text(context)]))
+
+    def get(self, backend, model, prompt, context="", semantic=False):
+        """
+        Return a cached response, or None on a miss. Lookups are exact unless
+        `semantic` is set, since near-identical wording can ask something different.
+        """
+        key = self.make_key(backend, model, prompt, context)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None and semantic and self.embed_fn is not None:
+                key, row = self._find_similar(backend, model, prompt, context)
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def _find_similar(self, backend, model, prompt, context):
+        import numpy as np
+
+        rows = self._conn.execute(
+            "SELECT key, response, embedding FROM responses "
+            "WHERE backend = ? AND model = ? AND context_hash = ? AND embedding IS NOT NULL",
+            (backend, model, hash_text(context))
+        ).fetchall()
+        if not rows:
+            return None, None
+        matrix = np.frombuffer(b"".join(row[2] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        query = np.asarray(self.embed_fn(prompt), dtype=np.float32)
+        if matrix.shape[1] != query.shape[0]:
+            return None, None
+        # Stored and query vectors are unit length, so the dot product is the cosine
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None, None
+        return rows[best][0], (rows[best][1],)
+
+    def set(self, backend, model, prompt, response, context=""):
+        """Store a response and evict least-recently-used entries over the caps"""
+        key = self.make_key(backend, model, prompt, context)
+        embedding = None
+        if self.embed_fn is not None:
+            import numpy as np
+            embedding = np.asarray(self.embed_fn(prompt), dtype=np.float32).tobytes()
+        size = len(response.encode("utf-8")) + len(prompt.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, backend, model, context_hash, prompt, response, embedding, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, backend, model, hash_text(context), normalize_prompt(prompt),
+                 response, embedding, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            key, size = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -1,4 +1,8 @@
 import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from io import BytesIO
@@ -9,85 +13,239 @@ from reportlab.platypus import (Paragraph, SimpleDocTemplate, Table,
                                TableStyle, Spacer, Image)
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
 import streamlit as st
 import base64
 
-class ProfessionalResumeBuilder:
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
-    
-    def _create_custom_styles(self):
-        """Create custom styles for professional resumes"""
-        style_definitions = {
-            'Header': {
-                'parent': self.styles['Heading1'],
-                'fontSize': 16,
-                'leading': 18,
-                'spaceAfter': 6,
-                'textColor': colors.HexColor("#2E5D9E")
-            },
-            'SectionHeader': {
-                'parent': self.styles['Heading2'],
-                'fontSize': 12,
-                'leading': 14,
-                'spaceAfter': 6,
-                'textColor': colors.HexColor("#2E5D9E"),
-                'underline': True
-            },
-            'JobTitle': {
-                'parent': self.styles['Normal'],
-                'fontSize': 11,
-                'leading': 13,
-                'textColor': colors.black,
-                'fontName': 'Helvetica-Bold'
-            },
-            'Company': {
-                'parent': self.styles['Normal'],
-                'fontSize': 10,
-                'leading': 12,
-                'textColor': colors.HexColor("#555555"),
-                'fontName': 'Helvetica-Bold'
-            },
-            'Date': {
-                'parent': self.styles['Normal'],
-                'fontSize': 9,
-                'leading': 11,
-                'textColor': colors.HexColor("#777777"),
-                'fontName': 'Helvetica-Oblique'
-            },
-            'Bullet': {
-                'parent': self.styles['Normal'],
-                'fontSize': 10,
-                'leading': 12,
-                'leftIndent': 10,
-                'spaceBefore': 3,
-                'bulletIndent': 0,
-                'textColor': colors.black
-            }
+from response_cache import hash_text
+
+# Constants
+PDF_CACHE_FILE = "resume_pdf_cache.db"
+PDF_CACHE_MAX_BYTES = 20 * 1024 * 1024
+PDF_LAYOUT_VERSION = 1  # bump when template output changes so stale PDFs aren't served
+PLAIN_RESUME_MARGIN = 72
+PLAIN_RESUME_TOP = 750
+
+# Table styles shared by every render instead of being rebuilt per document
+MODERN_HEADER_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LINEBELOW', (0, 0), (0, 0), 1, colors.HexColor("#2E5D9E")),
+    ('FONTSIZE', (0, 0), (0, 0), 16),
+    ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+    ('TEXTCOLOR', (0, 0), (0, 0), colors.HexColor("#2E5D9E")),
+    ('FONTSIZE', (0, 1), (-1, -1), 10)
+])
+ENTRY_HEADER_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ALIGN', (1, 0), (1, 0), 'RIGHT')
+])
+MODERN_SKILLS_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('LEADING', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4)
+])
+CLASSIC_COLUMNS_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('LEFTPADDING', (0, 0), (0, 0), 0),
+    ('RIGHTPADDING', (1, 0), (1, 0), 0)
+])
+EXECUTIVE_HEADER_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor("#2E5D9E")),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor("#2E5D9E"))
+])
+EXECUTIVE_SKILLS_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEADING', (0, 0), (-1, -1), 14)
+])
+
+
+@lru_cache(maxsize=None)
+def shared_styles():
+    """
+    The sample stylesheet plus the resume styles, built once per process.
+    Renders only read styles, so every builder can share it.
+    """
+    styles = getSampleStyleSheet()
+    _add_custom_styles(styles)
+    return styles
+
+
+def _add_custom_styles(styles):
+    """Create custom styles for professional resumes"""
+    style_definitions = {
+        'Header': {
+            'parent': styles['Heading1'],
+            'fontSize': 16,
+            'leading': 18,
+            'spaceAfter': 6,
+            'textColor': colors.HexColor("#2E5D9E")
+        },
+        'SectionHeader': {
+            'parent': styles['Heading2'],
+            'fontSize': 12,
+            'leading': 14,
+            'spaceAfter': 6,
+            'textColor': colors.HexColor("#2E5D9E"),
+            'underline': True
+        },
+        'JobTitle': {
+            'parent': styles['Normal'],
+            'fontSize': 11,
+            'leading': 13,
+            'textColor': colors.black,
+            'fontName': 'Helvetica-Bold'
+        },
+        'Company': {
+            'parent': styles['Normal'],
+            'fontSize': 10,
+            'leading': 12,
+            'textColor': colors.HexColor("#555555"),
+            'fontName': 'Helvetica-Bold'
+        },
+        'Date': {
+            'parent': styles['Normal'],
+            'fontSize': 9,
+            'leading': 11,
+            'textColor': colors.HexColor("#777777"),
+            'fontName': 'Helvetica-Oblique'
+        },
+        'Bullet': {
+            'parent': styles['Normal'],
+            'fontSize': 10,
+            'leading': 12,
+            'leftIndent': 10,
+            'spaceBefore': 3,
+            'bulletIndent': 0,
+            'textColor': colors.black
         }
+    }
+
+    for name, params in style_definitions.items():
+        if name not in styles:
+            styles.add(ParagraphStyle(name=name, **params))
+        else:
+            # Update existing style
+            for param, value in params.items():
+                setattr(styles[name], param, value)
+
+
+class ResumePDFCache:
+    """
+    Generated resume PDFs keyed on (template, hash of resume_data), with LRU
+    eviction bounded by total size. Stored in SQLite so renders in worker
+    processes and lookups in the app share one cache.
+    """
+
+    def __init__(self, db_path=PDF_CACHE_FILE, max_bytes=PDF_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pdfs (
+                key TEXT PRIMARY KEY,
+                pdf BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pdfs_lru ON pdfs (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(resume_data, template):
+        content = json.dumps(resume_data, sort_keys=True, ensure_ascii=False, default=str)
+        return hash_text(f"{PDF_LAYOUT_VERSION}\x1f{template}\x1f{content}")
+
+    def get(self, resume_data, template):
+        """Cached PDF bytes, or None on a miss"""
+        key = self.make_key(resume_data, template)
+        with self._lock:
+            row = self._conn.execute("SELECT pdf FROM pdfs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pdfs SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return bytes(row[0])
+
+    def set(self, resume_data, template, pdf_bytes):
+        """Store a PDF and evict least-recently-used ones over the size cap"""
+        key = self.make_key(resume_data, template)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pdfs (key, pdf, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, pdf_bytes, len(pdf_bytes), time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pdfs").fetchone()[0]
+        while total > self.max_bytes:
+            key, size = self._conn.execute(
+                "SELECT key, size FROM pdfs ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM pdfs WHERE key = ?", (key,))
+            total -= size
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pdfs").fetchone()[0]
+
+
+_pdf_cache = None
+_pdf_cache_lock = threading.Lock()
+
+
+def get_pdf_cache(path=PDF_CACHE_FILE):
+    """Open the PDF cache once per process"""
+    global _pdf_cache
+    with _pdf_cache_lock:
+        if _pdf_cache is None:
+            _pdf_cache = ResumePDFCache(path)
+    return _pdf_cache
+
+
+class ProfessionalResumeBuilder:
+    def __init__(self, pdf_cache=None):
+        self.styles = shared_styles()
+        self.pdf_cache = pdf_cache
+
+    def _cache(self):
+        return self.pdf_cache if self.pdf_cache is not None else get_pdf_cache()
 
-        for name, params in style_definitions.items():
-            if not hasattr(self.styles, name):
-                self.styles.add(ParagraphStyle(name=name, **params))
-            else:
-                # Update existing style
-                for param, value in params.items():
-                    setattr(self.styles[name], param, value)
+    def cached_resume_pdf(self, resume_data, template="modern"):
+        """Previously generated PDF bytes for this exact resume and template, or None"""
+        return self._cache().get(resume_data, template)
 
     def create_resume_pdf(self, resume_data, template="modern"):
         """Create professional resume PDF based on template"""
+        cache = self._cache()
+        pdf_bytes = cache.get(resume_data, template)
+        if pdf_bytes is None:
+            pdf_bytes = self.build_pdf(resume_data, template)
+            cache.set(resume_data, template, pdf_bytes)
+        
+        return BytesIO(pdf_bytes)
+
+    def build_pdf(self, resume_data, template="modern"):
+        """Render PDF bytes without consulting or filling the PDF cache"""
         buffer = BytesIO()
         
         if template == "modern":
-            doc = self._create_modern_resume(buffer, resume_data)
+            self._create_modern_resume(buffer, resume_data)
         elif template == "classic":
-            doc = self._create_classic_resume(buffer, resume_data)
+            self._create_classic_resume(buffer, resume_data)
         else:
-            doc = self._create_executive_resume(buffer, resume_data)
+            self._create_executive_resume(buffer, resume_data)
         
-        buffer.seek(0)
-        return buffer
+        return buffer.getvalue()
 
     def _create_modern_resume(self, buffer, resume_data):
         """Modern clean layout with subtle colors"""
@@ -108,15 +266,7 @@ class ProfessionalResumeBuilder:
             [resume_data['email'], resume_data['phone']]
         ], colWidths=[4*inch, 2*inch])
         
-        header_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LINEBELOW', (0, 0), (0, 0), 1, colors.HexColor("#2E5D9E")),
-            ('FONTSIZE', (0, 0), (0, 0), 16),
-            ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-            ('TEXTCOLOR', (0, 0), (0, 0), colors.HexColor("#2E5D9E")),
-            ('FONTSIZE', (0, 1), (-1, -1), 10)
-        ]))
+        header_table.setStyle(MODERN_HEADER_STYLE)
         
         elements.append(header_table)
         elements.append(Spacer(1, 0.25*inch))
@@ -141,10 +291,7 @@ class ProfessionalResumeBuilder:
                     [Paragraph(exp['company'], self.styles['Company']), ""]
                 ], colWidths=[4*inch, 2*inch])
                 
-                job_header.setStyle(TableStyle([
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('ALIGN', (1, 0), (1, 0), 'RIGHT')
-                ]))
+                job_header.setStyle(ENTRY_HEADER_STYLE)
                 
                 elements.append(job_header)
                 
@@ -170,10 +317,7 @@ class ProfessionalResumeBuilder:
                     [Paragraph(edu['institution'], self.styles['Company']), ""]
                 ], colWidths=[4*inch, 2*inch])
                 
-                edu_table.setStyle(TableStyle([
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('ALIGN', (1, 0), (1, 0), 'RIGHT')
-                ]))
+                edu_table.setStyle(ENTRY_HEADER_STYLE)
                 
                 elements.append(edu_table)
                 elements.append(Spacer(1, 0.1*inch))
@@ -187,13 +331,7 @@ class ProfessionalResumeBuilder:
             skill_rows = [skills[i:i+3] for i in range(0, len(skills), 3)]
             
             skill_table = Table(skill_rows, colWidths=[2*inch, 2*inch, 2*inch])
-            skill_table.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('LEADING', (0, 0), (-1, -1), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 4)
-            ]))
+            skill_table.setStyle(MODERN_SKILLS_STYLE)
             
             elements.append(skill_table)
         
@@ -229,12 +367,7 @@ class ProfessionalResumeBuilder:
             ]
         ], colWidths=[3.5*inch, 2.5*inch])
         
-        two_col.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('LEFTPADDING', (0, 0), (0, 0), 0),
-            ('RIGHTPADDING', (1, 0), (1, 0), 0)
-        ]))
+        two_col.setStyle(CLASSIC_COLUMNS_STYLE)
         
         elements.append(two_col)
         doc.build(elements)
@@ -317,12 +450,7 @@ class ProfessionalResumeBuilder:
             ]
         ], colWidths=[7*inch], rowHeights=[0.5*inch])
         
-        header_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor("#2E5D9E")),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor("#2E5D9E"))
-        ]))
+        header_table.setStyle(EXECUTIVE_HEADER_STYLE)
         
         elements.append(header_table)
         elements.append(Spacer(1, 0.2*inch))
@@ -353,10 +481,7 @@ class ProfessionalResumeBuilder:
             skill_table = Table([skills[i:i+2] for i in range(0, len(skills), 2)], 
                               colWidths=[3.5*inch, 3.5*inch])
             
-            skill_table.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('LEADING', (0, 0), (-1, -1), 14)
-            ]))
+            skill_table.setStyle(EXECUTIVE_SKILLS_STYLE)
             
             elements.append(skill_table)
             elements.append(Spacer(1, 0.2*inch))
@@ -415,4 +540,128 @@ class ProfessionalResumeBuilder:
         """Create a download button for the resume"""
         b64 = base64.b64encode(pdf_bytes.getvalue()).decode()
         href = f'<a href="data:application/pdf;base64,{b64}" download="{file_name}">Download Resume</a>'
-        st.markdown(href, unsafe_allow_html=True)
\ No newline at end of file
+        st.markdown(href, unsafe_allow_html=True)
+
+
+def render_resume_pdf(resume_data, template="modern"):
+    """PDF bytes for a resume; a module-level function so it can run in a worker process"""
+    return ProfessionalResumeBuilder().create_resume_pdf(resume_data, template=template).getvalue()
+
+
+@lru_cache(maxsize=8192)
+def _word_width(word, font_name, font_size):
+    # Resumes repeat most of their words, and stringWidth is pure Python without reportlab's C accelerator
+    return stringWidth(word, font_name, font_size)
+
+
+def wrap_text(text, font_name, font_size, max_width):
+    """
+    Greedy line wrapping by measured string width rather than character
+    count. Words wider than a whole line are broken across lines.
+    """
+    space = _word_width(" ", font_name, font_size)
+    lines, line, width = [], [], 0.0
+    for word in text.split():
+        word_width = _word_width(word, font_name, font_size)
+        while word_width > max_width:
+            # Break an over-long word (a URL, say) at the last character that fits
+            cut = next((i for i in range(len(word) - 1, 1, -1)
+                        if stringWidth(word[:i], font_name, font_size) <= max_width), 1)
+            if line:
+                lines.append(" ".join(line))
+                line, width = [], 0.0
+            lines.append(word[:cut])
+            word = word[cut:]
+            word_width = _word_width(word, font_name, font_size)
+        if not word:
+            continue
+        if line and width + space + word_width > max_width:
+            lines.append(" ".join(line))
+            line, width = [], 0.0
+        width += (space if line else 0.0) + word_width
+        line.append(word)
+    if line:
+        lines.append(" ".join(line))
+    return lines
+
+
+class _PagedCanvas:
+    """Draws lines top to bottom on a canvas, starting a new page when one is full"""
+
+    def __init__(self, buffer, pagesize=letter, margin=PLAIN_RESUME_MARGIN, top=PLAIN_RESUME_TOP):
+        self.canvas = canvas.Canvas(buffer, pagesize=pagesize)
+        self.margin = margin
+        self.top = top
+        self.width = pagesize[0] - 2 * margin
+        self.y = top
+
+    def ensure(self, height):
+        if self.y - height < self.margin:
+            self.canvas.showPage()
+            self.y = self.top
+
+    def line(self, text, font_name, font_size, advance):
+        self.ensure(font_size)
+        # Fonts reset with each new page, so set one per line
+        self.canvas.setFont(font_name, font_size)
+        self.canvas.drawString(self.margin, self.y, text)
+        self.y -= advance
+
+    def paragraph(self, text, font_name, font_size, advance):
+        """Wrap each line of text to the page width; blank lines are dropped"""
+        for source_line in text.splitlines():
+            for line in wrap_text(source_line, font_name, font_size, self.width):
+                self.line(line, font_name, font_size, advance)
+
+    def heading(self, text):
+        # Keep a heading on the same page as the first line under it
+        self.ensure(20 + 15 + 12)
+        self.line(text, "Helvetica-Bold", 14, 20)
+
+    def gap(self, amount):
+        self.y -= amount
+
+    def save(self):
+        self.canvas.save()
+
+
+def create_pdf_resume(user_data):
+    """
+    Plain single-column resume drawn straight onto a canvas in one pass,
+    wrapped by font metrics and continued onto as many pages as it needs.
+    Returns PDF bytes.
+    """
+    buffer = BytesIO()
+    pages = _PagedCanvas(buffer)
+
+    # Personal Information
+    pages.line(user_data['name'], "Helvetica-Bold", 16, 20)
+    pages.line(user_data['email'], "Helvetica", 12, 15)
+    pages.line(user_data['phone'], "Helvetica", 12, 15)
+    pages.gap(15)
+
+    # Summary
+    pages.heading("Professional Summary")
+    pages.paragraph(user_data['summary'], "Helvetica", 12, 15)
+    pages.gap(15)
+
+    # Experience
+    pages.heading("Work Experience")
+    for exp in user_data['experience']:
+        pages.ensure(15 + 15 + 12)
+        pages.paragraph(f"{exp['title']} at {exp['company']}", "Helvetica-Bold", 12, 15)
+        pages.line(f"{exp['start']} - {exp['end']}", "Helvetica-Oblique", 10, 15)
+        pages.paragraph(exp['description'], "Helvetica", 12, 15)
+        pages.gap(10)
+
+    # Education
+    pages.heading("Education")
+    for edu in user_data['education']:
+        pages.paragraph(f"{edu['degree']}, {edu['institution']} ({edu['year']})", "Helvetica", 12, 15)
+
+    # Skills
+    pages.heading("Skills")
+    pages.paragraph(', '.join(user_data['skills']), "Helvetica", 12, 15)
+
+    pages.save()
+    return buffer.getvalue()
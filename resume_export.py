@@ -0,0 +1,154 @@
+"""
+Bulk resume PDF export.
+
+Renders many resume_data records, in one or more templates, across a pool
+of worker processes and streams the PDFs into a ZIP archive on disk.
+
+Usage: python resume_export.py RESUMES OUTPUT.zip [--templates modern classic] [--workers N]
+
+RESUMES is a JSON list of resume_data records, or a .jsonl file with one
+record per line (read lazily, so arbitrarily large inputs are fine).
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+# Constants
+DEFAULT_TEMPLATES = ("modern",)
+EXPORT_CHUNK_SIZE = 8  # resumes per task, to amortize inter-process overhead
+CHUNKS_IN_FLIGHT_PER_WORKER = 2  # bounds how many rendered PDFs wait in memory
+MAX_NAME_LENGTH = 60
+
+_builder = None
+
+
+def _worker_builder():
+    global _builder
+    if _builder is None:
+        from resume_builder import ProfessionalResumeBuilder
+        _builder = ProfessionalResumeBuilder()
+    return _builder
+
+
+def _render_chunk(chunk):
+    """Worker: [(arcname, resume_data, template)] -> [(arcname, pdf bytes or None, error or None)]"""
+    builder = _worker_builder()
+    rendered = []
+    for arcname, resume_data, template in chunk:
+        try:
+            rendered.append((arcname, builder.build_pdf(resume_data, template), None))
+        except Exception as e:
+            rendered.append((arcname, None, f"{type(e).__name__}: {e}"))
+    return rendered
+
+
+def archive_name(index, resume_data, template):
+    name = re.sub(r"[^\w.-]+", "_", str(resume_data.get("name") or "resume")).strip("_.")
+    return f"{index:05d}_{name[:MAX_NAME_LENGTH] or 'resume'}_{template}.pdf"
+
+
+def _export_items(records, templates):
+    for index, resume_data in enumerate(records, 1):
+        for template in templates:
+            yield archive_name(index, resume_data, template), resume_data, template
+
+
+def _chunks(items, size):
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_resumes_zip(records, zip_path, templates=DEFAULT_TEMPLATES, max_workers=None,
+                       chunk_size=EXPORT_CHUNK_SIZE, on_progress=None):
+    """
+    Render every record in every template into the ZIP at zip_path.
+    `records` may be any iterable and is consumed lazily; only a bounded
+    number of chunks are queued or held in memory at once, and each PDF is
+    written to the archive as soon as its chunk finishes. The archive is
+    built under a temporary name and moved into place when complete.
+    on_progress(done) is called after each chunk with the number of PDFs
+    attempted so far. Returns {"written": count, "errors": {arcname: message}}.
+
+    Worker processes re-import __main__ when the platform spawns them, so
+    call this from a script or the task queue, not from app.py itself.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = _chunks(_export_items(records, templates), chunk_size)
+    written, errors = 0, {}
+    partial_path = f"{zip_path}.part"
+    try:
+        # PDF page streams are already compressed, so deflating again only costs time
+        with zipfile.ZipFile(partial_path, "w", zipfile.ZIP_STORED) as archive, \
+                ProcessPoolExecutor(max_workers=max_workers) as pool:
+            pending = set()
+
+            def refill():
+                while len(pending) < max_workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        return
+                    pending.add(pool.submit(_render_chunk, chunk))
+
+            refill()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for arcname, pdf_bytes, error in future.result():
+                        if error is None:
+                            archive.writestr(arcname, pdf_bytes)
+                            written += 1
+                        else:
+                            errors[arcname] = error
+                refill()
+                if on_progress:
+                    on_progress(written + len(errors))
+        os.replace(partial_path, zip_path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    return {"written": written, "errors": errors}
+
+
+def iter_resume_records(path):
+    """Resume records from a JSON list, or lazily from a .jsonl file"""
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export resume PDFs in bulk into a ZIP archive")
+    parser.add_argument("resumes", help="JSON list or .jsonl file of resume_data records")
+    parser.add_argument("output", help="ZIP file to write")
+    parser.add_argument("--templates", nargs="+", default=list(DEFAULT_TEMPLATES),
+                        choices=["modern", "classic", "executive"])
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = export_resumes_zip(iter_resume_records(args.resumes), args.output,
+                                 templates=args.templates, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {summary['written']} PDFs to {args.output} in {elapsed:.1f} s")
+    for arcname, error in summary["errors"].items():
+        print(f"  failed {arcname}: {error}", file=sys.stderr)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+import re
+
+from skill_taxonomy import get_skill_matcher
+
+# Constants
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "career summary", "executive summary"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience"],
+    "education": ["education", "education & qualifications", "education and qualifications",
+                  "academic background", "qualifications", "education and training"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies",
+               "skills & competencies", "skills and competencies", "core skills", "technologies",
+               "tools & technologies", "areas of expertise"],
+    "other": ["projects", "personal projects", "certifications", "certificates", "awards",
+              "achievements", "publications", "interests", "hobbies", "references", "languages",
+              "volunteering", "volunteer experience", "activities"],
+}
+# Words that make a short, heading-styled line a heading for that section
+SECTION_KEYWORDS = {
+    "summary": "summary", "profile": "summary", "objective": "summary",
+    "experience": "experience", "employment": "experience",
+    "education": "education", "qualifications": "education",
+    "skills": "skills", "competencies": "skills", "expertise": "skills",
+    "projects": "other", "certifications": "other", "awards": "other", "interests": "other",
+    "references": "other", "publications": "other",
+}
+HEADING_MAX_WORDS = 5
+HEADING_MIN_SCORE = 3
+MAX_SKILL_WORDS = 5
+DEGREE_WORDS = {"bachelor", "bachelors", "master", "masters", "bsc", "ba", "bs", "msc", "ma", "ms",
+                "mba", "phd", "doctor", "doctorate", "diploma", "certificate", "associate", "beng",
+                "meng", "bcom", "llb", "degree", "hsc", "gcse", "a-levels", "honours", "honors"}
+INSTITUTION_WORDS = {"university", "college", "institute", "school", "academy", "polytechnic",
+                     "tafe", "conservatory", "universidad", "universität", "école"}
+
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+_DATE = rf"(?:{_MONTH}\s+(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}}|(?:19|20)\d{{2}})"
+DATE_RANGE_RE = re.compile(
+    rf"\(?\s*(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*"
+    rf"(?P<end>{_DATE}|present|current|now|today|ongoing)\s*\)?",
+    re.IGNORECASE
+)
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\(?\d[\d\s().-]{6,}\d(?![\w/])")
+URL_RE = re.compile(r"(?:https?://|www\.)\S+|\b(?:linkedin|github)\.com/\S*", re.IGNORECASE)
+CONTACT_LABEL_RE = re.compile(r"\b(?:e-?mail|phone|mobile|tel|cell|address|linkedin|github)\s*:\s*",
+                              re.IGNORECASE)
+# Bullet glyphs from symbol fonts often extract as control or private-use characters
+BULLET_RE = re.compile(r"^\s*(?:[•●○◦▪■□‣∙·⁃*–\x7f\uf0a7\uf0b7\uf076\uf0d8-]|\d{1,2}[.)])\s*|^\s+")
+FIELD_SPLIT_RE = re.compile(r"\s+[|•·@]\s+|\s+(?:at|-|–|—)\s+|,\s+")
+EMPTY_PARENS_RE = re.compile(r"\(\s*\)")
+SKILL_SPLIT_RE = re.compile(r"\s*[,;|•●·▪■/]\s*|\s{2,}")
+_HEADING_INDEX = {phrase: section for section, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+
+
+def _normalize_heading(line):
+    line = line.lower().replace("&", " and ").strip(" :.-–—\t")
+    return " ".join(line.split()).replace(" and ", " & ") if line else ""
+
+
+def heading_section(line):
+    """
+    The section a line is the heading of, or None. Known headings match
+    directly; otherwise a short line is scored on heading cues (capitals,
+    a trailing colon, ending in a section keyword) so variants like
+    "RELEVANT WORK HISTORY:" are still recognised.
+    """
+    stripped = line.strip()
+    words = stripped.rstrip(":").split()
+    if not words or len(words) > HEADING_MAX_WORDS or BULLET_RE.match(stripped):
+        return None
+    normalized = _normalize_heading(stripped)
+    section = _HEADING_INDEX.get(normalized) or _HEADING_INDEX.get(normalized.replace(" & ", " and "))
+    if section:
+        return section
+    keyword = SECTION_KEYWORDS.get(words[-1].lower().strip(":"))
+    if keyword is None:
+        return None
+    score = 1
+    letters = [c for c in stripped if c.isalpha()]
+    if letters and all(c.isupper() for c in letters):
+        score += 2
+    if stripped.endswith(":"):
+        score += 2
+    if all(word[:1].isupper() or word in {"&", "and", "of"} for word in words):
+        score += 1
+    if any(c.isdigit() for c in stripped) or EMAIL_RE.search(stripped):
+        score -= 3
+    return keyword if score >= HEADING_MIN_SCORE else None
+
+
+def split_sections(text):
+    """{"header": [lines], "summary": [...], ...}; lines before the first heading are the header"""
+    sections = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        section = heading_section(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+    return sections
+
+
+def _is_bullet(line):
+    return bool(BULLET_RE.match(line))
+
+
+def _strip_bullet(line):
+    return BULLET_RE.sub("", line, count=1).strip()
+
+
+def _join_wrapped(lines):
+    """Join lines of a paragraph that PDF extraction wrapped"""
+    return " ".join(line.strip() for line in lines if line.strip())
+
+
+def parse_contact(header_lines):
+    """(name, email, phone, remaining header lines)"""
+    name = email = phone = ""
+    rest = []
+    for line in header_lines:
+        text = CONTACT_LABEL_RE.sub("", URL_RE.sub(" ", line))
+        found_email = EMAIL_RE.search(text)
+        if found_email and not email:
+            email = found_email.group()
+        text = EMAIL_RE.sub(" ", text)
+        found_phone = PHONE_RE.search(text)
+        if found_phone and not phone and len(re.sub(r"\D", "", found_phone.group())) >= 8:
+            phone = found_phone.group().strip()
+            text = text.replace(found_phone.group(), " ")
+        text = " ".join(text.replace("|", " ").split())
+        if not text or found_email or found_phone:
+            continue
+        words = text.split()
+        if not name and 1 < len(words) <= 5 and not any(c.isdigit() for c in text):
+            name = text
+        else:
+            rest.append(line.strip())
+    return name, email, phone, rest
+
+
+def _header_fields(lines):
+    """Split an entry's non-date header lines into distinct fields, e.g. title and company"""
+    fields = []
+    for line in lines:
+        fields.extend(part.strip(" ,|") for part in FIELD_SPLIT_RE.split(line) if part.strip(" ,|"))
+    return fields
+
+
+def _entry_blocks(lines):
+    """
+    Group section lines into (header lines, description lines) entries. A
+    date range, or a plain line right before one, starts the next entry
+    once the current one has a description; in sections without dates, a
+    capitalized plain line after the description does.
+    """
+    bullets = [_is_bullet(line) for line in lines]
+    dated = [bool(DATE_RANGE_RE.search(line)) and len(_strip_bullet(line).split()) <= 12 for line in lines]
+    any_dates = any(dated)
+
+    def date_follows(i):
+        for k in range(i + 1, min(i + 3, len(lines))):
+            if bullets[k]:
+                return False
+            if dated[k]:
+                return True
+        return False
+
+    blocks = []
+    header, description, has_date = [], [], False
+    for i, line in enumerate(lines):
+        if dated[i]:
+            starts_entry = has_date or bool(description)
+        elif bullets[i] or not description:
+            starts_entry = False
+        else:
+            starts_entry = date_follows(i) if any_dates else line.strip()[:1].isupper()
+        if starts_entry:
+            blocks.append((header, description))
+            header, description, has_date = [], [], False
+        if bullets[i] or description or (len(header) >= 3 and not dated[i]):
+            description.append(line)
+        else:
+            header.append(line)
+            has_date = has_date or dated[i]
+    if header or description:
+        blocks.append((header, description))
+    return blocks
+
+
+def _description_text(lines):
+    """Bullets one per line, with wrapped continuation lines folded back in"""
+    items = []
+    for line in lines:
+        if _is_bullet(line) or not items or line.strip()[:1].isupper() and items[-1].endswith("."):
+            items.append(_strip_bullet(line))
+        else:
+            items[-1] = f"{items[-1]} {line.strip()}"
+    return "\n".join(item for item in items if item)
+
+
+def parse_experience(lines):
+    entries = []
+    for header, description in _entry_blocks(lines):
+        start = end = ""
+        remaining = []
+        for line in header:
+            found = DATE_RANGE_RE.search(line)
+            if found and not start:
+                start, end = found.group("start"), found.group("end")
+                line = DATE_RANGE_RE.sub(" ", line, count=1)
+            if line.strip(" |,-–—"):
+                remaining.append(line.strip())
+        fields = _header_fields(remaining)
+        if not fields and not description:
+            continue
+        entries.append({
+            "title": fields[0] if fields else "",
+            "company": fields[1] if len(fields) > 1 else "",
+            "start": start,
+            "end": end,
+            "description": _description_text(description),
+        })
+    return entries
+
+
+def _strip_unbalanced(part):
+    """Trim spaces and any parentheses left unpaired by splitting a line"""
+    part = part.strip()
+    if part.startswith("(") and ")" not in part:
+        part = part[1:]
+    if part.endswith(")") and "(" not in part:
+        part = part[:-1]
+    return part.strip(" ,|")
+
+
+def _classify_education_part(part):
+    words = set(re.findall(r"[a-zà-ÿ-]+", part.lower().replace(".", "")))
+    if words & INSTITUTION_WORDS:
+        return "institution"
+    if words & DEGREE_WORDS or re.match(r"^[A-Z]\.?[A-Z][a-z]*\.?\s", part):
+        return "degree"
+    return None
+
+
+def parse_education(lines):
+    # (field or None if unknown, text, line number) for every part of every line
+    parts = []
+    for number, line in enumerate(lines):
+        text = _strip_bullet(line)
+        found_range = DATE_RANGE_RE.search(text)
+        years = YEAR_RE.findall(found_range.group("end") if found_range else text)
+        text = DATE_RANGE_RE.sub(" ", text) if found_range else YEAR_RE.sub(" ", text)
+        text = EMPTY_PARENS_RE.sub(" ", text)
+        for part in FIELD_SPLIT_RE.split(text):
+            if part.strip(" ()|,"):
+                part = _strip_unbalanced(part)
+                parts.append((_classify_education_part(part), part, number))
+        if years:
+            parts.append(("year", years[-1], number))
+
+    entries = []
+    current = None
+    previous = None  # (field, line number) of the last part placed
+    for i, (field, value, number) in enumerate(parts):
+        if current is None:
+            current = {"degree": "", "institution": "", "year": ""}
+        if field is None:
+            alone = all(other[2] != number for other in parts[:i] + parts[i + 1:])
+            following = next((other[0] for other in parts[i + 1:] if other[0]), None)
+            # A line wrapped in a narrow column continues the field above it
+            if alone and previous and previous[1] == number - 1 and (
+                    previous[0] == "institution" or (previous[0] == "degree" and following == "institution")):
+                current[previous[0]] = f"{current[previous[0]]} {value}"
+                continue
+            field = "degree" if not current["degree"] else "institution"
+        if current[field]:
+            entries.append(current)
+            current = {"degree": "", "institution": "", "year": ""}
+        current[field] = value
+        previous = (field, number)
+    if current:
+        entries.append(current)
+    return [entry for entry in entries if entry["degree"] or entry["institution"]]
+
+
+def parse_skills(skill_lines, full_text):
+    """
+    Skills as listed in the skills section, canonicalized where the
+    taxonomy knows them, then any further taxonomy skills mentioned
+    elsewhere in the resume.
+    """
+    matcher = get_skill_matcher()
+    skills = {}
+    for line in skill_lines:
+        line = _strip_bullet(line)
+        # "Languages: Python, Go" lists skills under a category label
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for item in SKILL_SPLIT_RE.split(line):
+            item = item.strip(" .()")
+            if not item or len(item.split()) > MAX_SKILL_WORDS:
+                continue
+            canonical = matcher.canonical(item)
+            if canonical:
+                skills.setdefault(canonical.lower(), canonical)
+            else:
+                for found in matcher.find(item, include_ambiguous=True) or [item]:
+                    skills.setdefault(found.lower(), found)
+    for found in matcher.find(full_text):
+        skills.setdefault(found.lower(), found)
+    return list(skills.values())
+
+
+def parse_resume_text(text):
+    """Structure extracted resume text into the app's resume_data layout"""
+    sections = split_sections(text)
+    name, email, phone, header_rest = parse_contact(sections["header"])
+    summary_lines = sections.get("summary") or [line for line in header_rest if len(line.split()) >= 8]
+    return {
+        "name": name,
+        "email": email,
+        "phone": phone,
+        "summary": _join_wrapped(summary_lines),
+        "experience": parse_experience(sections.get("experience", [])),
+        "education": parse_education(sections.get("education", [])),
+        "skills": parse_skills(sections.get("skills", []), text),
+    }
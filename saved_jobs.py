@@ -1,87 +1,467 @@
 import json
+import os
+import re
+import hashlib
+import tempfile
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 import pytz
 import streamlit as st
+from job_identity import JobIndex, make_job_id
+from search_index import BM25Index
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
 
 # Constants
 SAVED_JOBS_FILE = "saved_jobs.json"
+SAVED_JOBS_DIR = "saved_jobs_data"  # per-user partitions
+CHANGE_LOG_SUFFIX = ".log"
+LOCK_SUFFIX = ".lock"
+COMPACT_AFTER_ENTRIES = 500  # fold the change log into the snapshot after this many mutations
+SMALL_FILTER_RATIO = 16  # filters matching under 1/16 of jobs are sorted directly
+SORT_KEYS = {
+    "saved_at": lambda saved_job: saved_job.get("saved_at", ""),
+    "title": lambda saved_job: saved_job["job"].get("title", "").lower(),
+    "company": lambda saved_job: saved_job["job"].get("company_name", "").lower(),
+}
+
+
+def user_jobs_file(user_id):
+    """Path of a user's saved-jobs partition; anonymous sessions share the original file"""
+    if not user_id:
+        return SAVED_JOBS_FILE
+    user_id = str(user_id)
+    safe_name = re.sub(r"[^A-Za-z0-9_-]", "_", user_id)[:40]
+    digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(SAVED_JOBS_DIR, f"{safe_name}_{digest}.json")
+
+
+class JobListing:
+    """
+    Secondary indexes for the Saved Jobs tab: job IDs grouped by status and
+    by company, and kept in sorted order for each of SORT_KEYS, so a page of
+    a filtered, sorted listing is read without visiting every saved job.
+    """
+    
+    def __init__(self, saved_jobs):
+        self.by_status = defaultdict(set)
+        self.by_company = defaultdict(set)
+        self.sort_values = {name: {} for name in SORT_KEYS}
+        for job_id, saved_job in saved_jobs.items():
+            self._group(job_id, saved_job)
+            for name, key in SORT_KEYS.items():
+                self.sort_values[name][job_id] = key(saved_job)
+        self.orders = {name: sorted((value, job_id) for job_id, value in values.items())
+                       for name, values in self.sort_values.items()}
+    
+    def _group(self, job_id, saved_job):
+        self.by_status[saved_job["application_status"]].add(job_id)
+        self.by_company[saved_job["job"].get("company_name", "")].add(job_id)
+    
+    @staticmethod
+    def _discard(groups, value, job_id):
+        members = groups.get(value)
+        if members is not None:
+            members.discard(job_id)
+            if not members:
+                del groups[value]
+    
+    def add(self, job_id, saved_job):
+        self._group(job_id, saved_job)
+        for name, key in SORT_KEYS.items():
+            value = key(saved_job)
+            self.sort_values[name][job_id] = value
+            insort(self.orders[name], (value, job_id))
+    
+    def remove(self, job_id, saved_job):
+        self._discard(self.by_status, saved_job["application_status"], job_id)
+        self._discard(self.by_company, saved_job["job"].get("company_name", ""), job_id)
+        for name in SORT_KEYS:
+            order = self.orders[name]
+            entry = (self.sort_values[name].pop(job_id, None), job_id)
+            position = bisect_left(order, entry)
+            if position < len(order) and order[position] == entry:
+                del order[position]
+    
+    def set_status(self, job_id, old_status, new_status):
+        self._discard(self.by_status, old_status, job_id)
+        self.by_status[new_status].add(job_id)
+    
+    def matching(self, status=None, company=None):
+        """IDs of jobs with this status and company, or None when neither filter is set"""
+        candidates = None
+        for groups, value in ((self.by_status, status), (self.by_company, company)):
+            if value:
+                members = groups.get(value, set())
+                candidates = members if candidates is None else candidates & members
+        return candidates
+    
+    def query(self, status=None, company=None, sort_by="saved_at", descending=True,
+              offset=0, limit=20):
+        """(job IDs for one page, total matches)"""
+        candidates = self.matching(status, company)
+        order = self.orders[sort_by]
+        if candidates is None:
+            total = len(order)
+            if descending:
+                page = order[max(total - offset - limit, 0):max(total - offset, 0)][::-1]
+            else:
+                page = order[offset:offset + limit]
+            return [job_id for _, job_id in page], total
+        
+        if len(candidates) * SMALL_FILTER_RATIO < len(order):
+            # Few matches: sorting them directly beats walking the whole order
+            values = self.sort_values[sort_by]
+            ranked = sorted(candidates, key=lambda job_id: (values[job_id], job_id), reverse=descending)
+            return ranked[offset:offset + limit], len(candidates)
+        
+        # Walk the sorted order and keep matching IDs until the page is full
+        ids = []
+        matched = 0
+        for _, job_id in (reversed(order) if descending else order):
+            if job_id in candidates:
+                if matched >= offset:
+                    ids.append(job_id)
+                    if len(ids) == limit:
+                        break
+                matched += 1
+        return ids, len(candidates)
+
 
 class SavedJobsManager:
-    def __init__(self):
-        self.saved_jobs = self._load_saved_jobs()
+    """
+    Saved jobs are persisted as a JSON snapshot plus an append-only change log.
+    Each mutation appends one line to the log instead of rewriting every job;
+    the log is folded back into the snapshot once it grows past
+    COMPACT_AFTER_ENTRIES.
+    
+    Writers take an exclusive file lock and readers a shared one, so several
+    processes can use the same partition. The in-memory copy is refreshed only
+    when the files on disk have changed since it was last read.
+    """
+    
+    _instances = {}
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, jobs_file=SAVED_JOBS_FILE):
+        self.jobs_file = jobs_file
+        self.log_file = jobs_file + CHANGE_LOG_SUFFIX
+        self.lock_file = jobs_file + LOCK_SUFFIX
+        directory = os.path.dirname(os.path.abspath(jobs_file))
+        os.makedirs(directory, exist_ok=True)
+        self._thread_lock = threading.RLock()
+        self._log_entries = 0
+        self._log_offset = 0
+        self._snapshot_version = None
+        self._torn_log = False
+        self._index = None
+        self._listing = None
+        self._text_index = None
+        self._filter_masks = {}
+        with self._locked(exclusive=False):
+            self.saved_jobs = self._load_saved_jobs()
+    
+    @classmethod
+    def for_user(cls, user_id=None):
+        """Shared manager for a user's partition, one per process"""
+        jobs_file = user_jobs_file(user_id)
+        with cls._instances_lock:
+            if jobs_file not in cls._instances:
+                cls._instances[jobs_file] = cls(jobs_file)
+            return cls._instances[jobs_file]
+    
+    @contextmanager
+    def _locked(self, exclusive=True):
+        """Hold the in-process lock and an advisory lock on the partition's .lock file"""
+        with self._thread_lock:
+            with open(self.lock_file, "a") as lock:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+    
+    def _file_version(self, path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
     
     def _load_saved_jobs(self):
-        """Load saved jobs from JSON file"""
-        if Path(SAVED_JOBS_FILE).exists():
-            with open(SAVED_JOBS_FILE, "r") as f:
+        """Load saved jobs from the JSON snapshot and replay the change log"""
+        saved_jobs = {}
+        self._snapshot_version = self._file_version(self.jobs_file)
+        if self._snapshot_version:
+            with open(self.jobs_file, "r") as f:
                 saved_jobs = json.load(f)
-                # Add missing application_status to old entries
-                for job_id, job_data in saved_jobs.items():
-                    if 'application_status' not in job_data:
-                        job_data['application_status'] = "Not Applied"
-                return saved_jobs
-        return {}
-    
-    def _save_jobs(self):
-        """Save jobs to JSON file"""
-        with open(SAVED_JOBS_FILE, "w") as f:
+        
+        self._log_entries = 0
+        self._log_offset = 0
+        self._index = None
+        self._listing = None
+        self._text_index = None
+        self._filter_masks = {}
+        self._replay_log(saved_jobs)
+        # Add missing application_status to old entries
+        for job_id, job_data in saved_jobs.items():
+            if 'application_status' not in job_data:
+                job_data['application_status'] = "Not Applied"
+        return saved_jobs
+    
+    def _replay_log(self, saved_jobs):
+        """Apply logged mutations after the last position read"""
+        if not Path(self.log_file).exists():
+            return
+        with open(self.log_file, "rb") as f:
+            f.seek(self._log_offset)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete log line")
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash mid-append left a partial line; the next writer compacts it away
+                    self._torn_log = True
+                    return
+                self._apply(saved_jobs, entry)
+                # Rebuilt on next use since other writers' changes aren't tracked incrementally
+                self._index = None
+                self._listing = None
+                self._text_index = None
+                self._filter_masks = {}
+                self._log_offset += len(line)
+                self._log_entries += 1
+    
+    def _refresh(self):
+        """Bring the in-memory copy up to date with changes made by other processes"""
+        log_version = self._file_version(self.log_file)
+        log_size = log_version[2] if log_version else 0
+        if self._file_version(self.jobs_file) != self._snapshot_version or log_size < self._log_offset:
+            # Another writer compacted; start over from the new snapshot
+            self.saved_jobs = self._load_saved_jobs()
+        elif log_size > self._log_offset:
+            self._replay_log(self.saved_jobs)
+    
+    @contextmanager
+    def _reading(self):
+        with self._locked(exclusive=False):
+            self._refresh()
+            yield
+    
+    @contextmanager
+    def _writing(self):
+        with self._locked(exclusive=True):
+            self._refresh()
+            if self._torn_log:
+                self._compact()
+            yield
+    
+    @staticmethod
+    def _apply(saved_jobs, entry):
+        op, job_id = entry["op"], entry["id"]
+        if op == "put":
+            saved_jobs[job_id] = entry["data"]
+        elif op == "delete":
+            saved_jobs.pop(job_id, None)
+        elif op == "update" and job_id in saved_jobs:
+            saved_jobs[job_id].update(entry["fields"])
+    
+    def _append_log(self, entry):
+        """Append one mutation to the change log, compacting when it gets long"""
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        # Every mutation passes through here; filter masks address search-index slots
+        self._filter_masks = {}
+        with open(self.log_file, "ab") as f:
+            f.write(line)
+        self._log_offset += len(line)
+        self._log_entries += 1
+        if self._log_entries >= COMPACT_AFTER_ENTRIES:
+            self._compact()
+    
+    def _compact(self):
+        """Atomically write a fresh snapshot, then clear the change log"""
+        directory = os.path.dirname(os.path.abspath(self.jobs_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
             json.dump(self.saved_jobs, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.jobs_file)
+        # The snapshot now contains every logged change
+        open(self.log_file, "w").close()
+        self._snapshot_version = self._file_version(self.jobs_file)
+        self._log_entries = 0
+        self._log_offset = 0
+        self._torn_log = False
+    
+    def _job_index(self):
+        """Identity index over saved jobs, built on first use after a (re)load"""
+        if self._index is None:
+            self._index = JobIndex()
+            for job_id, saved_job in self.saved_jobs.items():
+                self._index.add(job_id, saved_job["job"])
+        return self._index
+    
+    def _job_listing(self):
+        """Status/company/sort indexes over saved jobs, built on first use after a (re)load"""
+        if self._listing is None:
+            self._listing = JobListing(self.saved_jobs)
+        return self._listing
+    
+    @staticmethod
+    def _search_fields(saved_job):
+        return {**saved_job["job"], "notes": saved_job.get("notes", "")}
+    
+    def _search_index(self):
+        """BM25 index over job text and notes, built on first search after a (re)load"""
+        if self._text_index is None:
+            self._text_index = BM25Index()
+            for job_id, saved_job in self.saved_jobs.items():
+                self._text_index.add(job_id, self._search_fields(saved_job))
+        return self._text_index
+    
+    def _filter_mask(self, status, company):
+        """Search-index mask for a status/company filter, reused until the next mutation"""
+        key = (status, company)
+        if key not in self._filter_masks:
+            ids = self._job_listing().matching(status, company)
+            self._filter_masks[key] = None if ids is None else self._search_index().mask(ids)
+        return self._filter_masks[key]
+    
+    def find_saved_job(self, job):
+        """ID of the saved copy of this posting (or a near-duplicate of it), or None"""
+        with self._reading():
+            return self._job_index().find(job)
     
     def save_job(self, job):
-        """Save a job to the collection"""
-        job_id = f"{job.get('title', '')}_{job.get('company_name', '')}".replace(" ", "_")
-        self.saved_jobs[job_id] = {
-            "job": job,
-            "saved_at": datetime.now(pytz.utc).isoformat(),
-            "notes": "",
-            "application_status": "Not Applied"
-        }
-        self._save_jobs()
+        """Save a job to the collection; saving a job that's already saved keeps its notes and status"""
+        with self._writing():
+            existing_id = self._job_index().find(job)
+            if existing_id is not None:
+                return existing_id
+            job_id = base_id = make_job_id(job)
+            # A different posting can share the key (same opening, different description)
+            suffix = 1
+            while job_id in self.saved_jobs:
+                suffix += 1
+                job_id = f"{base_id}_{suffix}"
+            listing = self._job_listing()
+            self.saved_jobs[job_id] = {
+                "job": job,
+                "saved_at": datetime.now(pytz.utc).isoformat(),
+                "notes": "",
+                "application_status": "Not Applied"
+            }
+            self._job_index().add(job_id, job)
+            listing.add(job_id, self.saved_jobs[job_id])
+            if self._text_index is not None:
+                self._text_index.add(job_id, self._search_fields(self.saved_jobs[job_id]))
+            self._append_log({"op": "put", "id": job_id, "data": self.saved_jobs[job_id]})
         return job_id
     
     def remove_job(self, job_id):
         """Remove a job from saved jobs"""
-        if job_id in self.saved_jobs:
-            del self.saved_jobs[job_id]
-            self._save_jobs()
-            return True
+        with self._writing():
+            if job_id in self.saved_jobs:
+                self._job_index().remove(job_id, self.saved_jobs[job_id]["job"])
+                self._job_listing().remove(job_id, self.saved_jobs[job_id])
+                if self._text_index is not None:
+                    self._text_index.remove(job_id)
+                del self.saved_jobs[job_id]
+                self._append_log({"op": "delete", "id": job_id})
+                return True
         return False
     
+    def _update_fields(self, job_id, **fields):
+        with self._writing():
+            if job_id not in self.saved_jobs:
+                return False
+            changed = {k: v for k, v in fields.items() if self.saved_jobs[job_id].get(k) != v}
+            if changed:
+                if "application_status" in changed:
+                    self._job_listing().set_status(job_id, self.saved_jobs[job_id]["application_status"],
+                                                   changed["application_status"])
+                self.saved_jobs[job_id].update(changed)
+                if "notes" in changed and self._text_index is not None:
+                    self._text_index.add(job_id, self._search_fields(self.saved_jobs[job_id]))
+                self._append_log({"op": "update", "id": job_id, "fields": changed})
+            return True
+    
     def update_job_notes(self, job_id, notes):
         """Update notes for a saved job"""
-        if job_id in self.saved_jobs:
-            self.saved_jobs[job_id]["notes"] = notes
-            self._save_jobs()
-            return True
-        return False
+        return self._update_fields(job_id, notes=notes)
     
     def update_application_status(self, job_id, status):
         """Update application status for a job"""
-        if job_id in self.saved_jobs:
-            self.saved_jobs[job_id]["application_status"] = status
-            self._save_jobs()
-            return True
-        return False
+        return self._update_fields(job_id, application_status=status)
+    
+    def save_cover_letter(self, job_id, cover_letter):
+        """Store a generated cover letter with its saved job"""
+        return self._update_fields(job_id, cover_letter=cover_letter,
+                                   cover_letter_at=datetime.now(pytz.utc).isoformat())
     
     def get_job(self, job_id):
         """Get a specific saved job"""
-        return self.saved_jobs.get(job_id)
+        with self._reading():
+            return self.saved_jobs.get(job_id)
     
     def get_all_jobs(self):
         """Get all saved jobs"""
-        return self.saved_jobs
+        with self._reading():
+            return dict(self.saved_jobs)
+    
+    def query_jobs(self, status=None, company=None, sort_by="saved_at", descending=True,
+                   page=1, page_size=20, text=None):
+        """
+        One page of saved jobs matching the filters, as ([(job_id, saved_job)], total matches).
+        With `text`, matches are ranked by BM25 relevance instead of `sort_by`.
+        """
+        offset = (page - 1) * page_size
+        with self._reading():
+            listing = self._job_listing()
+            if text and text.strip():
+                hits, total = self._search_index().search(text, limit=page_size, offset=offset,
+                                                          allowed=self._filter_mask(status, company))
+                ids = [job_id for job_id, _ in hits]
+            else:
+                ids, total = listing.query(status, company, sort_by, descending,
+                                           offset=offset, limit=page_size)
+            return [(job_id, self.saved_jobs[job_id]) for job_id in ids], total
+    
+    def search_jobs(self, text, limit=20):
+        """Saved jobs whose title, company, location, description or notes match `text`, best first"""
+        with self._reading():
+            hits, _ = self._search_index().search(text, limit=limit)
+            return [(job_id, self.saved_jobs[job_id], score) for job_id, score in hits]
+    
+    def filter_options(self):
+        """Statuses and companies present among saved jobs, for the tab's filter controls"""
+        with self._reading():
+            listing = self._job_listing()
+            return sorted(listing.by_status), sorted(listing.by_company, key=str.lower)
+    
+    def count(self):
+        """Number of saved jobs"""
+        with self._reading():
+            return len(self.saved_jobs)
     
     def apply_to_job(self, job_id, cover_letter=None):
         """
         Simulate applying to a job
         In a real app, this would integrate with job boards or company websites
         """
-        if job_id not in self.saved_jobs:
+        if not self.update_application_status(job_id, "Applied"):
             return False, "Job not found in saved jobs"
         
-        # Update application status
-        self.update_application_status(job_id, "Applied")
-        
-        job = self.saved_jobs[job_id]["job"]
+        job = self.get_job(job_id)["job"]
         return True, f"Application submitted for {job.get('title', '')} at {job.get('company_name', '')}"
\ No newline at end of file
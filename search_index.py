@@ -0,0 +1,159 @@
+import re
+from array import array
+from collections import Counter
+
+import numpy as np
+
+# Constants
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {"title": 3, "company_name": 2, "location": 1, "description": 1, "notes": 1}
+REBUILD_DEAD_FRACTION = 0.25  # compact postings once this share of slots belongs to removed docs
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "our", "that", "the", "this", "to", "we", "will", "with", "you", "your",
+}
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def tokenize(text):
+    """Lowercased word tokens without stopwords; keeps 'c++' and 'c#' intact"""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def weighted_terms(fields):
+    """Term frequencies for a document given as {field: text}, scaled by FIELD_WEIGHTS"""
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        tokens = _TOKEN_RE.findall((fields.get(field) or "").lower())
+        if weight == 1:
+            counts.update(tokens)
+        else:
+            for token in tokens:
+                counts[token] += weight
+    # Cheaper than filtering every token of a long description
+    for word in STOPWORDS.intersection(counts):
+        del counts[word]
+    return counts
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index. Each document occupies a slot; postings
+    are compact (slot, tf) arrays per term that are scored with NumPy, so a
+    query costs a few vector operations per term rather than a Python loop
+    over every matching document. Removing a document only marks its slot
+    dead, and postings are rebuilt once REBUILD_DEAD_FRACTION of slots are.
+    """
+
+    def __init__(self):
+        self._slots = {}  # doc id -> slot
+        self._doc_ids = []  # slot -> doc id, None once removed
+        self._doc_lengths = array("f")
+        self._alive = array("b")
+        self._postings = {}  # term -> (array of slots, array of term frequencies)
+        self._terms = []  # slot -> terms, kept so postings can be rebuilt without the documents
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._slots
+
+    def add(self, doc_id, fields):
+        """Index a document, replacing any previous version with the same id"""
+        self.remove(doc_id)
+        self._insert(doc_id, weighted_terms(fields))
+
+    def _insert(self, doc_id, terms):
+        slot = len(self._doc_ids)
+        self._slots[doc_id] = slot
+        self._doc_ids.append(doc_id)
+        self._terms.append(terms)
+        length = float(sum(terms.values()))
+        self._doc_lengths.append(length)
+        self._alive.append(1)
+        self._total_length += length
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("f"))
+            postings[0].append(slot)
+            postings[1].append(tf)
+
+    def remove(self, doc_id):
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return False
+        self._doc_ids[slot] = None
+        self._terms[slot] = None
+        self._alive[slot] = 0
+        self._total_length -= self._doc_lengths[slot]
+        dead = len(self._doc_ids) - len(self._slots)
+        if dead > 64 and dead >= REBUILD_DEAD_FRACTION * len(self._doc_ids):
+            self._rebuild()
+        return True
+
+    def _rebuild(self):
+        """Renumber live documents into dense slots and drop dead postings"""
+        live = [(doc_id, terms) for doc_id, terms in zip(self._doc_ids, self._terms) if doc_id is not None]
+        self.__init__()
+        for doc_id, terms in live:
+            self._insert(doc_id, terms)
+
+    def mask(self, doc_ids):
+        """Boolean slot mask selecting `doc_ids`; valid until the next add or remove"""
+        selected = np.zeros(len(self._doc_ids), dtype=bool)
+        slots = np.fromiter(map(self._slots.__getitem__, doc_ids), dtype=np.int64, count=len(doc_ids))
+        selected[slots] = True
+        return selected
+
+    def search(self, query, limit=20, offset=0, allowed=None):
+        """
+        Rank documents matching any query term by BM25.
+        Returns ([(doc_id, score)] for the requested page, total matches);
+        `allowed`, if given, is a mask from mask() restricting which documents may match.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._slots:
+            return [], 0
+        alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+        if allowed is not None:
+            alive &= allowed
+        doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.float32)
+        n_docs = len(self._slots)
+        avg_length = max(self._total_length / n_docs, 1.0)
+        scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+        matched = np.zeros(len(self._doc_ids), dtype=bool)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            slots = np.frombuffer(postings[0], dtype=np.uint32)
+            tfs = np.frombuffer(postings[1], dtype=np.float32)
+            df = int(np.count_nonzero(self._alive_at(slots)))
+            if not df:
+                continue
+            idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc_lengths[slots] / avg_length)
+            # A slot appears at most once per term, so plain fancy-index addition is safe
+            scores[slots] += idf * tfs * (BM25_K1 + 1.0) / (tfs + norm)
+            matched[slots] = True
+            del slots, tfs
+        del doc_lengths
+        hits = np.flatnonzero(matched & alive)
+        total = len(hits)
+        end = min(offset + limit, total)
+        if offset >= end:
+            return [], total
+        hit_scores = scores[hits]
+        if end < total:
+            top = np.argpartition(-hit_scores, end - 1)[:end]
+        else:
+            top = np.arange(total)
+        top = top[np.lexsort((hits[top], -hit_scores[top]))][offset:end]
+        return [(self._doc_ids[hits[i]], float(hit_scores[i])) for i in top], total
+
+    def _alive_at(self, slots):
+        return np.frombuffer(self._alive, dtype=np.int8)[slots]
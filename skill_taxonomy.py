@@ -0,0 +1,307 @@
+import re
+from collections import deque
+from functools import lru_cache
+
+# Canonical skill names by category, each with the aliases it is also written as.
+# Aliases are matched case-insensitively on whole tokens, so "Node.js", "nodejs"
+# and "node js" all resolve to the same canonical skill.
+SKILL_TAXONOMY = {
+    "Programming languages": {
+        "Python": ["python3", "python 3"],
+        "Java": [],
+        "JavaScript": ["js", "ecmascript", "es6"],
+        "TypeScript": ["ts"],
+        "C": [],
+        "C++": ["cpp"],
+        "C#": ["c sharp", "csharp"],
+        "Go": ["golang"],
+        "Rust": [],
+        "Ruby": [],
+        "PHP": [],
+        "Kotlin": [],
+        "Swift": [],
+        "Objective-C": ["objective c", "objc"],
+        "Scala": [],
+        "R": [],
+        "MATLAB": [],
+        "Perl": [],
+        "Dart": [],
+        "Elixir": [],
+        "Haskell": [],
+        "Lua": [],
+        "Julia": [],
+        "Bash": ["shell scripting", "shell script"],
+        "PowerShell": [],
+        "SQL": ["t-sql", "tsql", "pl/sql", "plsql"],
+        "HTML": ["html5"],
+        "CSS": ["css3"],
+        "Solidity": [],
+        "COBOL": [],
+        "Fortran": [],
+        "Assembly": [],
+        "VBA": [],
+    },
+    "Frameworks & libraries": {
+        "React": ["react.js", "reactjs"],
+        "React Native": [],
+        "Angular": ["angularjs", "angular.js"],
+        "Vue.js": ["vue", "vuejs"],
+        "Svelte": [],
+        "Next.js": ["nextjs"],
+        "Node.js": ["node", "nodejs", "node js"],
+        "Express": ["express.js", "expressjs"],
+        "Django": [],
+        "Flask": [],
+        "FastAPI": [],
+        "Spring": ["spring framework"],
+        "Spring Boot": [],
+        "Ruby on Rails": ["rails"],
+        "Laravel": [],
+        ".NET": ["dotnet", ".net core", "asp.net"],
+        "jQuery": [],
+        "Redux": [],
+        "GraphQL": [],
+        "REST APIs": ["rest", "restful", "rest api", "restful apis", "restful api"],
+        "gRPC": [],
+        "Tailwind CSS": ["tailwind"],
+        "Bootstrap": [],
+        "Flutter": [],
+        "Streamlit": [],
+        "Pandas": [],
+        "NumPy": [],
+        "SciPy": [],
+        "scikit-learn": ["sklearn", "scikit learn"],
+        "TensorFlow": [],
+        "PyTorch": ["torch"],
+        "Keras": [],
+        "Hugging Face": ["huggingface", "transformers"],
+        "OpenCV": [],
+        "Matplotlib": [],
+        "Selenium": [],
+        "Jest": [],
+        "pytest": [],
+        "JUnit": [],
+        "Cypress": [],
+    },
+    "Data & AI": {
+        "Machine Learning": ["ml"],
+        "Deep Learning": [],
+        "Natural Language Processing": ["nlp"],
+        "Computer Vision": [],
+        "Large Language Models": ["llm", "llms"],
+        "Data Science": [],
+        "Data Analysis": ["data analytics"],
+        "Data Engineering": [],
+        "Data Visualization": ["data visualisation"],
+        "Statistics": ["statistical analysis"],
+        "A/B Testing": ["ab testing", "a/b tests", "experimentation"],
+        "ETL": ["elt", "data pipelines"],
+        "Apache Spark": ["spark", "pyspark"],
+        "Hadoop": [],
+        "Apache Kafka": ["kafka"],
+        "Airflow": ["apache airflow"],
+        "dbt": [],
+        "Tableau": [],
+        "Power BI": ["powerbi"],
+        "Looker": [],
+        "Excel": ["microsoft excel", "ms excel"],
+        "Snowflake": [],
+        "BigQuery": [],
+        "Databricks": [],
+    },
+    "Databases": {
+        "PostgreSQL": ["postgres"],
+        "MySQL": [],
+        "SQLite": [],
+        "Microsoft SQL Server": ["sql server", "mssql"],
+        "Oracle Database": ["oracle"],
+        "MongoDB": ["mongo"],
+        "Redis": [],
+        "Elasticsearch": ["elastic search", "opensearch"],
+        "Cassandra": [],
+        "DynamoDB": [],
+        "Neo4j": [],
+        "NoSQL": [],
+    },
+    "Cloud & DevOps": {
+        "AWS": ["amazon web services"],
+        "Azure": ["microsoft azure"],
+        "Google Cloud": ["gcp", "google cloud platform"],
+        "Docker": [],
+        "Kubernetes": ["k8s"],
+        "Terraform": [],
+        "Ansible": [],
+        "Jenkins": [],
+        "GitHub Actions": [],
+        "GitLab CI": [],
+        "CI/CD": ["continuous integration", "continuous delivery", "continuous deployment"],
+        "Linux": ["unix"],
+        "Git": ["github", "gitlab", "bitbucket"],
+        "Serverless": ["aws lambda", "lambda"],
+        "Microservices": ["microservice"],
+        "Nginx": [],
+        "Prometheus": [],
+        "Grafana": [],
+        "Datadog": [],
+        "Site Reliability Engineering": ["sre"],
+        "Infrastructure as Code": ["iac"],
+    },
+    "Security & networking": {
+        "Cybersecurity": ["cyber security", "information security", "infosec"],
+        "Penetration Testing": ["pen testing", "pentesting"],
+        "OAuth": ["oauth2", "oauth 2.0"],
+        "Networking": ["tcp/ip"],
+        "Identity and Access Management": ["iam"],
+        "SIEM": [],
+    },
+    "Design & product": {
+        "Figma": [],
+        "Sketch": [],
+        "Adobe Photoshop": ["photoshop"],
+        "Adobe Illustrator": ["illustrator"],
+        "UX Design": ["ux", "user experience"],
+        "UI Design": ["ui", "user interface design"],
+        "User Research": [],
+        "Wireframing": ["wireframes", "prototyping"],
+        "Product Management": [],
+        "Product Strategy": [],
+        "Roadmapping": ["product roadmap", "roadmaps"],
+    },
+    "Methodologies": {
+        "Agile": ["agile methodologies"],
+        "Scrum": [],
+        "Kanban": [],
+        "Test-Driven Development": ["tdd", "test driven development"],
+        "Unit Testing": [],
+        "Object-Oriented Programming": ["oop", "object oriented programming"],
+        "System Design": ["distributed systems"],
+        "DevOps": [],
+        "Jira": [],
+        "Confluence": [],
+    },
+    "Business & professional": {
+        "Project Management": [],
+        "Stakeholder Management": ["stakeholder engagement"],
+        "Team Leadership": ["leadership", "people management", "team management"],
+        "Mentoring": ["coaching"],
+        "Communication": ["communication skills"],
+        "Problem Solving": ["problem-solving"],
+        "Customer Service": ["customer support"],
+        "Sales": [],
+        "Marketing": ["digital marketing"],
+        "SEO": ["search engine optimization", "search engine optimisation"],
+        "Content Writing": ["copywriting"],
+        "Financial Analysis": ["financial modelling", "financial modeling"],
+        "Budgeting": ["budget management"],
+        "Accounting": ["bookkeeping"],
+        "Salesforce": [],
+        "SAP": [],
+        "Microsoft Office": ["ms office", "office 365", "microsoft 365"],
+        "Negotiation": [],
+        "Presentation Skills": ["public speaking"],
+        "Business Analysis": ["requirements gathering"],
+    },
+}
+
+# Names and aliases that are also everyday words or letters ("go", "r", "swift").
+# They are only recognised inside a resume's skills list, never in free text.
+AMBIGUOUS_TERMS = {"c", "r", "go", "rust", "swift", "dart", "ruby", "julia", "sketch", "sales",
+                   "assembly", "excel", "communication", "negotiation", "lambda", "node", "spring",
+                   "express", "oracle", "rest", "ts", "transformers", "torch", "experimentation"}
+
+_TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9.+#]*[a-z0-9+#]|[a-z0-9]")
+
+
+def skill_tokens(text):
+    """Lowercased tokens that keep 'c++', 'c#', '.net' and 'node.js' whole"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Finds taxonomy skills in text with an Aho-Corasick automaton over tokens,
+    built once from every canonical name and alias, so a document is scanned
+    in a single pass however large the taxonomy. Overlapping matches resolve
+    leftmost-longest: "React Native" wins over "React".
+    """
+
+    def __init__(self, taxonomy=SKILL_TAXONOMY, ambiguous=AMBIGUOUS_TERMS):
+        self.categories = {}  # canonical skill -> category
+        # State 0 is the root; each state has its token transitions, a failure
+        # link and the (length, canonical, ambiguous) phrases ending there
+        self._goto = [{}]
+        self._terminal = [None]
+        for category, skills in taxonomy.items():
+            for canonical, aliases in skills.items():
+                self.categories[canonical] = category
+                for phrase in [canonical, *aliases]:
+                    self._insert(skill_tokens(phrase), canonical, phrase.lower() in ambiguous)
+        self._build_links()
+
+    def _insert(self, tokens, canonical, ambiguous):
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = self._goto[state][token] = len(self._goto)
+                self._goto.append({})
+                self._terminal.append(None)
+            state = nxt
+        if self._terminal[state] is None:
+            self._terminal[state] = (len(tokens), canonical, ambiguous)
+
+    def _build_links(self):
+        self._fail = [0] * len(self._goto)
+        self._output = [(t,) if t else () for t in self._terminal]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(token, 0)
+                self._fail[nxt] = link if link != nxt else 0
+                self._output[nxt] += self._output[self._fail[nxt]]
+                queue.append(nxt)
+
+    def matches(self, text, include_ambiguous=False):
+        """Canonical skill of every mention in text, in order, repeats included"""
+        goto, fail, output = self._goto, self._fail, self._output
+        longest = {}  # start token -> (end, canonical, ambiguous)
+        state = 0
+        for end, token in enumerate(skill_tokens(text), 1):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, canonical, ambiguous in output[state]:
+                start = end - length
+                if start not in longest or longest[start][0] < end:
+                    longest[start] = (end, canonical, ambiguous)
+        found, cursor = [], 0
+        for start in sorted(longest):
+            end, canonical, ambiguous = longest[start]
+            if start >= cursor and (include_ambiguous or not ambiguous):
+                found.append(canonical)
+                cursor = end
+        return found
+
+    def find(self, text, include_ambiguous=False):
+        """Canonical skills mentioned in text, in order of first mention"""
+        return list(dict.fromkeys(self.matches(text, include_ambiguous)))
+
+    def canonical(self, phrase):
+        """The canonical name if the whole phrase is a known skill or alias, else None"""
+        state = 0
+        for token in skill_tokens(phrase):
+            state = self._goto[state].get(token)
+            if state is None:
+                return None
+        terminal = self._terminal[state]
+        return terminal[1] if terminal else None
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher():
+    """Shared matcher; the automaton is built once per process"""
+    return SkillMatcher()
@@ -0,0 +1,84 @@
+"""
+Saved-jobs concurrency stress test.
+
+Starts many writer processes, each with several threads, all mutating the
+same saved-jobs partition at once, then reloads the partition from disk and
+checks that no write was lost or corrupted.
+
+Usage: python stress_saved_jobs.py [processes] [jobs_per_process]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import Process
+
+from job_identity import make_job_id
+from saved_jobs import SavedJobsManager
+
+THREADS_PER_PROCESS = 4
+
+
+def writer(jobs_file, worker, jobs_per_worker):
+    manager = SavedJobsManager(jobs_file)
+
+    def run(thread):
+        for i in range(jobs_per_worker):
+            job_id = manager.save_job({"title": f"Job {worker}-{thread}-{i}", "company_name": "Stress Co"})
+            manager.update_job_notes(job_id, f"notes from {worker}-{thread}")
+            if i % 5 == 0:
+                manager.update_application_status(job_id, "Applied")
+            if i % 7 == 0:
+                manager.remove_job(job_id)
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in range(THREADS_PER_PROCESS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def expected_jobs(processes, jobs_per_worker):
+    expected = {}
+    for worker in range(processes):
+        for thread in range(THREADS_PER_PROCESS):
+            for i in range(jobs_per_worker):
+                if i % 7 == 0:
+                    continue
+                job_id = make_job_id({"title": f"Job {worker}-{thread}-{i}", "company_name": "Stress Co"})
+                expected[job_id] = ("Applied" if i % 5 == 0 else "Not Applied", f"notes from {worker}-{thread}")
+    return expected
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    jobs_per_worker = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs_file = os.path.join(tmp, "saved_jobs.json")
+        start = time.perf_counter()
+        workers = [Process(target=writer, args=(jobs_file, w, jobs_per_worker)) for w in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        saved = SavedJobsManager(jobs_file).get_all_jobs()
+        expected = expected_jobs(processes, jobs_per_worker)
+        actual = {job_id: (job["application_status"], job["notes"]) for job_id, job in saved.items()}
+
+        mutations = processes * THREADS_PER_PROCESS * jobs_per_worker * 3
+        print(f"{processes} processes x {THREADS_PER_PROCESS} threads, ~{mutations} mutations in {elapsed:.2f}s")
+        missing = expected.keys() - actual.keys()
+        unexpected = actual.keys() - expected.keys()
+        wrong = [job_id for job_id in expected.keys() & actual.keys() if expected[job_id] != actual[job_id]]
+        assert not missing, f"{len(missing)} saved jobs lost, e.g. {sorted(missing)[:3]}"
+        assert not unexpected, f"{len(unexpected)} removed jobs came back, e.g. {sorted(unexpected)[:3]}"
+        assert not wrong, f"{len(wrong)} jobs have stale fields, e.g. {wrong[:3]}"
+        print(f"✅ All {len(expected)} jobs intact")
+
+
+if __name__ == "__main__":
+    main()
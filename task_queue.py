@@ -0,0 +1,218 @@
+import importlib
+import json
+import os
+import pickle
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Constants
+TASKS_DB_FILE = "tasks.db"
+THREAD_WORKERS = 4  # I/O-bound work: inference API calls, geocoding
+PROCESS_WORKERS = 2  # concurrent worker processes for CPU-bound work such as PDF rendering
+TASK_RETENTION_SECONDS = 24 * 60 * 60
+TASK_PENDING = "pending"
+TASK_RUNNING = "running"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+ACTIVE_STATES = (TASK_PENDING, TASK_RUNNING)
+
+
+def run_in_subprocess(fn, args=(), kwargs=None):
+    """
+    Call an importable module-level function in a fresh interpreter and
+    return its result. multiprocessing's spawn would re-import __main__ in
+    the child, which under Streamlit is the app script itself.
+    """
+    if fn.__module__ == "__main__":
+        raise ValueError("CPU-bound task functions must live in an importable module")
+    payload = pickle.dumps((fn.__module__, fn.__qualname__, tuple(args), kwargs or {}))
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__)], input=payload,
+                               capture_output=True, cwd=os.getcwd())
+    if completed.returncode != 0:
+        details = completed.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise RuntimeError(details[-1] if details else f"worker exited with {completed.returncode}")
+    succeeded, value = pickle.loads(completed.stdout)
+    if not succeeded:
+        raise RuntimeError(value)
+    return value
+
+
+def _worker_main():
+    """Entry point of run_in_subprocess workers: read a call from stdin, write its outcome to stdout"""
+    module_name, qualname, args, kwargs = pickle.load(sys.stdin.buffer)
+    output = sys.stdout.buffer
+    # Anything the task prints must not corrupt the pickled result
+    sys.stdout = sys.stderr
+    try:
+        fn = getattr(importlib.import_module(module_name), qualname)
+        outcome = (True, fn(*args, **kwargs))
+    except Exception as e:
+        outcome = (False, f"{type(e).__name__}: {e}")
+    pickle.dump(outcome, output)
+    output.flush()
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class TaskQueue:
+    """
+    Runs long AI, PDF and geocoding work off the Streamlit script thread.
+    Every task has a record in SQLite (state, progress, result or error), so
+    the UI can poll for it across reruns instead of blocking under a
+    spinner, and a rerun can't abort it. I/O-bound tasks share a thread
+    pool; CPU-bound ones run in worker processes, PROCESS_WORKERS at a time,
+    so they don't hold the GIL while other sessions render. Tasks left
+    unfinished by a server that has since exited are marked failed on startup.
+    """
+
+    def __init__(self, db_path=TASKS_DB_FILE, thread_workers=THREAD_WORKERS,
+                 process_workers=PROCESS_WORKERS):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                owner TEXT,
+                kind TEXT NOT NULL,
+                label TEXT NOT NULL,
+                meta TEXT NOT NULL,
+                state TEXT NOT NULL,
+                pid INTEGER NOT NULL,
+                progress REAL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                result BLOB,
+                result_is_bytes INTEGER NOT NULL DEFAULT 0,
+                error TEXT
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_owner ON tasks (owner, created_at)")
+        self._conn.commit()
+        self._threads = ThreadPoolExecutor(max_workers=thread_workers, thread_name_prefix="task")
+        # Each of these threads just waits on one worker process
+        self._process_slots = ThreadPoolExecutor(max_workers=process_workers, thread_name_prefix="task-cpu")
+        self._recover()
+        self._prune()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _recover(self):
+        """Fail tasks whose server process died before they finished"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, pid FROM tasks WHERE state IN ({','.join('?' * len(ACTIVE_STATES))})",
+                ACTIVE_STATES
+            ).fetchall()
+        for task_id, pid in rows:
+            if pid != os.getpid() and not _pid_alive(pid):
+                self._execute(
+                    "UPDATE tasks SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+                    (TASK_FAILED, "Interrupted: the server stopped before this task finished",
+                     time.time(), task_id)
+                )
+
+    def _prune(self):
+        self._execute("DELETE FROM tasks WHERE finished_at IS NOT NULL AND finished_at < ?",
+                      (time.time() - TASK_RETENTION_SECONDS,))
+
+    def submit(self, fn, *args, kind, owner=None, label="", meta=None, cpu_bound=False,
+               with_progress=False, **kwargs):
+        """
+        Queue fn(*args, **kwargs) and return its task ID. CPU-bound functions
+        must be importable module-level functions with picklable arguments.
+        With `with_progress`, fn also receives progress(fraction) to report on.
+        """
+        task_id = uuid.uuid4().hex
+        now = time.time()
+        self._execute(
+            "INSERT INTO tasks (id, owner, kind, label, meta, state, pid, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (task_id, owner, kind, label, json.dumps(meta or {}), TASK_PENDING, os.getpid(), now)
+        )
+        if cpu_bound:
+            future = self._process_slots.submit(self._run, task_id, run_in_subprocess, (fn, args, kwargs), {})
+        else:
+            if with_progress:
+                kwargs["progress"] = lambda fraction: self.set_progress(task_id, fraction)
+            future = self._threads.submit(self._run, task_id, fn, args, kwargs)
+        future.add_done_callback(lambda done: self._finish(task_id, done))
+        return task_id
+
+    def _run(self, task_id, fn, args, kwargs):
+        self._execute("UPDATE tasks SET state = ?, started_at = ? WHERE id = ?",
+                      (TASK_RUNNING, time.time(), task_id))
+        return fn(*args, **kwargs)
+
+    def _finish(self, task_id, future):
+        error = future.exception()
+        if error is not None:
+            self._execute("UPDATE tasks SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+                          (TASK_FAILED, str(error) or type(error).__name__, time.time(), task_id))
+            return
+        result = future.result()
+        is_bytes = isinstance(result, (bytes, bytearray))
+        self._execute(
+            "UPDATE tasks SET state = ?, result = ?, result_is_bytes = ?, progress = 1.0, finished_at = ? "
+            "WHERE id = ?",
+            (TASK_DONE, bytes(result) if is_bytes else json.dumps(result), int(is_bytes), time.time(), task_id)
+        )
+
+    def set_progress(self, task_id, fraction):
+        self._execute("UPDATE tasks SET progress = ? WHERE id = ?", (float(fraction), task_id))
+
+    @staticmethod
+    def _record(row):
+        (task_id, owner, kind, label, meta, state, progress, created_at,
+         finished_at, result, result_is_bytes, error) = row
+        if result is not None and not result_is_bytes:
+            result = json.loads(result)
+        return {
+            "id": task_id, "owner": owner, "kind": kind, "label": label, "meta": json.loads(meta),
+            "state": state, "progress": progress, "created_at": created_at,
+            "finished_at": finished_at, "result": result, "error": error,
+        }
+
+    _COLUMNS = ("id, owner, kind, label, meta, state, progress, created_at, finished_at, "
+                "result, result_is_bytes, error")
+
+    def get(self, task_id):
+        """Task record as a dict, or None if unknown (or pruned)"""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._COLUMNS} FROM tasks WHERE id = ?",
+                                     (task_id,)).fetchone()
+        return self._record(row) if row else None
+
+    def tasks_for(self, owner, limit=20):
+        """An owner's most recent tasks, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM tasks WHERE owner = ? ORDER BY created_at DESC LIMIT ?",
+                (owner, limit)
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def forget(self, task_id):
+        """Delete a finished task's record"""
+        self._execute("DELETE FROM tasks WHERE id = ? AND state NOT IN (?, ?)", (task_id, *ACTIVE_STATES))
+
+
+if __name__ == "__main__":
+    _worker_main()